@@ -57,23 +57,21 @@ if notFound != "":
     raise Exception("ERROR Could not find packages: " + notFound)
     
 from   ast import literal_eval
-import bmesh                # Handling Blender objects in edit mode
-import bpy
-from   bpy.props import (StringProperty, PointerProperty, FloatProperty, IntProperty, BoolProperty)
-from   bpy.types import (Panel, Operator, AddonPreferences, PropertyGroup, )
 import cmath
+import concurrent.futures   # Used to generate operations in a pool of processes
 import copy
 import cProfile             # Used for performance profiling with 'runctx'
                             # A good place to profile from is: class ProcessPaths
 import datetime
 from   functools import reduce
 import glob
+import hashlib              # Used to make the keys of the toolpath cache
+import heapq                # Used by the sweep line in SegmentSweep
 import inspect
 import io
+import json                 # Used to store toolpaths in the toolpath cache
 import math
 from   math import *
-import mathutils
-from   mathutils import *    # Blender's Vector class
 import numpy
 import operator
 import os                   # Handling paths, removing files etc.
@@ -83,20 +81,39 @@ import subprocess           # Used to create a process (e.g. ImageMagick)
 import scipy                # Used for image morphology on numpy arrays
 import scipy.ndimage        #
 import scipy.misc           #
+import scipy.spatial        # Used to find points that are equal in Arrangement
 import skimage              # Used for drawing shapes onto numpy arrays as images
 import skimage.draw         #
+import skimage.io           # Used to read/write images when not using Blender's images
 import skimage.transform    #
 import skimage.morphology   # Used for flood filling
+import skimage.util         #
 import sys
 import time
 import mmap
+import multiprocessing
 import shutil
-import random               # Used for uniform
+import tempfile             # Used to spool GCode programs to disk while they are generated
 
 # Increase the max number of recursive calls
 # This is important for the CSG functions
 sys.setrecursionlimit(10000) # my default is 1000, increasing too much may cause a seg fault
 
+#*******************************************************************
+# Blender's modules - without them (e.g. in plain Python) only the 
+# Blender4CNC class can be used and only the parts of it that do not 
+# touch Blender (Polytoxogon, Pockets, Im2GCode etc. with CoreSettings)
+#*******************************************************************
+try:
+    import bmesh                # Handling Blender objects in edit mode
+    import bpy
+    from   bpy.props import (StringProperty, PointerProperty, FloatProperty, IntProperty, BoolProperty)
+    from   bpy.types import (Panel, Operator, AddonPreferences, PropertyGroup, )
+    import mathutils
+    from   mathutils import *    # Blender's Vector class
+except ImportError:
+    bpy = None
+
 #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # A Class to handle converting a Blender model (project) into GCode
@@ -119,6 +136,32 @@ class Blender4CNC:
     REL_TOLERANCE = 1e-5
     ABS_TOLERANCE = 1e-9
 
+    # When roughing a pocket, the pocket is drawn onto images at a resolution of 
+    # (cutterDiameter/32) unless the images would use more memory than the budget (in bytes)
+    # in which case the resolution is reduced (but never below the minimum pixels per diameter)
+    # Linux will kill the Blender process if the memory usage is too extreme!
+    POCKET_RASTER_MEMORY_BUDGET = 512 * 1024 * 1024
+    POCKET_RASTER_PIXELS_PER_DIAMETER = 32
+    POCKET_RASTER_MIN_PIXELS_PER_DIAMETER = 8
+    # Approximate number of bytes per pixel for all the images that are alive at the same 
+    # time in Pockets.CutPocketRoughFinal (masks are bool and distances are uint8/uint16 but
+    # the distance transform and polygon fill use int32/int64 arrays while they are working)
+    POCKET_RASTER_BYTES_PER_PIXEL = 32
+
+    # When curves are approximated by straight lines (e.g. to show a poly as a mesh) no line 
+    # is further than this many mm from its curve (see CoreSettings.approxCurveMaxError)
+    # This is about what the old 10 degree steps gave for typical radii (a 1 inch circle 
+    # still gets 36 lines) but small curves get fewer lines and large curves get more
+    # The points for each curve are cached, the cache is emptied when it holds this many curves
+    APPROX_CURVE_MAX_ERROR_MM = 0.05
+    APPROX_CURVE_CACHE_SIZE = 10000
+
+    # The GCode generated for each operation is cached in a directory next to the .blend
+    # file so that unchanged operations do not have to be generated again. When the cache
+    # grows beyond this size (in bytes) the least recently used entries are removed.
+    # (This can be overridden with the project parameter "ToolpathCacheMb", 0 turns it off)
+    TOOLPATH_CACHE_BUDGET = 256 * 1024 * 1024
+
     #**************************************************************************
     # 
     #**************************************************************************
@@ -207,6 +250,198 @@ class Blender4CNC:
             self.dy = int(-self.dx)
             self.dx = int(t)
 
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A tool path held as numbers rather than GCode strings
+    # Each move is a row of (kind, x, y, z, i, j, f) in an array. Any value that 
+    # is not part of the move (e.g. an unchanged axis) is nan. Paths can be 
+    # transformed numerically (e.g. Offset) and are converted to GCode text 
+    # once at the end by ToGCode.
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #COVERAGE_CLASS ToolPath
+    class ToolPath:
+        # Columns of a move
+        KIND = 0
+        X = 1
+        Y = 2
+        Z = 3
+        I = 4
+        J = 5
+        F = 6
+        NUM_COLUMNS = 7
+
+        # Kinds of move
+        RAPID = 0       # G0
+        LINE = 1        # G1
+        ARC_CW = 2      # G2
+        ARC_CCW = 3     # G3
+        BLEND = 64      # G64 (I and J hold the P and Q tolerances, if any)
+        GOING_IN = 100  # Marker - the path is going in to an inner loop (F holds any new speed)
+        GOING_OUT = 101 # Marker - the path is coming out of an inner loop (F holds any new speed)
+
+        def __init__(self, moves=None):
+            if moves is None:
+                moves = numpy.zeros((0, Blender4CNC.ToolPath.NUM_COLUMNS))
+            self.moves = moves
+            # Moves are appended to a list and only added to the array when needed
+            self.newMoves = []
+
+        def __len__(self):
+            return len(self.moves) + len(self.newMoves)
+
+        def Append(self, kind, x=nan, y=nan, z=nan, i=nan, j=nan, f=nan):
+            self.newMoves.append((kind, x, y, z, i, j, f))
+
+        #********************************************************************
+        # Returns the array of moves (one row per move)
+        #********************************************************************
+        def Moves(self):
+            if len(self.newMoves) > 0:
+                newMoves = numpy.array(self.newMoves, dtype=float)
+                self.moves = numpy.vstack((self.moves, newMoves))
+                self.newMoves = []
+            return self.moves
+
+        #********************************************************************
+        # Returns the kinds of all the moves (as ints)
+        #********************************************************************
+        def Kinds(self):
+            return self.Moves()[:, Blender4CNC.ToolPath.KIND].astype(int)
+
+        #********************************************************************
+        # Returns a new path with only the moves where keep is True
+        #********************************************************************
+        def Select(self, keep):
+            return Blender4CNC.ToolPath(self.Moves()[keep])
+
+        #********************************************************************
+        # Returns a new path with an X,Y offset added to every coordinate
+        # No need to add to I,J coords as they are relative to the X,Y
+        #********************************************************************
+        def Offset(self, oX, oY):
+            TP = Blender4CNC.ToolPath
+            moves = self.Moves().copy()
+            # Missing coordinates are nan and stay nan
+            moves[:, TP.X] += oX
+            moves[:, TP.Y] += oY
+            return TP(moves)
+
+        #********************************************************************
+        # Convert the path to a list of GCode strings
+        # scale converts from internal units (e.g. 1000 for meters to mm),
+        # fmt is the format for coordinates and eol is added to every line
+        #********************************************************************
+        def ToGCode(self, scale=1, fmt="%0.4f", eol=""):
+            TP = Blender4CNC.ToolPath
+            moves = self.Moves()
+            # Scale the coordinates (but not the kind or speed)
+            values = moves * numpy.array([1, scale, scale, scale, scale, scale, 1])
+            present = ~numpy.isnan(moves)
+            # Moves of the same kind with the same words present are all formatted 
+            # with one format string for the whole line
+            shapes = moves[:, TP.KIND].astype(int) * 128 + present[:, 1:].dot([1, 2, 4, 8, 16, 32])
+            gcode = numpy.empty(len(moves), dtype=object)
+            for shape in numpy.unique(shapes).tolist():
+                ndx = numpy.flatnonzero(shapes == shape)
+                (lineFmt, cols) = self.GetLineFormat(int(moves[ndx[0], TP.KIND]), present[ndx[0]], fmt, eol)
+                gcode[ndx] = [lineFmt % tuple(v) for v in values[ndx][:, cols].tolist()]
+            return gcode.tolist()
+
+        #********************************************************************
+        # Returns the format string for a line of GCode for a kind of move
+        # (with the given words present) and the columns that fill it
+        #********************************************************************
+        def GetLineFormat(self, kind, present, fmt, eol):
+            TP = Blender4CNC.ToolPath
+            cols = []
+            if kind <= TP.ARC_CCW:
+                lineFmt = "G%d" % kind
+                for (col, word) in ((TP.X, " X"), (TP.Y, " Y"), (TP.Z, " Z"), (TP.I, " I"), (TP.J, " J")):
+                    if present[col]:
+                        lineFmt += word + fmt
+                        cols.append(col)
+                if present[TP.F]:
+                    lineFmt += " F%.4f"
+                    cols.append(TP.F)
+            elif kind == TP.BLEND:
+                lineFmt = "G64"
+                if present[TP.I]:
+                    lineFmt += " P%0.4f Q%0.4f"
+                    cols += [TP.I, TP.J]
+            else:
+                if kind == TP.GOING_IN:
+                    lineFmt = "(Going In)"
+                else:
+                    lineFmt = "(Going Out)"
+                if present[TP.F]:
+                    lineFmt = "F%.4f " + lineFmt
+                    cols.append(TP.F)
+            return (lineFmt + eol, cols)
+
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A Class to hold the settings that the toolpath code (Pockets, Im2GCode) 
+    # needs from its environment - the unit system and how to read/write images.
+    # Pockets and Im2GCode are given one of these so they never have to look at
+    # bpy.context while they generate GCode (e.g. in another process or in a 
+    # script). FromBlender returns the settings for the current Blender scene.
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #COVERAGE_CLASS CoreSettings
+    class CoreSettings:
+
+        # unitSystem is "METRIC", "IMPERIAL" or "NONE" (the same as Blender's scene unit settings)
+        # If blenderImages is True, images are read and written through bpy.data.images
+        # otherwise they are read and written directly as files
+        # If gridResolution > 0, pockets are calculated with all coordinates 
+        # snapped to a grid of that size (see FixedPointGrid)
+        # If useArrangement is True, the booleans in pockets (e.g. joining 
+        # tenons) are done on a planar arrangement (see Arrangement)
+        def __init__(self, unitSystem="NONE", blenderImages=False, gridResolution=0, useArrangement=False):
+            self.unitSystem = unitSystem
+            self.blenderImages = blenderImages
+            self.useArrangement = useArrangement
+            self.grid = None
+            if gridResolution > 0:
+                self.grid = Blender4CNC.FixedPointGrid(gridResolution)
+            # The scale from internal units to GCode units (meters to mm for metric)
+            # The most that a line may be from a curve it approximates (in internal units)
+            if unitSystem == "METRIC":
+                self.unitScale = 1000
+                self.approxCurveMaxError = Blender4CNC.APPROX_CURVE_MAX_ERROR_MM / 1000
+            else:
+                self.unitScale = 1
+                self.approxCurveMaxError = Blender4CNC.APPROX_CURVE_MAX_ERROR_MM / 25.4
+
+        #*************************************************************************
+        # Returns the settings of the current Blender scene
+        #*************************************************************************
+        def FromBlender(gridResolution=0, useArrangement=False):
+            return Blender4CNC.CoreSettings(bpy.context.scene.unit_settings.system, True, gridResolution, useArrangement)
+
+        def IsMetric(self):
+            return self.unitSystem == "METRIC"
+
+        #*************************************************************************
+        # Image I/O
+        #*************************************************************************
+        def ReadGrayPNG(self, filename):
+            if self.blenderImages:
+                return Blender4CNC.GrayImages.ReadGrayPNG(filename)
+            return Blender4CNC.GrayImages.ReadGrayPNGFile(filename)
+
+        def SaveGrayPNG(self, filename, im):
+            if self.blenderImages:
+                Blender4CNC.GrayImages.SaveGrayPNG(filename, im)
+            else:
+                Blender4CNC.GrayImages.SaveGrayPNGFile(filename, im)
+
+        def GetImageDimensions(self, filename):
+            if self.blenderImages:
+                return Blender4CNC.GrayImages.GetImageDimensions(filename)
+            return Blender4CNC.GrayImages.GetImageFileDimensions(filename)
+
     #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     # A Class to generate programmatic GCode
@@ -242,8 +477,9 @@ class Blender4CNC:
                 print(indent, methodName, "*" * 30)
             return (methodName, indent, self.debug[methodName])
         
+        # settings is a CoreSettings (if None, the settings of the current Blender scene are used)
         def __init__(self, finishingSpeed, finishingAmount, finishingPass, finishingBottom, finishingNumPasses,
-                    cutterDiameter, zStep, stepPercent, numSpringCuts, rapidHeight, speed):
+                    cutterDiameter, zStep, stepPercent, numSpringCuts, rapidHeight, speed, settings=None):
 
             if finishingSpeed <= 0:
                 raise Exception("ERROR Invalid finishing speed.")
@@ -262,6 +498,11 @@ class Blender4CNC:
             if speed <= 0:
                 raise Exception("ERROR Invalid speed.")
 
+            if settings == None:
+                settings = Blender4CNC.CoreSettings.FromBlender()
+            self.settings = settings
+            self.unitScale = settings.unitScale
+
             self.ss = []
             self.currentX = 0
             self.currentY = 0
@@ -381,6 +622,7 @@ class Blender4CNC:
             self.alphas["y"] = [[(0,0.6), (0,0.15), (0.15,0), (0.45,0), (0.6,0.15), (0.6,0.6), (0.6,-0.45), (0.15,-0.45)]]
             self.alphas["z"] = [[(0,0.6), (0.6,0.6), (0,0), (0.6,0)]]
             self.Mgk = ImageMagick()
+            self.rasterMemoryBudget = Blender4CNC.POCKET_RASTER_MEMORY_BUDGET
 
             self.debug = {}
 
@@ -390,25 +632,62 @@ class Blender4CNC:
         # Draws multiple polys on an image
         #********************************************************************
         def DrawPolys(self, cutterDiameter, l, minX, minY, maxX, maxY, fillNonZero):        
-            # Image resolution is 1/32 of cutter diameter
-            res = cutterDiameter / 32
+            # Image resolution is 1/32 of cutter diameter (if it fits in the memory budget)
+            res = self.GetRasterResolution(cutterDiameter, minX, minY, maxX, maxY)
 
             # Create image from min to max coordinates with border
-            width = ((maxX - minX) + res) + 2 * res
-            height = ((maxY - minY) + res) + 2 * res
-            cols = (int)(width / res)
-            rows = (int)(height / res)
+            (rows, cols) = self.GetRasterSize(res, minX, minY, maxX, maxY)
             minVec = (minX,minY)
             borderVec = (res,res)
 
-            # Draw and fill the polys
-            
-            im = numpy.zeros((rows,cols))
+            # Draw and fill the polys (as a bool mask)
+            im = numpy.zeros((rows,cols), dtype=bool)
             for ll in l:
 #                Blender4CNC.PolytoxogonDraw.GetPathForDrawPolyNoMagic(ll, minVec, borderVec, res, im)
                 self.GetPathForDrawPolyNoMagic(ll, minVec, borderVec, res, im)
             return (rows,cols,res,im)
         
+        #********************************************************************
+        # Returns the (rows, cols) of an image covering min to max coordinates
+        # (with a border) at the given resolution
+        #********************************************************************
+        def GetRasterSize(self, res, minX, minY, maxX, maxY):
+            width = ((maxX - minX) + res) + 2 * res
+            height = ((maxY - minY) + res) + 2 * res
+            cols = (int)(width / res)
+            rows = (int)(height / res)
+            return (rows, cols)
+
+        #********************************************************************
+        # Returns the resolution (size of a pixel) to use when drawing a 
+        # pocket onto images.
+        # Normally a pixel is 1/32 of the cutter diameter, but for large pockets
+        # that could use many gigabytes, so the resolution is reduced to keep
+        # the images within the memory budget. If the pocket cannot be drawn
+        # within the budget even at the minimum resolution, raise an exception.
+        #********************************************************************
+        def GetRasterResolution(self, cutterDiameter, minX, minY, maxX, maxY):
+            bytesPerPixel = Blender4CNC.POCKET_RASTER_BYTES_PER_PIXEL
+            maxPixels = self.rasterMemoryBudget / bytesPerPixel
+            pixelsPerDiameter = Blender4CNC.POCKET_RASTER_PIXELS_PER_DIAMETER
+            minPixelsPerDiameter = Blender4CNC.POCKET_RASTER_MIN_PIXELS_PER_DIAMETER
+
+            # Estimate the pixels per diameter that just fits the budget
+            area = max(maxX - minX, cutterDiameter) * max(maxY - minY, cutterDiameter)
+            fits = int(cutterDiameter * sqrt(maxPixels / area))
+            pixelsPerDiameter = max(min(pixelsPerDiameter, fits), minPixelsPerDiameter)
+
+            # Allow for the border around the image
+            while True:
+                res = cutterDiameter / pixelsPerDiameter
+                (rows, cols) = self.GetRasterSize(res, minX, minY, maxX, maxY)
+                if rows * cols <= maxPixels:
+                    return res
+                if pixelsPerDiameter <= minPixelsPerDiameter:
+                    str2 = "Pocket is too large to rough with this cutter.\nThe images needed would use %d Mb (more than %d Mb)." % ((rows * cols * bytesPerPixel) / (1024 * 1024), self.rasterMemoryBudget / (1024 * 1024))
+                    raise Blender4CNC.PolyException(str2, (minX, minY))
+                pixelsPerDiameter -= 1
+
         def GetPathForDrawPolyNoMagic(self, poly1, minVec, borderVec, res, im):        
             #print("GetPathForDrawPolyNoMagic poly1, minVec, borderVec, res, im=", poly1, minVec, borderVec, res, im)
             s = []
@@ -432,6 +711,8 @@ class Blender4CNC:
             #    im[cc, rr] = 255
             #    return 
 
+            # Collect the vertices as a list of numpy arrays (one per segment) and join
+            # them once at the end
             r = []
             c = []
             for i in range(0,len(roughPoints)):
@@ -440,66 +721,29 @@ class Blender4CNC:
                 P1y = (P1[1] - minVec[1] + borderVec[1]) / res
                 P1 = (P1x, P1y)
                 if i == 0: # Move to start of poly
-                    r.append(P1[0])
-                    c.append(P1[1])
+                    r.append(numpy.array([P1[0]]))
+                    c.append(numpy.array([P1[1]]))
                 p = roughPoints[i]
                 P2x = (p[0] - minVec[0] + borderVec[0]) / res
                 P2y = (p[1] - minVec[1] + borderVec[1]) / res
                 P2 = (P2x, P2y)
                 
                 if Blender4CNC.Polytoxogon.PointIsStraight(p,p): # Line from P1 to P2
-                    r.append(P2[0])
-                    c.append(P2[1])
+                    r.append(numpy.array([P2[0]]))
+                    c.append(numpy.array([P2[1]]))
                     
                 else: # Curve from P1 to P2 center C
                     # Approximate the curve
                     Cx = (p[2] - minVec[0] + borderVec[0]) / res
                     Cy = (p[3] - minVec[1] + borderVec[1]) / res
                     C = (Cx, Cy)
-
-#                    ang1 = Blender4CNC.PolytoxogonDraw.GetAngle0to360CenterToPoint(C, P1)
-#                    ang2 = Blender4CNC.PolytoxogonDraw.GetAngle0to360CenterToPoint(C, P2)
-                    ang1 = self.GetAngle0to360CenterToPoint(C, P1)
-                    ang2 = self.GetAngle0to360CenterToPoint(C, P2)
-
-                    vx = P2[0] - C[0]
-                    vy = P2[1] - C[1]
-                    m = sqrt(vx**2 + vy**2)
-                    radius = m    # radius
-                    oneRadian = (1 / 180) * math.pi
-                    
-                    ang = ang1
-#                    if Blender4CNC.PolytoxogonDraw.IsClockwise(p): 
-                    if self.IsClockwise(p): 
-                        if ang2 > ang1:
-                            # Go clockwise from ang1 to 0
-                            while ang > 0:
-                                r.append(C[0] + (math.cos(ang * math.pi / 180) * radius))
-                                c.append(C[1] + (math.sin(ang * math.pi / 180) * radius))   
-                                ang -= 1
-                            ang += 360
-                        # Go clockwise from ang to ang2
-                        while ang > ang2:
-                            r.append(C[0] + (math.cos(ang * math.pi / 180) * radius))
-                            c.append(C[1] + (math.sin(ang * math.pi / 180) * radius))   
-                            ang -= 1
-                    else: 
-                        if ang2 < ang1:
-                            # Go counter-clockwise from ang1 to 0
-                            while ang < 360:
-                                r.append(C[0] + (math.cos(ang * math.pi / 180) * radius))
-                                c.append(C[1] + (math.sin(ang * math.pi / 180) * radius))   
-                                ang += 1
-                            ang -= 360
-                        # Go counter-clockwise from ang to ang2
-                        while ang < ang2:
-                            r.append(C[0] + (math.cos(ang * math.pi / 180) * radius))
-                            c.append(C[1] + (math.sin(ang * math.pi / 180) * radius))   
-                            ang += 1
-            r = numpy.array(r)
-            c = numpy.array(c)
+                    (xs, ys) = self.GetArcPointsForDrawPoly(P1, P2, C, self.IsClockwise(p))
+                    r.append(xs)
+                    c.append(ys)
+            r = numpy.concatenate(r)
+            c = numpy.concatenate(c)
             rr, cc = skimage.draw.polygon(r, c)
-            im[cc, rr] = 255
+            im[cc, rr] = True
 #            print("im.shape=", im.shape)
 ##            if im.shape == (45,45):
 #            if True:
@@ -517,6 +761,41 @@ class Blender4CNC:
                 
             return s
 
+        #********************************************************************
+        # Returns the X and Y pixel coordinates (as numpy arrays) of points
+        # along an arc from P1 to P2 around center C (P1 is not included, P2 is).
+        # The angular step is chosen from the radius in pixels so that the 
+        # chord error (sagitta) stays under half a pixel - small arcs get few
+        # points and large arcs get enough points to stay accurate.
+        #********************************************************************
+        def GetArcPointsForDrawPoly(self, P1, P2, C, clockwise):
+            radius = sqrt((P2[0] - C[0])**2 + (P2[1] - C[1])**2)
+            ang1 = math.atan2(P1[1] - C[1], P1[0] - C[0])
+            ang2 = math.atan2(P2[1] - C[1], P2[0] - C[0])
+
+            # Get the angle swept by the arc (in the direction of travel)
+            if clockwise:
+                sweep = (ang1 - ang2) % (2 * math.pi)
+            else:
+                sweep = (ang2 - ang1) % (2 * math.pi)
+            FEQ = Blender4CNC.FloatsAreEqual
+            if FEQ(P1[0], P2[0]) and FEQ(P1[1], P2[1]):
+                sweep = 2 * math.pi
+
+            # Sagitta = radius * (1 - cos(step/2)) must be <= 0.5 pixels
+            if radius > 0.5:
+                step = 2 * math.acos(1 - 0.5 / radius)
+                numSteps = max(1, ceil(sweep / step))
+            else:
+                numSteps = 1
+
+            if clockwise:
+                sweep = -sweep
+            angs = ang1 + sweep * (numpy.arange(1, numSteps) / numSteps)
+            xs = numpy.append(C[0] + numpy.cos(angs) * radius, P2[0])
+            ys = numpy.append(C[1] + numpy.sin(angs) * radius, P2[1])
+            return (xs, ys)
+
         #********************************************************************
         # Return true if this Polytoxogon is a circle
         #********************************************************************
@@ -714,11 +993,18 @@ class Blender4CNC:
 
         #********************************************************************
         def ShrinkAndCatchSplitting(self, finalPoly, shrinkAmount):
+            return self.ShrinkMultipleAndCatchSplitting(finalPoly, [shrinkAmount])[0]
+
+        #********************************************************************
+        # Shrink the poly by each of the amounts (see Polytoxogon.ShrinkMultiple)
+        #********************************************************************
+        def ShrinkMultipleAndCatchSplitting(self, finalPoly, shrinkAmounts):
             try:
-                finishPolyList = finalPoly.Shrink(shrinkAmount)
-                if len(finishPolyList) > 1:
-                    raise Blender4CNC.PolyException("Shape is split.", mainPoly.points[0])
-                return finishPolyList[0]
+                finishPolyLists = finalPoly.ShrinkMultiple(shrinkAmounts)
+                for finishPolyList in finishPolyLists:
+                    if len(finishPolyList) > 1:
+                        raise Blender4CNC.PolyException("Shape is split.", finishPolyList[0].points[0])
+                return [finishPolyList[0] for finishPolyList in finishPolyLists]
             except Blender4CNC.PolyException as err:
                 str2 = err.args[0] + "\nThis error means that the cutter cannot\nreach all areas of the pocket safely due to the cutter\nradius or the finish/trim amounts.\n"
                 raise Blender4CNC.PolyException(str2, err.args[1])
@@ -743,8 +1029,28 @@ class Blender4CNC:
         # Likewise, if there are any tenons, the tenons cannot overlap, nor
         # can the resulting tenon shapes overlap when accounting for cutter
         # radius or finish/trim amounts - this is an error.
+        #
+        # If the settings have a fixed point grid, the points of the pocket and
+        # the tenons are snapped to the grid before the pocket is calculated 
+        # (the polys made while calculating it are not snapped).
+        # If the settings use the arrangement, the booleans are done on a 
+        # planar arrangement while the pocket is calculated.
         #********************************************************************
         def CutPocketRoughFinal(self,listOfXYPoints, z1,z2,trim, cutterDiameter,finishingPass,finishingBottom,finishingAmount, stepPercent, RapidHeight, finishingNumPasses, tenons,finalOnly):
+            grid = self.settings.grid
+            if grid != None:
+                listOfXYPoints = grid.SnapPoints(listOfXYPoints)
+                if isinstance(tenons, list):
+                    tenons = [grid.SnapPoints(t) for t in tenons]
+            oldUseArrangement = Blender4CNC.Polytoxogon.useArrangement
+            Blender4CNC.Polytoxogon.useArrangement = self.settings.useArrangement
+            try:
+                return self.IntCutPocketRoughFinal(listOfXYPoints, z1,z2,trim, cutterDiameter,finishingPass,finishingBottom,finishingAmount, stepPercent, RapidHeight, finishingNumPasses, tenons,finalOnly)
+            finally:
+                Blender4CNC.Polytoxogon.useArrangement = oldUseArrangement
+
+        #********************************************************************
+        def IntCutPocketRoughFinal(self,listOfXYPoints, z1,z2,trim, cutterDiameter,finishingPass,finishingBottom,finishingAmount, stepPercent, RapidHeight, finishingNumPasses, tenons,finalOnly):
             trim = max(trim,0)
             radius = cutterDiameter/2
 
@@ -756,9 +1062,10 @@ class Blender4CNC:
             mainPoly = Blender4CNC.Polytoxogon(listOfXYPoints)
             (minX, minY, maxX, maxY) = mainPoly.GetBoundingRectangle()
 
-            # Draw the pocket as final size
-#            (rows,cols,res, imFinalSize) = Blender4CNC.PolytoxogonDraw.DrawPolys(cutterDiameter, [mainPoly], minX, minY, maxX, maxY, False) 
-            (rows,cols,res, imFinalSize) = self.DrawPolys(cutterDiameter, [mainPoly], minX, minY, maxX, maxY, False) 
+            # Get the resolution and size of the images used for roughing (all images 
+            # cover the bounding rectangle of the pocket at final size)
+            res = self.GetRasterResolution(cutterDiameter, minX, minY, maxX, maxY)
+            (rows, cols) = self.GetRasterSize(res, minX, minY, maxX, maxY)
             mainPoly.IsValid()
 
             # Determine whether we are doing a climb cut or not
@@ -767,18 +1074,22 @@ class Blender4CNC:
                 climbCut = True
                 mainPoly = mainPoly.ReverseLineDirections()
             
-            finalPoly = self.ShrinkAndCatchSplitting(mainPoly, radius)
+            # Shrink the main poly by the cutter radius
             # If doing a finishing pass, shrink the main poly by the finishing amount
-            if finishingPass:
-                finishPoly = self.ShrinkAndCatchSplitting(finalPoly, finishingAmount)
-            else:
-                finishPoly = finalPoly
-
             # If doing a trim pass, shrink the main poly by the trim amount
+            # (The shrinks are asked for in one call, see ShrinkMultiple)
+            shrinkAmounts = [radius]
+            if finishingPass:
+                shrinkAmounts.append(shrinkAmounts[-1] + finishingAmount)
             if trim > 0:
-                trimPoly = self.ShrinkAndCatchSplitting(finishPoly, trim)
+                shrinkAmounts.append(shrinkAmounts[-1] + trim)
+            shrunkPolys = self.ShrinkMultipleAndCatchSplitting(mainPoly, shrinkAmounts)
+            finalPoly = shrunkPolys[0]
+            if finishingPass:
+                finishPoly = shrunkPolys[1]
             else:
-                trimPoly = finishPoly
+                finishPoly = finalPoly
+            trimPoly = shrunkPolys[-1]
 
             # Process any tenons
             finalTenonsList = []
@@ -832,9 +1143,15 @@ class Blender4CNC:
                     str2 = "Detected overlapping tenons.\n"
                     raise Blender4CNC.PolyException(str2, (0,0))
                 
-                # Expand all the polys by the cutter radius
-                finalTenonsList = mainPoly.ExpandPolys(tenonsList, radius)
-                finalTenonsList = [item[0] for item in finalTenonsList]
+                # Expand all the polys by the cutter radius (and by the finishing and
+                # trim amounts in the same go, see ExpandMultiple)
+                expandAmounts = [radius]
+                if finishingPass:
+                    expandAmounts.append(expandAmounts[-1] + finishingAmount)
+                if trim > 0:
+                    expandAmounts.append(expandAmounts[-1] + trim)
+                expandedTenons = mainPoly.ExpandPolysMultiple(tenonsList, expandAmounts)
+                finalTenonsList = [item[0] for item in expandedTenons[0]]
                 # Join overlapping tenons
                 finalTenonsList = self.JoinOverlappingTenons(finalTenonsList)
                 if len(finalTenonsList) != len(tenonsList):
@@ -845,8 +1162,7 @@ class Blender4CNC:
                 # If doing a finishing pass, expand the polys by the finishing amount
                 if finishingPass:
                     #print("CutPocket Do finish pass")
-                    finishTenonsList = mainPoly.ExpandPolys(finalTenonsList, finishingAmount)
-                    finishTenonsList = [item[0] for item in finishTenonsList]
+                    finishTenonsList = [item[0] for item in expandedTenons[1]]
                     # Join overlapping tenons
                     finishTenonsList = self.JoinOverlappingTenons(finishTenonsList)
                     if len(finishTenonsList) != len(finalTenonsList):
@@ -859,8 +1175,7 @@ class Blender4CNC:
                 # If doing a trim pass, expand the polys by the trim amount
                 if trim > 0:
                     #print("CutPocket Do trim pass")
-                    trimTenonsList = mainPoly.ExpandPolys(finishTenonsList, trim)
-                    trimTenonsList = [item[0] for item in trimTenonsList]
+                    trimTenonsList = [item[0] for item in expandedTenons[-1]]
                     # Join overlapping tenons
                     trimTenonsList = self.JoinOverlappingTenons(trimTenonsList)
                     if len(trimTenonsList) != len(finishTenonsList):
@@ -925,6 +1240,8 @@ class Blender4CNC:
             # i.e. if the cutter is 0.25", then 0.25/32 = 0.0078125"
             # therefore the radius of the cutter in pixels is (cutterDiameter/2) / res
             # i.e for 0.25" cutter, the radius is equal to 16 pixels (0.125" / 0.0078125")
+            # (For very large pockets, the resolution is reduced to stay within the memory budget
+            # - see GetRasterResolution)
 #            (rows,cols,res, imFinalShape) = Blender4CNC.PolytoxogonDraw.DrawPolys(cutterDiameter, [trimPoly], minX, minY, maxX, maxY, False)
             if climbCut:
                 # While it may not really make any difference to drawing the shape onto an image
@@ -939,13 +1256,7 @@ class Blender4CNC:
                 (rT,cT,rT, imTenons) = self.DrawPolys(cutterDiameter, trimTenonsList, minX, minY, maxX, maxY, True)
 
                 # Subtract 2 images
-                imC = imFinalShape - imTenons
-                imD = numpy.where(imC<0, 0, imC)
-
-                #im2g.Mgk = ImageMagick()
-                # Make the image just 0 and 1 for black/white
-                imD = imD / 255
-                imFinalShape = imD
+                imFinalShape &= ~imTenons
 
             imA = imFinalShape
 
@@ -956,24 +1267,22 @@ class Blender4CNC:
             #cutterRadiusPixels = int(radius / res)
             #if cutterRadiusPixelsFloat > cutterRadiusPixels:
             #    cutterRadiusPixels += 1
-            sizeK = 5
+            # (5 pixels at the normal resolution of cutterDiameter/32)
+            sizeK = 5 * (cutterDiameter / Blender4CNC.POCKET_RASTER_PIXELS_PER_DIAMETER) / res
             k = self.GetDiscKernel(sizeK)
-            imB = copy.copy(imA)
-            scipy.ndimage.morphology.binary_erosion(imA, structure=k, output=imB)
-            imB *= 255
-            im = imB
-            needRough = (numpy.count_nonzero(im) > 0)
+            imB = scipy.ndimage.binary_erosion(imA, structure=k)
+            needRough = (numpy.count_nonzero(imB) > 0)
 
             # We use Im2GCode for functions: HandleRingStructures, GetGCodeForThisBlob
             #     GetGCodeForThisBlob calls FillBlob, GetGCodeForPoint, GetX
-            im2g = Blender4CNC.Im2GCode()
+            im2g = Blender4CNC.Im2GCode(self.settings)
             im2g.listOfDepths = [0]     # Used by HandleRingStructures
             im2g.rows = rows-2          # Used by HandleRingStructures, GetGCodeForThisBlob
             im2g.cols = cols-2          # Used by HandleRingStructures, GetGCodeForThisBlob
             im2g.lastX = 0              # Used by GetGCodeForPoint
             im2g.lastY = 0              # Used by GetGCodeForPoint
             im2g.lastZ = 0              # Used by GetGCodeForPoint
-            im2g.pixelInInches = cutterDiameter / 32 # Used by GetX
+            im2g.pixelInInches = res    # Used by GetX
             im2g.innerPathToleranceEnableCount = 0 # Used by GetGCodeForThisBlob
             im2g.bgnd = 0               # Used by FillBlob
             i2g = Blender4CNC.Im2GCodeSettings()
@@ -982,12 +1291,11 @@ class Blender4CNC:
             im2g.i2g = i2g
             
             # Handle ring structures after the erosion
-            imB /= 255
             imA = im2g.HandleRingStructures(imB)
             imFinalShape = imA
 
             fs = []
-            roughPath = []
+            roughPath = Blender4CNC.ToolPath()
             # Rough out the pocket
             if needRough:
 
@@ -1004,59 +1312,53 @@ class Blender4CNC:
                 im = im.reshape((1, rows, cols))
 
                 # The eroding/thinning might have left us with multiple blobs
-                DEBUG_counter = 1
-                while True:
-                    # Find first point
-                    wh = numpy.where(im==1)
-                    if (not wh) or (len(wh[0]) == 0): # if the arrays in wh are not initialized, nothing was found
-                        break
-
-#                    # Temporary for debugging
-#                    temp = im[0, wh[2][0], wh[1][0]]
-#                    im[0, wh[2][0], wh[1][0]] = 255
-#                    im = im.reshape((rows, cols))
-#                    Blender4CNC.GrayImages.SaveGrayPNG("CutPocketRoughFinal-255-start.png", im)
-#                    im = im.reshape((1, rows, cols))
-#                    im[0, wh[2][0], wh[1][0]] = temp
-#                    # Temporary for debugging
-                    
-                    firstPixel = Blender4CNC.MyPix(wh[2][0], wh[1][0], 1, 0)
-                    # Get the path to cut this at this level
-                    # Shrink the step percent to make sure we get good coverage
-                    modulus = ((cutterDiameter * stepPercent * 0.9) / res) 
-                    path = im2g.GetGCodeForThisBlob(im, modulus, 0, firstPixel)
-                    #print("im2g.GetGCodeForThisBlob")
-                    #print(wh[2][0], wh[1][0])
-                    #print("path=", path)
-                    #print("")
-
-
-                    # If "finalOnly" is True it means we are doing the roughing with a larger cutter
-                    # and we only need to do a few outside loops here at this cutter size
-                    if finalOnly:
-                        path = self.JustGetAFewLoops(path)
-
-                    # Slow down the speed as we move into inner loops because we are removing 100%
-                    # of the material
-                    path = self.SlowDownGoingIn(path)
-
-                    # Translate origin
-                    fs += ["\n"]
-                    fs += ["(Roughing the Pocket)\n"]
-                    # Cut the polys
-                    #print("AddOffsetToPath minX, minY=", minX, minY)
-                    if (bpy.context.scene.unit_settings.system == "METRIC"):
-                        offsetPath = self.AddOffsetToPath(path, minX * 1000, minY * 1000)
-                    else:
-                        offsetPath = self.AddOffsetToPath(path, minX, minY)
-                    fs += self.CutPathFromZ1ToZ2(offsetPath, offsetPath, z1, z2)
-                    roughPath = path
-
-                    fs += self.RapidToZ(RapidHeight)
-                    # Translate origin back
-
-                    # Clear this blob from the image
-                    self.ClearBlob(im, wh[2][0], wh[1][0])
+                # Label the blobs once and work through them one blob at a time.
+                # (Clearing inner paths while tracing can split a blob into pieces
+                # so we keep tracing within the blob until no edge pixels are left)
+                # Shrink the step percent to make sure we get good coverage
+                modulus = ((cutterDiameter * stepPercent * 0.9) / res) 
+                for (blobSlice, blobMask) in self.GetBlobsInScanOrder(im[0]):
+                    blobIm = im[0][blobSlice]
+                    (rowOffset, colOffset) = (blobSlice[0].start, blobSlice[1].start)
+                    while True:
+                        # Find first point
+                        seed = self.GetBlobSeed(blobIm, blobMask)
+                        if seed == None:
+                            break
+                        (seedX, seedY) = seed
+                        firstPixel = Blender4CNC.MyPix(seedX + colOffset, seedY + rowOffset, 1, 0)
+                        # Get the path to cut this at this level
+                        path = Blender4CNC.ToolPath()
+                        im2g.GetToolPathForThisBlob(im, modulus, 0, firstPixel, path)
+                        #print("im2g.GetGCodeForThisBlob")
+                        #print(seedX + colOffset, seedY + rowOffset)
+                        #print("path=", path)
+                        #print("")
+
+                        # If "finalOnly" is True it means we are doing the roughing with a larger cutter
+                        # and we only need to do a few outside loops here at this cutter size
+                        if finalOnly:
+                            path = self.JustGetAFewLoops(path)
+
+                        # Slow down the speed as we move into inner loops because we are removing 100%
+                        # of the material
+                        path = self.SlowDownGoingIn(path)
+
+                        # Translate origin
+                        fs += ["\n"]
+                        fs += ["(Roughing the Pocket)\n"]
+                        # Cut the polys
+                        #print("AddOffsetToPath minX, minY=", minX, minY)
+                        offsetPath = self.ToolPathToGCode(self.AddOffsetToPath(path, minX, minY))
+                        fs += self.CutPathFromZ1ToZ2(offsetPath, offsetPath, z1, z2)
+                        roughPath = path
+
+                        fs += self.RapidToZ(RapidHeight)
+                        # Translate origin back
+
+                        # Clear the traced piece of this blob from the image (8-connected)
+                        tracedPiece = skimage.morphology.flood(blobIm != 0, (seedY, seedX), connectivity=2)
+                        blobIm[tracedPiece] = 0
                     
                 fs += ["(Finished Roughing the Pocket)\n"]
                 fs += ["\n"]
@@ -1081,10 +1383,7 @@ class Blender4CNC:
                 if len(roughPath) > 0:
                     # Translate origin, Cut the polys
                     fs += ["(Finishing the Pocket - the bottom surface)\n"]
-                    if (bpy.context.scene.unit_settings.system == "METRIC"):
-                        offsetPath = self.AddOffsetToPath(roughPath, minX * 1000, minY * 1000)
-                    else:
-                        offsetPath = self.AddOffsetToPath(roughPath, minX, minY)
+                    offsetPath = self.ToolPathToGCode(self.AddOffsetToPath(roughPath, minX, minY))
                     fs += self.CutPathFromZ1ToZ2(offsetPath, offsetPath, z2, z2)
                     fs += self.RapidToZ(RapidHeight)
                 else:
@@ -1165,7 +1464,8 @@ class Blender4CNC:
             return fs
 
         def DISTANCE(self, im):
-            return scipy.ndimage.morphology.distance_transform_cdt(im, metric='chessboard', return_distances=True)
+            imDist = scipy.ndimage.distance_transform_cdt(im, metric='chessboard', return_distances=True)
+            return Blender4CNC.GrayImages.CompactDistance(imDist)
 
         #*************************************************************************
         # Create a disc kernel to be used with binary dilation
@@ -1174,7 +1474,7 @@ class Blender4CNC:
             # Generate a quarter
             r = ceil(radius) + 1
             r2 = radius**2
-            k = numpy.zeros((r,r))
+            k = numpy.zeros((r,r), dtype=bool)
             for x in range(0,r):
                 for y in range(0,r):
                     d = x**2 + y**2
@@ -1205,56 +1505,64 @@ class Blender4CNC:
             # Specially check circles? D curves?
             if len(l2) <= 1:
                 return l2
-            l = copy.copy(l2)
-            i = 0
-            newList = []
-            while (len(l) > 0):
-                poly1 = l[0]
-                foundOverlap = False
-                for poly2 in l[1:]:
-                    if poly1.Overlap(poly2):            
-                        # Join the tenons, remove each original tenon from list
-                        # Add the new joined tenon to the list
-                        joinedTenon = poly1.Add(poly2)
-                        joinedTenon = joinedTenon[0]
-                        foundOverlap = True
-                        l.remove(poly2)
-                        l.remove(poly1)
-                        l = [joinedTenon] + l
-                        break
-                        
-                if not foundOverlap:
-                    # This tenon does not overlap with anything, remove it from original list
-                    # and add to new list
-                    newList.append(poly1)
-                    l.remove(poly1)
+            union = Blender4CNC.CascadedUnion(Blender4CNC.Polytoxogon.Overlap, self.JoinTwoTenons)
+            if not Blender4CNC.Polytoxogon.useArrangement:
+                return union.JoinPolys(l2)
+            # With the arrangement, each group of overlapping tenons is joined
+            # in one pass
+            out = []
+            for group in union.GetGroups(l2):
+                polys = [l2[i] for i in group]
+                if len(polys) == 1:
+                    out += polys
+                else:
+                    out += self.CheckJoinedTenons(polys[0].AddMultiple(polys[1:]))
+            return out
+
+        #********************************************************************
+        # Join two (clockwise) tenons that overlap
+        #********************************************************************
+        def JoinTwoTenons(self, poly1, poly2):
+            return self.CheckJoinedTenons(poly1.Add(poly2))[0]
 
-            return newList
+        #********************************************************************
+        # Returns the polys of the result of joining tenons ([poly, holes], ...)
+        # Tenons that join in a ring enclose an area that would never be cut
+        # (only the outline of joined tenons is kept) so this is an error
+        #********************************************************************
+        def CheckJoinedTenons(self, result):
+            for (poly, holes) in result:
+                if len(holes) > 0:
+                    str2 = "Detected overlapping tenons that enclose an area.\nThe enclosed area cannot be cut."
+                    raise Blender4CNC.PolyException(str2, holes[0].points[0][0:2])
+            return [poly for (poly, holes) in result]
             
         #********************************************************************
         # Slow down the speed as we move into inner loops because we are removing 100%
         # of the material
+        # (The speed is set on the Going In/Out markers of the ToolPath and any
+        # markers that do not change the speed are removed)
         #********************************************************************
         def SlowDownGoingIn(self, path):
+            TP = Blender4CNC.ToolPath
             origSpeed = self.currentSpeed
             halfSpeed = self.currentSpeed/2
-            for i in range(0,len(path)):
-                s = path[i]
-                s = s[0:-1]
+            moves = path.Moves().copy()
+            kinds = path.Kinds()
+            keep = numpy.ones(len(moves), dtype=bool)
+            for i in numpy.flatnonzero((kinds == TP.GOING_IN) | (kinds == TP.GOING_OUT)).tolist():
                 # When going into an inner blob, slow down
-                if s == "(Going In)":
-                    if self.currentSpeed != halfSpeed:
-                        s = self.IntSpeed(halfSpeed)[0] + " " + s
-                    else:
-                        s = ""
                 # When coming out of an inner blob, speed up
-                if s == "(Going Out)":
-                    if self.currentSpeed != origSpeed:
-                        s = self.IntSpeed(origSpeed)[0] + " " + s
-                    else:
-                        s = ""
-                path[i] = s
-            return path
+                if kinds[i] == TP.GOING_IN:
+                    spd = halfSpeed
+                else:
+                    spd = origSpeed
+                if self.currentSpeed != spd:
+                    self.currentSpeed = spd
+                    moves[i, TP.F] = spd
+                else:
+                    keep[i] = False
+            return TP(moves[keep])
         
         #********************************************************************
         # When most of a roughing pass is being done by a larger cutter,
@@ -1262,128 +1570,58 @@ class Blender4CNC:
         # any paths deeper than 2.
         #********************************************************************
         def JustGetAFewLoops(self, path):
-            depth = 0
-            path2 = []
-            for i in range(0,len(path)):
-                s = path[i]
-                if s == "(Going In)\n":
-                    depth += 1
-                if s == "(Going Out)\n":
-                    depth -= 1
-                if depth < 2:
-                    path2 += [s]
-            return path2
+            TP = Blender4CNC.ToolPath
+            kinds = path.Kinds()
+            # The depth after each move (a Going In counts as deeper, a Going Out as shallower)
+            depth = numpy.cumsum((kinds == TP.GOING_IN).astype(int) - (kinds == TP.GOING_OUT))
+            return path.Select(depth < 2)
             
         #********************************************************************
-        # Clear pixels in image
-        #********************************************************************
-#        def CheckAroundPixel(self, im, x,y):
-#            if im[0][y][x] != 0:
-#                l2 = [(x,y)]
-#                im[0][y][x] = 0
-#                return l2
-#            return []
-        #********************************************************************
-        # I cannot use skimage.morphology.flood_fill (even with a tolerance)
-        # because the values of the pixels in the blob are 1,2,3...(non-zero)
-        # in skimage.morphology.flood_fill, the tolerance parameter is +/-
-        # "im" is a numpy array
-        #********************************************************************
-        def ClearBlob(self, im, X, Y):
-#            im2 = im[0]
-#            skimage.morphology.flood_fill(im2, (Y, X), 0, connectivity=2, in_place=True)
-#            return
-            lr = [(X,Y)]
-            ud = [(X,Y)]
-            im2 = im[0]
-            im2[Y][X] = 0
-            count = 0
-            while (len(lr) > 0) or (len(ud) > 0):
-                ud2 = []
-                lr2 = []
-                ud3 = []
-                lr3 = []
-                for p in lr:
-                    count += 1
-                    x = p[0]
-                    y = p[1]
-                    xE = x+1
-                    xW = x-1
-                    yN = y+1
-                    yS = y-1
-                    while im2[y][xW] != 0:
-                        ud2.append((xW,y))
-                        im2[y][xW] = 0
-                        xW -= 1
-                    while im2[y][xE] != 0:
-                        ud2.append((xE,y))
-                        im2[y][xE] = 0
-                        xE += 1
-
-                    if im2[yN][xW] != 0:
-                        ud2.append((xW,yN))
-                        im2[yN][xW] = 0
-                    if im2[yN][xE] != 0:
-                        ud2.append((xE,yN))
-                        im2[yN][xE] = 0
-                    if im2[yS][xW] != 0:
-                        ud2.append((xW,yS))
-                        im2[yS][xW] = 0
-                    if im2[yS][xE] != 0:
-                        ud2.append((xE,yS))
-                        im2[yS][xE] = 0
-
-                for p in ud:
-                    count += 1
-                    x = p[0]
-                    y = p[1]
-                    xE = x+1
-                    xW = x-1
-                    yN = y+1
-                    yS = y-1
-                    while im2[yN][x] != 0:
-                        lr2.append((x,yN))
-                        im2[yN][x] = 0
-                        yN += 1
-                    while im2[yS][x] != 0:
-                        lr2.append((x,yS))
-                        im2[yS][x] = 0
-                        yS -= 1
-
-                    if im2[yN][xW] != 0:
-                        lr2.append((xW,yN))
-                        im2[yN][xW] = 0
-                    if im2[yN][xE] != 0:
-                        lr2.append((xE,yN))
-                        im2[yN][xE] = 0
-                    if im2[yS][xW] != 0:
-                        lr2.append((xW,yS))
-                        im2[yS][xW] = 0
-                    if im2[yS][xE] != 0:
-                        lr2.append((xE,yS))
-                        im2[yS][xE] = 0
-                lr = lr2
-                ud = ud2
+        # Given a distance image (2D numpy array), label the blobs (8-connected)
+        # in one pass and return a list of (slice, mask) - one per blob.
+        # The slice is the bounding box of the blob in the image and the mask
+        # is True for the pixels (inside the slice) that belong to the blob.
+        # The blobs are returned in the order that a row-by-row scan of the
+        # image would discover their first edge pixel (distance of 1).
+        #********************************************************************
+        def GetBlobsInScanOrder(self, im):
+            labels, numLabels = scipy.ndimage.label(im != 0, structure=numpy.ones((3,3)))
+            if numLabels == 0:
+                return []
+            objSlices = scipy.ndimage.find_objects(labels)
+            edgeNdx = numpy.flatnonzero(im == 1)
+            # numpy.unique returns the index of the first occurrence of each label
+            (blobLabels, firstNdx) = numpy.unique(labels.ravel()[edgeNdx], return_index=True)
+            order = numpy.argsort(edgeNdx[firstNdx])
+            blobs = []
+            for label in blobLabels[order].tolist():
+                blobSlice = objSlices[label-1]
+                blobs.append((blobSlice, labels[blobSlice] == label))
+            return blobs
+
+        #********************************************************************
+        # Returns the (x,y) of the first pixel (in row order) on the edge 
+        # (distance of 1) of a blob, or None if there are none left
+        #********************************************************************
+        def GetBlobSeed(self, blobIm, blobMask):
+            edgeNdx = numpy.flatnonzero((blobIm == 1) & blobMask)
+            if len(edgeNdx) == 0:
+                return None
+            (y, x) = divmod(int(edgeNdx[0]), blobIm.shape[1])
+            return (x, y)
                 
         #********************************************************************
-        # Add an X,Y offset to every coordinate
+        # Add an X,Y offset to every coordinate of a ToolPath
         # No need to add to I,J coords as they are relative to the X,Y
         #********************************************************************
         def AddOffsetToPath(self, path, oX, oY):
-            newPath = []
-            floatingPointStr = "[-+]?(?:\d*\.\d+|\d+)"
-            offArray = [oX, oY]
-            charArray = "XY"
-            for line in path:
-                for i in range(0,2):
-                    # Find X,Y coordinates
-                    # {XY} {-+} {d.ddd or .ddd or d}
-                    m = re.match( r'(.* )(' + charArray[i] + floatingPointStr + ')(.*)', line, re.M|re.I)
-                    if m:
-                        x = float(m.group(2)[1:]) + offArray[i]
-                        line = m.group(1) + charArray[i] + "%0.4f" % x + m.group(3)
-                newPath += [line]
-            return newPath
+            return path.Offset(oX, oY)
+
+        #********************************************************************
+        # Convert a ToolPath into a list of GCode strings
+        #********************************************************************
+        def ToolPathToGCode(self, path):
+            return path.ToGCode(self.unitScale)
         
 
         #********************************************************************
@@ -1426,51 +1664,38 @@ class Blender4CNC:
         # Move and Rapid Functions
         #--------------------------------------------------------------------
         #--------------------------------------------------------------------
+        # (unitScale converts from internal units to GCode units e.g. meters to mm)
         def RapidToXY(self,x,y):
             self.currentX = x
             self.currentY = y
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
-                return ["G0 X%.4f Y%.4f" % (x * 1000, y * 1000)]
-            else:
-                return ["G0 X%.4f Y%.4f" % (x, y)]
+            s = self.unitScale
+            return ["G0 X%.4f Y%.4f" % (x * s, y * s)]
        
         def RapidToZ(self,z):
             self.currentZ = z
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
-                return ["G0 Z%.4f" % (z*1000)]
-            else:
-                return ["G0 Z%.4f" % (z)]
+            return ["G0 Z%.4f" % (z * self.unitScale)]
        
         def MoveToXY(self,x,y):
             self.currentX = x
             self.currentY = y
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
-                return ["G1 X%.4f Y%.4f" % (x * 1000, y * 1000)]
-            else:
-                return ["G1 X%.4f Y%.4f" % (x, y)]
+            s = self.unitScale
+            return ["G1 X%.4f Y%.4f" % (x * s, y * s)]
            
         def MoveToZ(self,z):
             self.currentZ = z
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
-                return ["G1 Z%.4f" % (z * 1000)]
-            else:
-                return ["G1 Z%.4f" % (z)]
+            return ["G1 Z%.4f" % (z * self.unitScale)]
        
         def ArcToXY(self,x,y,xCenter,yCenter,G):
             self.currentX = x
             self.currentY = y
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
-                return ["%s X%.4f Y%.4f I%.4f J%.4f" % (G, x * 1000, y * 1000, xCenter * 1000, yCenter * 1000)]
-            else:
-                return ["%s X%.4f Y%.4f I%.4f J%.4f" % (G, x, y, xCenter, yCenter)]
+            s = self.unitScale
+            return ["%s X%.4f Y%.4f I%.4f J%.4f" % (G, x * s, y * s, xCenter * s, yCenter * s)]
            
         def ArcToXY2(self,x,y,r,G):
             self.currentX = x
             self.currentY = y
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
-                return ["%s X%.4f Y%.4f R%.5f" % (G, x * 1000, y * 1000, r * 1000)]
-            else:
-                return ["%s X%.4f Y%.4f R%.5f" % (G, x, y, r)]
+            s = self.unitScale
+            return ["%s X%.4f Y%.4f R%.5f" % (G, x * s, y * s, r * s)]
 
         #--------------------------------------------------------------------
         #--------------------------------------------------------------------
@@ -1937,6 +2162,65 @@ class Blender4CNC:
             # Clean up and remove the temporary image
             bpy.data.images.remove(image)
 
+        #*************************************************************************
+        # Return [width, height] of an image (using Blender)
+        #*************************************************************************
+        def GetImageDimensions(filenameIn):
+            # Remove image if it exists         
+            filename = bpy.path.basename(filenameIn)
+            wasLoaded = False
+            if filename in bpy.data.images.keys():
+                img = bpy.data.images[filename]
+            else:
+                img = bpy.data.images.load(filenameIn)
+                wasLoaded = True
+            (width, height) = img.size
+            if wasLoaded:
+                bpy.data.images.remove(img)
+            return [width, height]
+
+        #*************************************************************************
+        # The same as ReadGrayPNG, SaveGrayPNG and GetImageDimensions but reading
+        # and writing the files directly (without Blender)
+        #*************************************************************************
+        def ReadGrayPNGFile(filename):
+            im = skimage.io.imread(filename)
+            if im.ndim == 3:
+                im = im[:,:,0]  # red channel
+            if im.dtype != numpy.uint8:
+                im = skimage.util.img_as_ubyte(im)
+            return im.astype(float)
+
+        def SaveGrayPNGFile(filename, im):
+            # Round to whole gray levels (as Blender does when it saves an 8 bit PNG)
+            im2 = numpy.rint(numpy.clip(im, 0, 255)).astype(numpy.uint8)
+            skimage.io.imsave(filename, im2, check_contrast=False)
+
+        def GetImageFileDimensions(filename):
+            im = skimage.io.imread(filename)
+            return [im.shape[1], im.shape[0]]
+
+        #*************************************************************************
+        # Convert a bool (or 0/1) mask into a uint8 image of 0/255
+        #*************************************************************************
+        def MaskTo255(mask):
+            im = numpy.zeros(mask.shape, dtype=numpy.uint8)
+            im[mask != 0] = 255
+            return im
+
+        #*************************************************************************
+        # Convert a distance image (from a distance transform) into the smallest
+        # unsigned integer type that can hold the largest distance
+        #*************************************************************************
+        def CompactDistance(imDist):
+            maxDist = imDist.max() if imDist.size > 0 else 0
+            if maxDist <= numpy.iinfo(numpy.uint8).max:
+                return imDist.astype(numpy.uint8)
+            if maxDist <= numpy.iinfo(numpy.uint16).max:
+                return imDist.astype(numpy.uint16)
+            # FAILS COVERAGE
+            return imDist
+
     #***********************************************************************************************
     # The following code is a modified copy of pycsg from https://github.com/timknip/pycsg
     # (which in turn is a port of Evan Wallace's csg.js at https://github.com/evanw/csg.js/).
@@ -2610,9 +2894,19 @@ class Blender4CNC:
                 print(indent, methodName, "*" * 30)
             return (methodName, indent, self.debug[methodName])
         
-        def __init__(self):
+        # settings is a CoreSettings (if None, the settings of the current Blender scene are used)
+        def __init__(self, settings=None):
             self.debug = {}
-            pass
+            if settings == None:
+                settings = Blender4CNC.CoreSettings.FromBlender()
+            self.settings = settings
+
+        #*************************************************************************
+        # Returns the scale from internal units to GCode units (1000 for metric
+        # i.e. meters to mm).
+        #*************************************************************************
+        def GetUnitScale(self):
+            return self.settings.unitScale
 
         #*************************************************************************
         # This function gets called when the user clicks the "Process Image" 
@@ -2627,13 +2921,13 @@ class Blender4CNC:
             startTime = datetime.datetime.now()
             self.layername = ""
             self.GetCalculatedParams()
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
+            if self.settings.IsMetric():
                 print("Rough passes at depths: ", [round(x,4) for x in self.layer0Depths])
             else:
                 print("Rough passes at depths: ", [round(x,2) for x in self.layer0Depths])
             if len(self.layerNDepths) > 0:
                 # FAILS COVERAGE
-                if (bpy.context.scene.unit_settings.system == "METRIC"):
+                if self.settings.IsMetric():
                     print("Rough passes at depths (other layers): ", [round(x,4) for x in self.layerNDepths])
                 else:
                     print("Rough passes at depths (other layers): ", [round(x,2) for x in self.layerNDepths])
@@ -2688,7 +2982,7 @@ class Blender4CNC:
             imageScaleX = ((self.i2g.carving_width / self.i2g.ystep)+1) / float(self.cols)
             self.filename = os.path.splitext(self.i2g.file_name)[0]
             
-            imA = Blender4CNC.GrayImages.ReadGrayPNG(self.i2g.file_name)
+            imA = self.settings.ReadGrayPNG(self.i2g.file_name)
             x = imA.shape[1]
             y = imA.shape[0]
             print("Image cols,rows=", x,y)
@@ -2750,6 +3044,7 @@ class Blender4CNC:
             radius = (self.i2g.final_dia / 2) / self.pixelInInches
 
             # Layers need to be clipped and scaled (if not doing laminations this does not hurt)
+            smoothImages = []
             for i in range(0, self.i2g.number_layers):
                 # If doing laminations, each layer of image needs to be clipped and scaled
                 black = float(self.layers[i]["MinPixel"]) / self.MAX_PIXEL_VALUE
@@ -2766,8 +3061,13 @@ class Blender4CNC:
                 #****************************************************************
                 k = -(self.GetKernel(radius))
                 im2 = scipy.ndimage.grey_dilation(im, size=(radius*2+1,radius*2+1), structure=k)
-                print("Go_Image2GCode saving file: ", self.filename + "-L" + str(i) + "-A10-SMOOTH" + self.ext)
-                Blender4CNC.GrayImages.SaveGrayPNG(self.filename + "-L" + str(i) + "-A10-SMOOTH" + self.ext, im2)
+                # Keep the smoothed image in memory for the layer (as whole gray 
+                # levels, rounded the same as when saving to an 8 bit PNG)
+                smoothImages.append(numpy.rint(numpy.clip(im2, 0, 255)).astype(numpy.uint8))
+                if Blender4CNC.DEBUG_DEPTH_IMAGES:
+                    # FAILS COVERAGE
+                    print("Go_Image2GCode saving file: ", self.filename + "-L" + str(i) + "-A10-SMOOTH" + self.ext)
+                    self.settings.SaveGrayPNG(self.filename + "-L" + str(i) + "-A10-SMOOTH" + self.ext, im2)
             # End for i
 
             # The starting position of the cutter
@@ -2783,7 +3083,7 @@ class Blender4CNC:
                 for i in range(0, self.i2g.number_layers):
                     self.layername = "-L" + str(i)
                     self.i2g.max_depth = self.layers[i]["MaxDepth"]
-                    self.Go_Image2GCode_Layer()
+                    self.Go_Image2GCode_Layer(smoothImages[i])
                     self.listOfDepths = self.layerNDepths
             except: 
                 # FAILS COVERAGE               
@@ -2796,9 +3096,9 @@ class Blender4CNC:
                 # FAILS COVERAGE               
                 self.CombineGCodeLayers(self.filename)
 
-            # Delete temporary image files if required
+            # Delete temporary image files if required (keep them if debugging)
 #            if (i2g.clean_up == "yes"):
-            if True:
+            if not Blender4CNC.DEBUG_DEPTH_IMAGES:
                 print("Cleaning up temporary files")
                 try:
                     for suffix in ["-L*-A*.png", "-*.txt", "-*.pgm", "-B20-ROW*.png", "-L*-B*.png", "-A01-SCALED.png"]:
@@ -2863,11 +3163,11 @@ class Blender4CNC:
         # This function does most of the work of turning an image into
         # gcode
         #****************************************************************
-        def Go_Image2GCode_Layer(self):
+        def Go_Image2GCode_Layer(self, imSmooth):
             imName = self.filename + self.layername
             # We want to stay a margin of error above the smoothed image heights
             bumpHeight = ((- self.finalBitRadius / 2) / self.i2g.max_depth)
-            imA = Blender4CNC.GrayImages.ReadGrayPNG(imName + "-A10-SMOOTH.png")
+            imA = imSmooth.astype(float)
             imA10Smooth = copy.copy(imA)
             imA /= 255
             imA += bumpHeight
@@ -2893,9 +3193,7 @@ class Blender4CNC:
             if (self.layername != "-L0"):
                 # FAILS COVERAGE
                 print("Bridging orphaned material.")
-                inputFile = imName + "-A11-LAYERS.png"
-                finalBridgesFile = imName + "-A10-SMOOTH.png"
-                self.HandleMultiLayerOrphans(inputFile, finalBridgesFile)
+                imB = numpy.where(self.HandleMultiLayerOrphans(imB == 255, imA10Smooth), 255, 0)
                 
             imA =imB.astype(float)
             imA11 = copy.copy(imA)
@@ -2977,21 +3275,21 @@ class Blender4CNC:
             # Save images
             if Blender4CNC.DEBUG_DEPTH_IMAGES:
                 # FAILS COVERAGE
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A11.png", imA11 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A12-SMALL.png", imA12 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A13-SMALLCUT.png", imA13 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A14.png", imA14 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A15-LARGE.png", imA15 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A16-LARGECUT.png", imA16 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A17-LARGECUTSMALL.png", imA17 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A18-SMALL.png", imA18 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A19-SMALLCUT.png", imA19 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-B16-LARGECUTX.png", imB16 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-B19-SMALLCUTX.png", imB19 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A14-FINALCUT.png", imA14FinalCut * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-B14-FINALCUTX.png", imB14 * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A10-SMOOTHBORDER.png", imA10SmoothBorder * 255)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A14-FINAL.png", imA14Final * 255)
+                self.settings.SaveGrayPNG(imName + "-A11.png", imA11 * 255)
+                self.settings.SaveGrayPNG(imName + "-A12-SMALL.png", imA12 * 255)
+                self.settings.SaveGrayPNG(imName + "-A13-SMALLCUT.png", imA13 * 255)
+                self.settings.SaveGrayPNG(imName + "-A14.png", imA14 * 255)
+                self.settings.SaveGrayPNG(imName + "-A15-LARGE.png", imA15 * 255)
+                self.settings.SaveGrayPNG(imName + "-A16-LARGECUT.png", imA16 * 255)
+                self.settings.SaveGrayPNG(imName + "-A17-LARGECUTSMALL.png", imA17 * 255)
+                self.settings.SaveGrayPNG(imName + "-A18-SMALL.png", imA18 * 255)
+                self.settings.SaveGrayPNG(imName + "-A19-SMALLCUT.png", imA19 * 255)
+                self.settings.SaveGrayPNG(imName + "-B16-LARGECUTX.png", imB16 * 255)
+                self.settings.SaveGrayPNG(imName + "-B19-SMALLCUTX.png", imB19 * 255)
+                self.settings.SaveGrayPNG(imName + "-A14-FINALCUT.png", imA14FinalCut * 255)
+                self.settings.SaveGrayPNG(imName + "-B14-FINALCUTX.png", imB14 * 255)
+                self.settings.SaveGrayPNG(imName + "-A10-SMOOTHBORDER.png", imA10SmoothBorder * 255)
+                self.settings.SaveGrayPNG(imName + "-A14-FINAL.png", imA14Final * 255)
 
             #****************************************************************
             # Check for ring structures
@@ -3000,7 +3298,7 @@ class Blender4CNC:
             imA18 = self.HandleRingStructures(imA18)
             if Blender4CNC.DEBUG_DEPTH_IMAGES:
                 # FAILS COVERAGE
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A15-LARGE-POSTRING.png", imA15 * 255)
+                self.settings.SaveGrayPNG(imName + "-A15-LARGE-POSTRING.png", imA15 * 255)
 
             #****************************************************************
             # Images for showing cut material
@@ -3010,9 +3308,9 @@ class Blender4CNC:
             imA21SmallDist = self.DISTANCE(imA18 * 255)
             if Blender4CNC.DEBUG_DEPTH_IMAGES:
                 # FAILS COVERAGE
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A22-FINALDIST.png", imA22FinalDist)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A20-LARGEDIST.png", imA20LargeDist)
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-A21-FINALDIST.png", imA21SmallDist)
+                self.settings.SaveGrayPNG(imName + "-A22-FINALDIST.png", imA22FinalDist)
+                self.settings.SaveGrayPNG(imName + "-A20-LARGEDIST.png", imA20LargeDist)
+                self.settings.SaveGrayPNG(imName + "-A21-FINALDIST.png", imA21SmallDist)
                 X
 
             #****************************************************************
@@ -3089,12 +3387,15 @@ class Blender4CNC:
             self.outFileNames.append(fname + self.layername + "-3.ngc")
             self.outFileNames.append(fname + self.layername + "-4.ngc")
         # End Go_Image2GCode_Layer        
-        def Go_Image2GCode_Layer(self):
+        #****************************************************************
+        # imSmooth is the smoothed image for the layer (from Go_Image2GCode)
+        #****************************************************************
+        def Go_Image2GCode_Layer(self, imSmooth):
             imName = self.filename + self.layername
 
             # We want to stay a margin of error above the smoothed image heights
             bumpHeight = ((- self.finalBitRadius / 2) / self.i2g.max_depth)
-            imA = Blender4CNC.GrayImages.ReadGrayPNG(imName + "-A10-SMOOTH.png")
+            imA = imSmooth.astype(float)
             imA10Smooth = copy.copy(imA)
             imA /= 255
             imA += bumpHeight
@@ -3112,106 +3413,92 @@ class Blender4CNC:
                 d = self.listOfDepths[i]
                 thresh = 100-100*(d/self.i2g.max_depth)
                 thresh /= 100
-                im = numpy.where(imA>thresh, 0, 255)
-                images.append(im)
-            imB = numpy.vstack(tuple(images))
+                # The layers are bool masks (True where material is to be removed)
+                images.append(imA <= thresh)
+            imLayers = numpy.vstack(tuple(images))
 
             # Do not check base layer for orphaned material
             if (self.layername != "-L0"):
                 # FAILS COVERAGE
                 print("Bridging orphaned material.")
-                inputFile = imName + "-A11-LAYERS.png"
-                finalBridgesFile = imName + "-A10-SMOOTH.png"
-                self.HandleMultiLayerOrphans(inputFile, finalBridgesFile)
-                
-            imA =imB.astype(float)
-            imA11 = copy.copy(imA)
-            imA11 /= 255
+                imLayers = self.HandleMultiLayerOrphans(imLayers, imA10Smooth)
     
             # NEW SECTION *******************************************
-            #print("Go_Image2GCode_Layer C imagesize in bytes", imA11.nbytes)
+            # All the masks below are bool and the distance images are the smallest
+            # unsigned integer type that holds the distances
+            #print("Go_Image2GCode_Layer C imagesize in bytes", imLayers.nbytes)
             imageCount = 0
-            imLayers = imA11
-            imLargeFlatCenter = copy.copy(imA11)
-            imLargeFlatCut = copy.copy(imA11)
-            imLargeFlatDist = copy.copy(imA11)
-            imLayersAfterLargeFlat = copy.copy(imA11)
-            imSmallFlatCenter = copy.copy(imA11)
-            imSmallFlatCut = copy.copy(imA11)
-            imSmallFlatDist = copy.copy(imA11)
-            imLayersAfterSmallFlat = copy.copy(imA11)
-            imSmallBallDist = copy.copy(imA11)
 
             # Erode image by the large flat cutter
             k = self.GetDiscKernel(self.roughBitPixelRadius+0.3)
-            scipy.ndimage.morphology.binary_erosion(imLayers, structure=k, output=imLargeFlatCenter)
+            imLargeFlatCenter = scipy.ndimage.binary_erosion(imLayers, structure=k)
             #****************************************************************
             # Check for ring structures
             #****************************************************************
             imLargeFlatCenter = self.HandleRingStructures(imLargeFlatCenter)
             # Distance image for the large flat cutter
-            imLargeFlatDist = self.DISTANCE(imLargeFlatCenter * 255)
+            imLargeFlatDist = self.DISTANCE(imLargeFlatCenter)
             # Dilate to see what pixels got removed by the large flat cutter
-            self.DILATE(imLargeFlatCenter, imLargeFlatCut, self.roughBitPixelRadius-1+0.3)
+            imLargeFlatCut = self.DILATE(imLargeFlatCenter, numpy.zeros(imLayers.shape, dtype=bool), self.roughBitPixelRadius-1+0.3)
             # See what pixels are left to be removed
-            imLayersAfterLargeFlat = imLayers - imLargeFlatCut
+            imLayersAfterLargeFlat = imLayers & ~imLargeFlatCut
             # Erode image by the small flat cutter
             k = self.GetDiscKernel(self.finalBitPixelRadius+0.3)
-            scipy.ndimage.morphology.binary_erosion(imLayersAfterLargeFlat, structure=k, output=imSmallFlatCenter)
+            imSmallFlatCenter = scipy.ndimage.binary_erosion(imLayersAfterLargeFlat, structure=k)
             #****************************************************************
             # Check for ring structures
             #****************************************************************
             imSmallFlatCenter = self.HandleRingStructures(imSmallFlatCenter)
             # Distance image for the small flat cutter
-            imSmallFlatDist = self.DISTANCE(imSmallFlatCenter * 255)
+            imSmallFlatDist = self.DISTANCE(imSmallFlatCenter)
             # Dilate to see what pixels got removed by the small flat cutter
-            self.DILATE(imSmallFlatCenter, imSmallFlatCut, self.finalBitPixelRadius-1+0.3)
+            imSmallFlatCut = self.DILATE(imSmallFlatCenter, numpy.zeros(imLayers.shape, dtype=bool), self.finalBitPixelRadius-1+0.3)
             # See what pixels are left to be removed
-            imLayersAfterSmallFlat = imLayersAfterLargeFlat - imSmallFlatCut
+            imLayersAfterSmallFlat = imLayersAfterLargeFlat & ~imSmallFlatCut
             #****************************************************************
             # Check for ring structures
             #****************************************************************
             imLayersAfterSmallFlat = self.HandleRingStructures(imLayersAfterSmallFlat)
             imSmallBallCenter = imLayersAfterSmallFlat
             # Distance image for the small ball cutter
-            imSmallBallDist = self.DISTANCE(imSmallBallCenter * 255)
+            imSmallBallDist = self.DISTANCE(imSmallBallCenter)
 
             # Save images
             if Blender4CNC.DEBUG_DEPTH_IMAGES:
                 # FAILS COVERAGE
                 # imLayers is 0..1
                 imageCount += 1
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLayers.png", imLayers * 255)
+                self.settings.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLayers.png", imLayers * 255)
                 # imLargeFlatCenter is 0..1
                 imageCount += 1
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLargeFlatCenter.png", imLargeFlatCenter * 255)
+                self.settings.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLargeFlatCenter.png", imLargeFlatCenter * 255)
                 # imLargeFlatDist is 0..(max distance)
                 # (which is why we do not multiply by 255 when saving
                 imageCount += 1
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLargeFlatDist.png", imLargeFlatDist)
+                self.settings.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLargeFlatDist.png", imLargeFlatDist)
                 # imLargeFlatCut is 0..1
                 imageCount += 1
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLargeFlatCut.png", imLargeFlatCut * 255)
+                self.settings.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLargeFlatCut.png", imLargeFlatCut * 255)
                 # imLayersAfterLargeFlat is 0..1
                 imageCount += 1
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLayersAfterLargeFlat.png", imLayersAfterLargeFlat * 255)
+                self.settings.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLayersAfterLargeFlat.png", imLayersAfterLargeFlat * 255)
                 # imSmallFlatCenter is 0..1
                 imageCount += 1
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imSmallFlatCenter.png", imSmallFlatCenter * 255)
+                self.settings.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imSmallFlatCenter.png", imSmallFlatCenter * 255)
                 # imSmallFlatDist is 0..(max distance)
                 # (which is why we do not multiply by 255 when saving
                 imageCount += 1
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imSmallFlatDist.png", imSmallFlatDist)
+                self.settings.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imSmallFlatDist.png", imSmallFlatDist)
                 # imSmallFlatCut is 0..1
                 imageCount += 1
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imSmallFlatCut.png", imSmallFlatCut * 255)
+                self.settings.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imSmallFlatCut.png", imSmallFlatCut * 255)
                 # imLayersAfterSmallFlat is 0..1
                 imageCount += 1
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLayersAfterSmallFlat.png", imLayersAfterSmallFlat * 255)
+                self.settings.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imLayersAfterSmallFlat.png", imLayersAfterSmallFlat * 255)
                 # imSmallBallDist is 0..(max distance)
                 # (which is why we do not multiply by 255 when saving
                 imageCount += 1
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imSmallBallDist.png", imSmallBallDist)
+                self.settings.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imSmallBallDist.png", imSmallBallDist)
                 #print("histogram imSmallBallDist=", numpy.histogram(imSmallBallDist,255))
                 r,c = imSmallBallDist.shape
                 imAll = numpy.zeros((r,c*imageCount))
@@ -3235,7 +3522,7 @@ class Blender4CNC:
                 else:
                     imAll[0:r, c*9:c*10] = imSmallBallDist
                 imageCount += 1
-                Blender4CNC.GrayImages.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imAll.png", imAll)
+                self.settings.SaveGrayPNG(imName + "-" + "%02d" % imageCount + "-imAll.png", imAll)
 
             #****************************************************************
             # Process the distance images for the roughing passes 
@@ -3243,11 +3530,12 @@ class Blender4CNC:
             self.innerPathToleranceEnableCount = 0 # Start in G64 mode
             fname = self.filename + self.layername + "%s" + self.ext
             print("Processing GCode for Large Rough Cutter.")
-            largeRoughGCode = self.GetGCodeForDistanceImage("", "", self.roughBitPixelRadius, len(self.listOfDepths), True, imLargeFlatDist, imLargeFlatCenter * 255)
+            MaskTo255 = Blender4CNC.GrayImages.MaskTo255
+            largeRoughGCode = self.GetGCodeForDistanceImage("", "", self.roughBitPixelRadius, len(self.listOfDepths), True, imLargeFlatDist, MaskTo255(imLargeFlatCenter))
             print("Processing GCode for Small Rough Cutter.")
-            smallRoughGCode = self.GetGCodeForDistanceImage("", "", self.finalBitPixelRadius, 0, False, imSmallFlatDist, imSmallFlatCenter * 255)
+            smallRoughGCode = self.GetGCodeForDistanceImage("", "", self.finalBitPixelRadius, 0, False, imSmallFlatDist, MaskTo255(imSmallFlatCenter))
             print("Processing GCode for Small Final Cutter.")
-            finalRoughGCode = self.GetGCodeForDistanceImage("", "", self.finalBitPixelRadius, 0, False, imSmallBallDist, imLayersAfterSmallFlat * 255)
+            finalRoughGCode = self.GetGCodeForDistanceImage("", "", self.finalBitPixelRadius, 0, False, imSmallBallDist, MaskTo255(imLayersAfterSmallFlat))
             finalRoughGCode = ["G61 (Disable Trajectory Blending)\n"] + finalRoughGCode
 
             #****************************************************************
@@ -3266,40 +3554,13 @@ class Blender4CNC:
             # create the G-Code for it
             #****************************************************************
             finalGCode = []
-            path = []
             # Because this is the first point, and given how GetGCodeForPointLiteralZ works,
             # we upset the last value of Y deliberately
             self.lastY = -1
             finalGCode.append(self.GetGCodeForPointLiteralZ(0, 0, self.i2g.rapid_height))
             print("Processing GCode for final pass.")
             #print("self.rows, self.cols=", self.rows, self.cols)
-            for r in range(0,self.rows):
-                path = []
-
-                path.append("(Row " + str(r) + ", " + str(self.pixelInInches*r) + ")\n")
-                
-                # Zig-zag across image by rows
-                if ((r % 2) == 1):
-                    path.append(self.GetGCodeForPointActualZ_LastCol(self.cols-1, r, im[r,self.cols-1]))
-                    c = self.cols-2
-                    while (c >= 1):
-                        # Add any point at which we detect a change in gradient
-                        if ((im[r,c] - im[r,c+1]) != (im[r,c-1] - im[r,c])):
-                            path.append(self.GetGCodeForPointActualZ(c, r, im[r,c]))
-                        c -= 1
-                    # Add in the last point
-                    path.append(self.GetGCodeForPointActualZ(0, r, im[r,0]))
-                else:
-                    path.append(self.GetGCodeForPointActualZ(0, r, im[r,0]));
-                    for c in range(1, (self.cols-1)):
-                        # Add any point at which we detect a change in gradient
-                        if ((im[r,c] - im[r,c-1]) != (im[r,c+1] - im[r,c])):
-                            path.append(self.GetGCodeForPointActualZ(c, r, im[r,c]))
-                    # Add in the last point
-                    path.append(self.GetGCodeForPointActualZ_LastCol(self.cols-1, r, im[r,self.cols-1]))
-
-                finalGCode += path
-            # End for r    
+            finalGCode += self.GetGCodeForFinalPass(im)
             finalGCode.append(self.GetGCodeForSafeZ());
 
             fname = self.i2g.outBaseName
@@ -3315,10 +3576,12 @@ class Blender4CNC:
 
         def DILATE(self, im, imOut, sz):
             k = self.GetDiscKernel(sz)
-            scipy.ndimage.morphology.binary_dilation(im, structure=k, output=imOut)
+            scipy.ndimage.binary_dilation(im, structure=k, output=imOut)
+            return imOut
 
         def DISTANCE(self, im):
-            return scipy.ndimage.morphology.distance_transform_cdt(im, metric='chessboard', return_distances=True)
+            imDist = scipy.ndimage.distance_transform_cdt(im, metric='chessboard', return_distances=True)
+            return Blender4CNC.GrayImages.CompactDistance(imDist)
 
             # Put a white border around image
         def AddWhiteBorder(self, imA):
@@ -3430,10 +3693,10 @@ class Blender4CNC:
                         l = rowImages.split(" ")
                         images = []
                         for name in l:
-                            im = Blender4CNC.GrayImages.ReadGrayPNG(name)
+                            im = self.settings.ReadGrayPNG(name)
                             images.append(im)
                         imA = numpy.hstack(tuple(images))
-                        Blender4CNC.GrayImages.SaveGrayPNG(filename + "-B20-ROW%d.ext" % (gridRowCount+1), imA)
+                        self.settings.SaveGrayPNG(filename + "-B20-ROW%d.ext" % (gridRowCount+1), imA)
 
                         if (allRowImages == ""):
                             allRowImages = rowName
@@ -3447,10 +3710,10 @@ class Blender4CNC:
                     l = allRowImages.split(" ")
                     images = []
                     for name in l:
-                        im = Blender4CNC.GrayImages.ReadGrayPNG(name)
+                        im = self.settings.ReadGrayPNG(name)
                         images.append(im)
                     imA = numpy.vstack(tuple(images))
-                    Blender4CNC.GrayImages.SaveGrayPNG(filename + "-B3%d-GRIDCUTX.ext" % (phase), imA)
+                    self.settings.SaveGrayPNG(filename + "-B3%d-GRIDCUTX.ext" % (phase), imA)
                 # End for gridRow in grid:
 
                 # Write out the combined GCode
@@ -3502,8 +3765,8 @@ class Blender4CNC:
 #                    print("AAAAAAAAAAAAAAA ", im3[0,ij,ij])
             
             #im3 = im3 - 255
-            im3 = im3 - 1
-            im3 = abs(im3)
+            # Invert the mask (works for bool, 0/1 and 0/255 images)
+            im3 = (im3 == 0)
 
             #imTemp = im3.reshape((len(self.listOfDepths)*(self.rows+2), self.cols+2))
             #Blender4CNC.GrayImages.SaveGrayPNG("HandleRingStructures-im3-again.png", imTemp)
@@ -3562,15 +3825,17 @@ class Blender4CNC:
         # We handle this by finding ring structures on the lowest z-layer of all
         # but the base layers of the carving. We then add pixels of "bridge
         # material".
+        #
+        # imLayers is the stack of layer masks (True where material is to be 
+        # removed) and finalIm is the smoothed image used for the final GCode, 
+        # the bridges are added to finalIm in place and the new layer masks are
+        # returned.
         #*************************************************************************
-        def HandleMultiLayerOrphans(self, filename, finalName):
-            # Load in the image and make a copy of it for output
-            im = Blender4CNC.GrayImages.ReadGrayPNG(filename)
+        def HandleMultiLayerOrphans(self, imLayers, finalIm):
+            # Make the layers image (255 where material is to be removed) and a copy of it for output
+            im = numpy.where(imLayers, 255.0, 0.0)
             im = im.reshape((len(self.listOfDepths), self.rows+2, self.cols+2))
             im2 = copy.copy(im)
-
-            # Load in the image used for final GCode
-            finalIm = Blender4CNC.GrayImages.ReadGrayPNG(finalName)
             
             self.InvertImageLeaveBorder(im2)
 
@@ -3616,11 +3881,13 @@ class Blender4CNC:
                 # End for c
             # End for r
             
-            # Save out the new image after disconnecting rings
-            if (changed):
-                im = im.reshape((len(self.listOfDepths)* (self.rows+2), self.cols+2))
-                Blender4CNC.GrayImages.SaveGrayPNG(filename, im)
-                Blender4CNC.GrayImages.SaveGrayPNG(finalName, finalIm)
+            im = im.reshape(imLayers.shape)
+            # Save out the new images after disconnecting rings
+            if changed and Blender4CNC.DEBUG_DEPTH_IMAGES:
+                imName = self.filename + self.layername
+                self.settings.SaveGrayPNG(imName + "-A11-LAYERS.png", im)
+                self.settings.SaveGrayPNG(imName + "-A10-SMOOTH.png", finalIm)
+            return im == 255
         # End HandleMultiLayerOrphans
 
         #*************************************************************************
@@ -4064,16 +4331,26 @@ class Blender4CNC:
         # this blob
         #*************************************************************************
         def GetGCodeForThisBlob(self, im, modulus, z, curPixel, recursionDepth=0, infiniteLoopCounter = 100000, recursionDepthLimit = 5000):
+            toolPath = Blender4CNC.ToolPath()
+            self.GetToolPathForThisBlob(im, modulus, z, curPixel, toolPath, recursionDepth, infiniteLoopCounter, recursionDepthLimit)
+            return self.ToolPathToGCode(toolPath)
+
+        #*************************************************************************
+        # Follow the edge of a blob (and any inner paths) and add the moves to
+        # the ToolPath
+        #*************************************************************************
+        def GetToolPathForThisBlob(self, im, modulus, z, curPixel, path, recursionDepth=0, infiniteLoopCounter = 100000, recursionDepthLimit = 5000):
+            TP = Blender4CNC.ToolPath
             # Get the ring we are on
-            valu = im[z, curPixel.y, curPixel.x]
+            # (as a Python int so that valu + modulus cannot overflow a uint8/uint16 image)
+            valu = int(im[z, curPixel.y, curPixel.x])
             
             # Get starting pattern (to know when to exit)
             startPix = copy.copy(curPixel)
             startPix2 = self.GetPix(im, startPix, valu, z)
             
-            # Add start pixel to GCode path
-            path = []
-            path.append(self.GetGCodeForPoint(startPix.x, startPix.y, z))
+            # Add start pixel to path
+            self.AddPointToToolPath(path, startPix.x, startPix.y, z)
 
             modulusInt = int(modulus)
             if modulusInt == 0:
@@ -4100,9 +4377,7 @@ class Blender4CNC:
 
                 if (tp.x != -1):
                     # Move to the head
-                    s = self.GetGCodeForPoint(snake[-1].x, snake[-1].y, z)
-                    if (s != ''):
-                        path.append(s)
+                    self.AddPointToToolPath(path, snake[-1].x, snake[-1].y, z)
                     # Chop off the tail
                     snake = [snake[-1]]
                     
@@ -4111,35 +4386,30 @@ class Blender4CNC:
                     tol = self.pixelInInches * modulus / 4
                     if (self.innerPathToleranceEnableCount == 0):
                         # This must be the "first" inner path on this blob
-                        if (bpy.context.scene.unit_settings.system == "METRIC"):
-                            path += ["G64 P%0.4f Q%0.4f\n" % (tol * 1000, tol * 1000)]
-                        else:
-                            path += ["G64 P%0.4f Q%0.4f\n" % (tol, tol)]
+                        path.Append(TP.BLEND, i=tol, j=tol)
                     self.innerPathToleranceEnableCount += 1
                     
                     # Get inner path
-                    path += ["(Going In)\n"]
-                    path += self.GetGCodeForThisBlob(im, modulus, z, tp, recursionDepth+1)
-                    path += ["(Going Out)\n"]
+                    path.Append(TP.GOING_IN)
+                    self.GetToolPathForThisBlob(im, modulus, z, tp, path, recursionDepth+1)
+                    path.Append(TP.GOING_OUT)
 
                     # Switch back from optimization
                     self.innerPathToleranceEnableCount -= 1
                     if (self.innerPathToleranceEnableCount == 0):
                         # This must be the "first" inner path on this blob
-                        path += ["G64\n"]                 
+                        path.Append(TP.BLEND)
                     
                     # Clear inner path
                     self.FillBlob(im, tp.x, tp.y, z, None)
                     # Move to the head (from inner path)
-                    path.append(self.GetGCodeForPoint(snake[-1].x, snake[-1].y, z))
+                    self.AddPointToToolPath(path, snake[-1].x, snake[-1].y, z)
                 # End if inner path
                 else:
                     # Have we changed direction?
                     if (not snake[-1].IsDirectionEqual(snake[-2])):
                         # Move to the neck
-                        s = self.GetGCodeForPoint(snake[-2].x, snake[-2].y, z)
-                        if (s != ''):
-                            path.append(s)
+                        self.AddPointToToolPath(path, snake[-2].x, snake[-2].y, z)
 
                         # Chop off the tail
                         snake = [snake[-1]]
@@ -4154,11 +4424,8 @@ class Blender4CNC:
             # End while                    
             
             # Move to the neck
-            s = self.GetGCodeForPoint(snake[-2].x, snake[-2].y, z)
-            if (s != ''):
-                path.append(s)
-            # End GetGCodeForThisBlob
-            return path
+            self.AddPointToToolPath(path, snake[-2].x, snake[-2].y, z)
+            # End GetToolPathForThisBlob
 
         #*************************************************************************
         # From the current pixel/dir, determine if there is an inner path - if so,
@@ -4249,10 +4516,7 @@ class Blender4CNC:
         #*************************************************************************
         def GetGCodeForSafeZ(self):
             self.lastZ = self.i2g.rapid_height # -100
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
-                return "G0 Z%0.3f\n" % (self.i2g.rapid_height * 1000)
-            else:
-                return "G0 Z%0.3f\n" % self.i2g.rapid_height
+            return "G0 Z%0.3f\n" % (self.i2g.rapid_height * self.GetUnitScale())
 
         #*************************************************************************
         # GCode for moving rapidly to the next blob to cut
@@ -4262,10 +4526,8 @@ class Blender4CNC:
             y -= 1
             self.lastX = x
             self.lastY = y
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
-                return "G0 X%0.3f Y%0.3f\n" % (self.GetX(x) * 1000, self.GetY(y) * 1000)
-            else:
-                return "G0 X%0.3f Y%0.3f\n" % (self.GetX(x), self.GetY(y))
+            scale = self.GetUnitScale()
+            return "G0 X%0.3f Y%0.3f\n" % (self.GetX(x) * scale, self.GetY(y) * scale)
 
         #*************************************************************************
         # 
@@ -4292,34 +4554,78 @@ class Blender4CNC:
         # This is ONLY called when doing the final phase
         #*************************************************************************
         def GetGCodeForPointLiteralZ(self, x, y, z):
+            scale = self.GetUnitScale()
             s = "G1"
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
-                s += " X%0.3f" % (self.GetX(x) * 1000)
-                if (self.lastY != y):    
-                    s += " Y%0.3f" % (self.GetY(y) * 1000)
-                s += " Z%0.3f\n" % (z * 1000)
-            else:
-                s += " X%0.3f" % self.GetX(x)
-                if (self.lastY != y):    
-                    s += " Y%0.3f" % self.GetY(y)
-                s += " Z%0.3f\n" % z
+            s += " X%0.3f" % (self.GetX(x) * scale)
+            if (self.lastY != y):    
+                s += " Y%0.3f" % (self.GetY(y) * scale)
+            s += " Z%0.3f\n" % (z * scale)
             self.lastY = y
             return s
         def GetGCodeForPointLiteralZ_LastCol(self, x, y, z):
+            scale = self.GetUnitScale()
             s = "G1"
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
-                s += " X%0.3f" % (self.GetX_LastCol(x) * 1000)
-                if (self.lastY != y):    
-                    s += " Y%0.3f" % (self.GetY(y) * 1000)
-                s += " Z%0.3f\n" % (z * 1000)
-            else:
-                s += " X%0.3f" % self.GetX_LastCol(x)
-                if (self.lastY != y):    
-                    s += " Y%0.3f" % self.GetY(y)
-                s += " Z%0.3f\n" % z
+            s += " X%0.3f" % (self.GetX_LastCol(x) * scale)
+            if (self.lastY != y):    
+                s += " Y%0.3f" % (self.GetY(y) * scale)
+            s += " Z%0.3f\n" % (z * scale)
             self.lastY = y
             return s
 
+        #*************************************************************************
+        # GCode for the final pass over the smooth image. Zig-zag across the image
+        # by rows and for each row, add any point at which the gradient changes.
+        # (The same points as calling GetGCodeForPointActualZ for each point but 
+        # the points are found for each row at once and all the GCode is 
+        # formatted in bulk)
+        #*************************************************************************
+        def GetGCodeForFinalPass(self, im):
+            TP = Blender4CNC.ToolPath
+            rows = self.rows
+            cols = self.cols
+            im = im[0:rows, 0:cols]
+            if rows == 0:
+                # FAILS COVERAGE
+                return []
+
+            # The X of every column and the Z of every pixel
+            xs = numpy.arange(cols) * self.pixelInInches + self.i2g.offset_x
+            lastColX = self.GetX_LastCol(cols-1)
+            zs = ((float(self.MAX_PIXEL_VALUE) - im) / self.MAX_PIXEL_VALUE) * self.i2g.max_depth
+            # The gradient changes at columns 1..cols-2
+            grad = numpy.diff(im, axis=1)
+            gradChanges = (grad[:, 1:] != grad[:, :-1])
+
+            allMoves = []
+            for r in range(0, rows):
+                # The first and last column and any point at which we detect a change in gradient
+                c = numpy.flatnonzero(gradChanges[r]) + 1
+                X = numpy.concatenate(((xs[0],), xs[c], (lastColX,)))
+                Z = numpy.concatenate(((zs[r,0],), zs[r,c], (zs[r,cols-1],)))
+                if ((r % 2) == 1):
+                    X = X[::-1]
+                    Z = Z[::-1]
+                moves = numpy.full((len(X), TP.NUM_COLUMNS), nan)
+                moves[:, TP.KIND] = TP.LINE
+                moves[:, TP.X] = X
+                moves[:, TP.Z] = Z
+                # Y only changes at the start of a row
+                if (self.lastY != r):
+                    moves[0, TP.Y] = self.GetY(r)
+                self.lastY = r
+                allMoves.append(moves)
+            lines = TP(numpy.vstack(allMoves)).ToGCode(self.GetUnitScale(), "%0.3f", "\n")
+
+            # Add a comment at the start of each row
+            gcode = []
+            start = 0
+            for r in range(0, rows):
+                gcode.append("(Row " + str(r) + ", " + str(self.pixelInInches*r) + ")\n")
+                end = start + len(allMoves[r])
+                gcode += lines[start:end]
+                start = end
+            return gcode
+
         #*************************************************************************
         # GCode for moving to the next point - the z value represents a level in 
         # the list of roughing depths
@@ -4327,33 +4633,37 @@ class Blender4CNC:
         # This is ONLY called when doing the rough phases
         #*************************************************************************
         def GetGCodeForPoint(self, x, y, z):
-            s = "G1"
+            toolPath = Blender4CNC.ToolPath()
+            self.AddPointToToolPath(toolPath, x, y, z)
+            # If nothing changed, just have empty line
+            return "".join(self.ToolPathToGCode(toolPath))
+
+        #*************************************************************************
+        # Add a move to the next point to a ToolPath (see GetGCodeForPoint)
+        # Only the coordinates that have changed are included and if nothing 
+        # changed, no move is added
+        #*************************************************************************
+        def AddPointToToolPath(self, toolPath, x, y, z):
             # The images used for roughing have a buffer of one pixel around the borders
             # Therefore we need to subtract 1 from each coordinate 
             x -= 1
             y -= 1
-            if (bpy.context.scene.unit_settings.system == "METRIC"):
-                if (x != self.lastX):
-                    s += " X%0.3f" % (self.GetX(x) * 1000)
-                if (y != self.lastY):
-                    s += " Y%0.3f" % (self.GetY(y) * 1000)
-                if (self.listOfDepths[-z-1] != self.lastZ):
-                    s += " Z%0.3f" % (self.listOfDepths[-z-1] * 1000)
-            else:
-                if (x != self.lastX):
-                    s += " X%0.3f" % self.GetX(x)
-                if (y != self.lastY):
-                    s += " Y%0.3f" % self.GetY(y)
-                if (self.listOfDepths[-z-1] != self.lastZ):
-                    s += " Z%0.3f" % self.listOfDepths[-z-1]
+            depth = self.listOfDepths[-z-1]
+            changed = (x != self.lastX) or (y != self.lastY) or (depth != self.lastZ)
+            if changed:
+                X = self.GetX(x) if (x != self.lastX) else nan
+                Y = self.GetY(y) if (y != self.lastY) else nan
+                Z = depth if (depth != self.lastZ) else nan
+                toolPath.Append(Blender4CNC.ToolPath.LINE, X, Y, Z)
             self.lastX = x
             self.lastY = y
-            self.lastZ = self.listOfDepths[-z-1]
-            if (s == "G1"): # If nothing changed, just have empty line
-                s = ""
-            else:
-                s += "\n"
-            return s
+            self.lastZ = depth
+
+        #*************************************************************************
+        # Convert a ToolPath into GCode strings (as used in the .ngc files)
+        #*************************************************************************
+        def ToolPathToGCode(self, toolPath):
+            return toolPath.ToGCode(self.GetUnitScale(), "%0.3f", "\n")
 
         #*************************************************************************
         # Create a circular kernel to be used with grayscale dilation
@@ -4385,7 +4695,7 @@ class Blender4CNC:
             # Generate a quarter
             r = ceil(radius) + 1
             r2 = radius**2
-            k = numpy.zeros((r,r))
+            k = numpy.zeros((r,r), dtype=bool)
             for x in range(0,r):
                 for y in range(0,r):
                     d = x**2 + y**2
@@ -4501,18 +4811,7 @@ class Blender4CNC:
         # Get image dimensions
         #******************************************************************
         def GetImageDimensions(self, filenameIn):
-            # Remove image if it exists         
-            filename = bpy.path.basename(filenameIn)
-            wasLoaded = False
-            if filename in bpy.data.images.keys():
-                img = bpy.data.images[filename]
-            else:
-                img = bpy.data.images.load(filenameIn)
-                wasLoaded = True
-            (width, height) = img.size
-            if wasLoaded:
-                bpy.data.images.remove(img)
-            return [width, height]
+            return self.settings.GetImageDimensions(filenameIn)
         
     #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -6007,6 +6306,823 @@ class Blender4CNC:
 #END_COVERAGE#
 
 
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A uniform grid over the bounding boxes of a list of line segments (straight 
+    # or curved, as used by Polytoxogon). It is used to find the segments that
+    # might intersect a segment without testing every pair of segments.
+    # Bounding boxes are enlarged slightly to allow for the tolerances used when
+    # comparing points (e.g. CheckPointsAreOnStraightSegment allows REL_TOLERANCE
+    # outside of a segment), so any segments that might touch are always returned.
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #COVERAGE_CLASS SegmentGrid
+    class SegmentGrid:
+
+        # Lists smaller than this are just checked against every segment
+        MIN_LINES = 16
+        # The grid never has more than this many cells across
+        MAX_CELLS = 256
+
+        # boxes may be given if they are already known (see GetLineBoxes)
+        def __init__(self, lines, boxes=None):
+            n = len(lines)
+            if boxes is None:
+                boxes = Blender4CNC.SegmentGrid.GetLineBoxes(lines)
+            self.boxes = boxes
+            self.all = numpy.arange(n)
+            self.cells = None
+            if n < Blender4CNC.SegmentGrid.MIN_LINES:
+                return
+
+            # Make the cells about the size of an average segment
+            (self.x0, self.y0) = self.boxes[:,0:2].min(axis=0)
+            (x1, y1) = self.boxes[:,2:4].max(axis=0)
+            sizes = numpy.maximum(self.boxes[:,2] - self.boxes[:,0], self.boxes[:,3] - self.boxes[:,1])
+            maxCells = Blender4CNC.SegmentGrid.MAX_CELLS
+            self.cellSize = max(sizes.mean(), (x1 - self.x0) / maxCells, (y1 - self.y0) / maxCells)
+
+            self.cells = {}
+            for (i, (cx0, cy0, cx1, cy1)) in enumerate(self.GetCellRanges(self.boxes).tolist()):
+                for cx in range(cx0, cx1+1):
+                    for cy in range(cy0, cy1+1):
+                        self.cells.setdefault((cx, cy), []).append(i)
+
+        #********************************************************************
+        # Returns an array of the (enlarged) bounding boxes of all the segments
+        #********************************************************************
+        def GetLineBoxes(lines):
+            boxes = numpy.empty((len(lines), 4)) # minX, minY, maxX, maxY
+            for i,line in enumerate(lines):
+                boxes[i] = Blender4CNC.SegmentGrid.GetLineBox(line)
+            if len(lines) > 0:
+                eps = Blender4CNC.REL_TOLERANCE + 1e-4 * numpy.abs(boxes).max()
+                boxes[:,0:2] -= eps
+                boxes[:,2:4] += eps
+            return boxes
+
+        #********************************************************************
+        # Returns the bounding box (minX, minY, maxX, maxY) of a segment
+        # (for a curve, the box around the whole circle)
+        #********************************************************************
+        def GetLineBox(line):
+            (p0, p1) = line
+            if len(p1) == 2:
+                return (min(p0[0], p1[0]), min(p0[1], p1[1]), max(p0[0], p1[0]), max(p0[1], p1[1]))
+            (cx, cy) = (p1[2], p1[3])
+            r = max(hypot(p0[0] - cx, p0[1] - cy), hypot(p1[0] - cx, p1[1] - cy))
+            return (cx - r, cy - r, cx + r, cy + r)
+
+        #********************************************************************
+        # Returns False if the bounding boxes of two segments are so far apart 
+        # that the segments cannot possibly touch (allowing for tolerances)
+        #********************************************************************
+        def LineBoxesTouch(A, B):
+            (aMinX, aMinY, aMaxX, aMaxY) = Blender4CNC.SegmentGrid.GetLineBox(A)
+            (bMinX, bMinY, bMaxX, bMaxY) = Blender4CNC.SegmentGrid.GetLineBox(B)
+            m = max(-aMinX, -aMinY, aMaxX, aMaxY, -bMinX, -bMinY, bMaxX, bMaxY)
+            eps = 2 * (Blender4CNC.REL_TOLERANCE + 1e-4 * abs(m))
+            return (aMinX <= bMaxX + eps) and (bMinX <= aMaxX + eps) and (aMinY <= bMaxY + eps) and (bMinY <= aMaxY + eps)
+
+        #********************************************************************
+        # Returns the range of cells (cx0, cy0, cx1, cy1) covered by each box
+        #********************************************************************
+        def GetCellRanges(self, boxes):
+            boxes = numpy.asarray(boxes, dtype=float).reshape(-1, 4)
+            ranges = numpy.empty(boxes.shape)
+            ranges[:,0::2] = (boxes[:,0::2] - self.x0) / self.cellSize
+            ranges[:,1::2] = (boxes[:,1::2] - self.y0) / self.cellSize
+            return numpy.floor(ranges).astype(int)
+
+        #********************************************************************
+        # Returns a sorted list of the indices of the segments whose bounding
+        # boxes overlap the box (minX, minY, maxX, maxY)
+        #********************************************************************
+        def Overlapping(self, box):
+            candidates = self.all
+            if self.cells != None:
+                (cx0, cy0, cx1, cy1) = self.GetCellRanges(box)[0].tolist()
+                if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) < len(self.all):
+                    found = set()
+                    for cx in range(cx0, cx1+1):
+                        for cy in range(cy0, cy1+1):
+                            if (cx, cy) in self.cells:
+                                found.update(self.cells[(cx, cy)])
+                    candidates = numpy.fromiter(found, dtype=int, count=len(found))
+            b = self.boxes[candidates]
+            keep = (b[:,0] <= box[2]) & (b[:,2] >= box[0]) & (b[:,1] <= box[3]) & (b[:,3] >= box[1])
+            return sorted(candidates[keep].tolist())
+
+        # The segments that might intersect a segment
+        def OverlappingLine(self, line):
+            return self.Overlapping(Blender4CNC.SegmentGrid.GetLineBox(line))
+
+        # The segments that might intersect the i'th segment in the grid
+        def OverlappingIndex(self, i):
+            return self.Overlapping(self.boxes[i])
+
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A sweep line over a list of line segments (straight or curved) to find 
+    # every pair of segments in the list that might cross each other.
+    # A vertical line sweeps from left to right over the bounding boxes (the
+    # same enlarged boxes as SegmentGrid); a segment is "active" while the
+    # sweep line is inside its box and it is only paired with the active 
+    # segments whose boxes it overlaps in Y. Each pair is then tested exactly
+    # (with tolerances) by Polytoxogon.GetAllIntersections.
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #COVERAGE_CLASS SegmentSweep
+    class SegmentSweep:
+
+        # boxes may be given if they are already known (see GetLineBoxes)
+        def __init__(self, lines, boxes=None):
+            if boxes is None:
+                boxes = Blender4CNC.SegmentGrid.GetLineBoxes(lines)
+            self.boxes = boxes
+
+        #********************************************************************
+        # Returns a list where entry i is the sorted list of the segments 
+        # that might cross segment i
+        #********************************************************************
+        def GetCandidates(self):
+            boxes = self.boxes.tolist()
+            candidates = [[] for box in boxes]
+            order = sorted(range(len(boxes)), key=lambda i: boxes[i][0])
+            # The active segments in order of where the sweep line leaves them
+            active = []
+            for i in order:
+                (minX, minY, maxX, maxY) = boxes[i]
+                # Remove any segments that are entirely to the left of this one
+                while (len(active) > 0) and (active[0][0] < minX):
+                    heapq.heappop(active)
+                for (activeMaxX, j) in active:
+                    if (boxes[j][1] <= maxY) and (boxes[j][3] >= minY):
+                        candidates[i].append(j)
+                        candidates[j].append(i)
+                heapq.heappush(active, (maxX, i))
+            for l in candidates:
+                l.sort()
+            return candidates
+
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A list of line segments (straight or curved) stored as numpy arrays 
+    # (a structure of arrays) so that many pairs of segments can be 
+    # intersected at once in compiled code.
+    # The kernel only decides the easy pairs - those that are clearly apart 
+    # and straight lines that clearly cross each other. Every other pair (end
+    # points touching, overlaps, tangents etc.) is left to be tested exactly
+    # (with tolerances) by Polytoxogon.GetAllIntersections, so the results are
+    # the same as testing every pair with GetAllIntersections.
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #COVERAGE_CLASS SegmentArrays
+    class SegmentArrays:
+
+        #********************************************************************
+        # turns = 1 for a CCW curve, -1 for a CW curve, 0 for a straight line
+        #********************************************************************
+        def __init__(self, lines):
+            n = len(lines)
+            self.starts = numpy.empty((n, 2))
+            self.ends = numpy.empty((n, 2))
+            self.centers = numpy.zeros((n, 2))
+            self.turns = numpy.zeros(n)
+            for (i, (p0, p1)) in enumerate(lines):
+                self.starts[i] = p0[0:2]
+                self.ends[i] = p1[0:2]
+                if len(p1) > 2:
+                    self.centers[i] = p1[2:4]
+                    if p1[4] == 1:
+                        self.turns[i] = -1
+                    else:
+                        self.turns[i] = 1
+            self.curved = (self.turns != 0)
+
+            # The radius of a curve is the average of the radius at each end
+            r0 = numpy.hypot(self.starts[:,0] - self.centers[:,0], self.starts[:,1] - self.centers[:,1])
+            r1 = numpy.hypot(self.ends[:,0] - self.centers[:,0], self.ends[:,1] - self.centers[:,1])
+            self.radii = numpy.where(self.curved, (r0 + r1) / 2, 0)
+            self.radiusErrors = numpy.where(self.curved, numpy.abs(r0 - r1) / 2, 0)
+
+            # The size of the coordinates (the error allowed depends on it)
+            self.sizes = numpy.maximum(numpy.abs(self.starts).max(axis=1, initial=0), numpy.abs(self.ends).max(axis=1, initial=0))
+            circleSizes = numpy.abs(self.centers).max(axis=1, initial=0) + self.radii
+            self.sizes = numpy.where(self.curved, numpy.maximum(self.sizes, circleSizes), self.sizes)
+
+        #********************************************************************
+        # Intersects segment ia[k] of A with segment ib[k] of B for all k at
+        # once. Returns a list where entry k is:
+        #   []      - the segments cannot touch
+        #   [(x,y)] - two straight lines that cross (calculated exactly as
+        #             GetIntersectionBetweenLineAndLine would)
+        #   None    - must be tested with Polytoxogon.GetAllIntersections
+        #********************************************************************
+        def GetIntersections(A, ia, B, ib):
+            ia = numpy.asarray(ia, dtype=int)
+            ib = numpy.asarray(ib, dtype=int)
+            results = [None] * len(ia)
+            if len(ia) == 0:
+                return results
+
+            (a0x, a0y) = (A.starts[ia,0], A.starts[ia,1])
+            (a1x, a1y) = (A.ends[ia,0], A.ends[ia,1])
+            (acx, acy) = (A.centers[ia,0], A.centers[ia,1])
+            (b0x, b0y) = (B.starts[ib,0], B.starts[ib,1])
+            (b1x, b1y) = (B.ends[ib,0], B.ends[ib,1])
+            (bcx, bcy) = (B.centers[ib,0], B.centers[ib,1])
+            aR = A.radii[ia]
+            bR = B.radii[ib]
+            aCurved = A.curved[ia]
+            bCurved = B.curved[ib]
+
+            # Be generous with the error allowed - anything that is not clear
+            # gets tested exactly
+            eps = 4 * (Blender4CNC.REL_TOLERANCE + 1e-4 * numpy.maximum(A.sizes[ia], B.sizes[ib]))
+            eps += A.radiusErrors[ia] + B.radiusErrors[ib]
+
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                # Signed distances of points from the (infinite) line through 
+                # the ends of the other segment
+                (adx, ady) = (a1x - a0x, a1y - a0y)
+                (bdx, bdy) = (b1x - b0x, b1y - b0y)
+                aLen = numpy.hypot(adx, ady)
+                bLen = numpy.hypot(bdx, bdy)
+                aLong = (aLen > eps)
+                bLong = (bLen > eps)
+                sideB0 = (adx * (b0y - a0y) - ady * (b0x - a0x)) / aLen
+                sideB1 = (adx * (b1y - a0y) - ady * (b1x - a0x)) / aLen
+                sideA0 = (bdx * (a0y - b0y) - bdy * (a0x - b0x)) / bLen
+                sideA1 = (bdx * (a1y - b0y) - bdy * (a1x - b0x)) / bLen
+
+                # Two straight lines - apart if one is entirely on one side of the other
+                apartLines = (aLong & (((sideB0 > eps) & (sideB1 > eps)) | ((sideB0 < -eps) & (sideB1 < -eps))))
+                apartLines |= (bLong & (((sideA0 > eps) & (sideA1 > eps)) | ((sideA0 < -eps) & (sideA1 < -eps))))
+
+                # A straight line and a curve - apart if the line misses the 
+                # circle or is entirely inside the circle
+                bCenterSide = (adx * (bcy - a0y) - ady * (bcx - a0x)) / aLen
+                apartLineArc = (aLong & (numpy.abs(bCenterSide) > bR + eps))
+                apartLineArc |= ((numpy.hypot(a0x - bcx, a0y - bcy) < bR - eps) & (numpy.hypot(a1x - bcx, a1y - bcy) < bR - eps))
+                aCenterSide = (bdx * (acy - b0y) - bdy * (acx - b0x)) / bLen
+                apartArcLine = (bLong & (numpy.abs(aCenterSide) > aR + eps))
+                apartArcLine |= ((numpy.hypot(b0x - acx, b0y - acy) < aR - eps) & (numpy.hypot(b1x - acx, b1y - acy) < aR - eps))
+
+                # Two curves - apart if the circles do not touch
+                d = numpy.hypot(acx - bcx, acy - bcy)
+                apartArcs = (d > aR + bR + eps) | (d < numpy.abs(aR - bR) - eps)
+
+                apart = numpy.where(aCurved, numpy.where(bCurved, apartArcs, apartArcLine), numpy.where(bCurved, apartLineArc, apartLines))
+
+                # Two straight lines that clearly cross (away from the ends), 
+                # avoiding the special cases of vertical, horizontal and parallel 
+                # lines in GetIntersectionBetweenLineAndLine
+                FEQ = Blender4CNC.SegmentArrays.FloatsAreEqual
+                m1 = ady / adx
+                C1 = a0y - m1 * a0x
+                m2 = bdy / bdx
+                C2 = b0y - m2 * b0x
+                cross = ~aCurved & ~bCurved & aLong & bLong
+                cross &= (numpy.minimum(numpy.abs(sideB0), numpy.abs(sideB1)) > eps) & ((sideB0 > 0) != (sideB1 > 0))
+                cross &= (numpy.minimum(numpy.abs(sideA0), numpy.abs(sideA1)) > eps) & ((sideA0 > 0) != (sideA1 > 0))
+                cross &= ~FEQ(a1x, a0x) & ~FEQ(b1x, b0x) & ~(FEQ(a1y, a0y) & FEQ(b1y, b0y)) & ~FEQ(m1, m2)
+                x = (C2 - C1) / (m1 - m2)
+
+            for k in numpy.flatnonzero(apart).tolist():
+                results[k] = []
+            ks = numpy.flatnonzero(cross)
+            prec = 15
+            for (k, xk, m1k, C1k) in zip(ks.tolist(), x[ks].tolist(), m1[ks].tolist(), C1[ks].tolist()):
+                xk = round(xk, prec)
+                y = round(m1k * xk, prec)
+                y = round(y + C1k, prec)
+                results[k] = [(xk, y)]
+            return results
+
+        #********************************************************************
+        # Intersects every line i in A with every line in candidates[i] in B
+        # Returns a list where entry i is the list of the results (see 
+        # GetIntersections) for the lines in candidates[i]
+        #********************************************************************
+        def GetIntersectionsOfCandidates(A, B, candidates):
+            counts = [len(c) for c in candidates]
+            ia = numpy.repeat(numpy.arange(len(candidates)), counts)
+            ib = numpy.fromiter((j for c in candidates for j in c), dtype=int, count=sum(counts))
+            results = Blender4CNC.SegmentArrays.GetIntersections(A, ia, B, ib)
+            out = []
+            k = 0
+            for n in counts:
+                out.append(results[k:k+n])
+                k += n
+            return out
+
+        #********************************************************************
+        # Vectorized Blender4CNC.FloatsAreEqual
+        #********************************************************************
+        def FloatsAreEqual(a, b):
+            return numpy.abs(a - b) <= numpy.maximum(1e-5 * numpy.maximum(numpy.abs(a), numpy.abs(b)), 1e-9)
+
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # Joins many polys at once (e.g. overlapping tenons).
+    # Only polys whose bounding boxes overlap are tested (found with a
+    # SegmentSweep over the boxes) and the polys that touch are grouped
+    # together with union-find. Each group is then joined in a balanced tree
+    # order - pairs of touching polys are joined, then pairs of the joined 
+    # polys etc. - rather than joining one poly at a time onto an ever
+    # growing poly.
+    # Touch(polyA, polyB) returns True if two polys must be joined
+    # Join(polyA, polyB) returns the joined poly
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #COVERAGE_CLASS CascadedUnion
+    class CascadedUnion:
+
+        def __init__(self, Touch, Join):
+            self.Touch = Touch
+            self.Join = Join
+
+        #********************************************************************
+        # Returns the list of joined polys (polys that do not touch any other
+        # poly are returned unchanged and in the same order)
+        #********************************************************************
+        def JoinPolys(self, polys):
+            out = []
+            for group in self.GetGroups(polys):
+                out += self.JoinGroup([polys[i] for i in group])
+            return out
+
+        #********************************************************************
+        # Returns a list of groups (lists of indices into polys) of polys that
+        # touch each other, ordered by their first poly
+        #********************************************************************
+        def GetGroups(self, polys):
+            parents = list(range(0, len(polys)))
+            def Find(i):
+                while parents[i] != i:
+                    parents[i] = parents[parents[i]]
+                    i = parents[i]
+                return i
+
+            candidates = Blender4CNC.SegmentSweep(polys, self.GetBoxes(polys)).GetCandidates()
+            for (i, l) in enumerate(candidates):
+                for j in l:
+                    if j <= i:
+                        continue
+                    (rootI, rootJ) = (Find(i), Find(j))
+                    if rootI == rootJ:
+                        continue
+                    if self.Touch(polys[i], polys[j]):
+                        parents[max(rootI, rootJ)] = min(rootI, rootJ)
+
+            groups = {}
+            for i in range(0, len(polys)):
+                groups.setdefault(Find(i), []).append(i)
+            return [groups[root] for root in sorted(groups.keys())]
+
+        #********************************************************************
+        # Join a group of polys in a balanced tree order
+        #********************************************************************
+        def JoinGroup(self, polys):
+            while len(polys) > 1:
+                boxes = self.GetBoxes(polys)
+                joined = []
+                used = [False] * len(polys)
+                for i in range(0, len(polys)):
+                    if used[i]:
+                        continue
+                    used[i] = True
+                    (minX, minY, maxX, maxY) = boxes[i]
+                    near = (boxes[:,0] <= maxX) & (boxes[:,2] >= minX) & (boxes[:,1] <= maxY) & (boxes[:,3] >= minY)
+                    partner = None
+                    for j in numpy.flatnonzero(near[i+1:]).tolist():
+                        j += i + 1
+                        if (not used[j]) and self.Touch(polys[i], polys[j]):
+                            partner = j
+                            break
+                    if partner == None:
+                        joined.append(polys[i])
+                    else:
+                        used[partner] = True
+                        joined.append(self.Join(polys[i], polys[partner]))
+                if len(joined) == len(polys):
+                    # Nothing touches any more
+                    break
+                polys = joined
+            return polys
+
+        #********************************************************************
+        # Returns an array of the (enlarged) bounding boxes of the polys
+        #********************************************************************
+        def GetBoxes(self, polys):
+            boxes = numpy.array([poly.GetBoundingRectangle() for poly in polys], dtype=float).reshape(-1, 4)
+            if len(polys) > 0:
+                eps = Blender4CNC.REL_TOLERANCE + 1e-4 * numpy.abs(boxes).max()
+                boxes[:,0:2] -= eps
+                boxes[:,2:4] += eps
+            return boxes
+
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class for fixed point coordinates - coordinates are snapped to an 
+    # integer grid (e.g. 1e-6 of the project unit) so that input points that 
+    # are nearly the same (or nearly on a line) become exactly the same.
+    # Only the input of a calculation is snapped (see Pockets.CutPocketRoughFinal)
+    # - the polys made while offsetting are not on the grid and are compared
+    # within the usual tolerance.
+    # Points are (x,y) or (x,y,centerX,centerY,CW). The ends of a curve are
+    # snapped to the grid but its center is moved (off the grid) so that both
+    # ends stay the same distance from it (the CW flag is unchanged).
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #COVERAGE_CLASS FixedPointGrid
+    class FixedPointGrid:
+
+        def __init__(self, resolution=1e-6):
+            if resolution <= 0:
+                raise Exception("ERROR grid resolution must be greater than 0.0")
+            self.resolution = resolution
+
+        #********************************************************************
+        # Convert a coordinate to/from a whole number of grid steps
+        #********************************************************************
+        def ToInt(self, v):
+            return int(round(v / self.resolution))
+
+        def ToFloat(self, i):
+            return i * self.resolution
+
+        #********************************************************************
+        # Convert a point to/from integers
+        #********************************************************************
+        def PointToInts(self, p):
+            if len(p) == 2:
+                return (self.ToInt(p[0]), self.ToInt(p[1]))
+            return (self.ToInt(p[0]), self.ToInt(p[1]), self.ToInt(p[2]), self.ToInt(p[3]), p[4])
+
+        def PointFromInts(self, q):
+            if len(q) == 2:
+                return (self.ToFloat(q[0]), self.ToFloat(q[1]))
+            return (self.ToFloat(q[0]), self.ToFloat(q[1]), self.ToFloat(q[2]), self.ToFloat(q[3]), q[4])
+
+        #********************************************************************
+        # Snap points onto the grid
+        #********************************************************************
+        def SnapPoint(self, p):
+            return self.PointFromInts(self.PointToInts(p))
+
+        #********************************************************************
+        # Snap the points of a poly onto the grid - the start of a curve is
+        # the previous point. Snapping the center of a curve as well would 
+        # leave its ends at different distances from the center (e.g. the 
+        # corner curves of an offset), so the center is moved to the nearest
+        # point that is the same distance from both snapped ends.
+        #********************************************************************
+        def SnapPoints(self, points):
+            ends = [self.SnapPoint(p[0:2]) for p in points]
+            snapped = []
+            for i in range(0, len(points)):
+                p = points[i]
+                if len(p) == 2:
+                    snapped.append(ends[i])
+                    continue
+                snapped.append(ends[i] + self.GetCurveCenter(ends[i-1], ends[i], p[2:4]) + (p[4],))
+            return snapped
+
+        #********************************************************************
+        # Returns the point nearest to center that is the same distance from
+        # start and end (on the perpendicular bisector of start->end)
+        #********************************************************************
+        def GetCurveCenter(self, start, end, center):
+            (mx, my) = ((start[0] + end[0]) / 2, (start[1] + end[1]) / 2)
+            (dx, dy) = (end[0] - start[0], end[1] - start[1])
+            d2 = dx * dx + dy * dy
+            if d2 == 0:
+                return center
+            # Remove the part of (center - mid) along start->end
+            t = ((center[0] - mx) * dx + (center[1] - my) * dy) / d2
+            return (center[0] - t * dx, center[1] - t * dy)
+
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class for the planar arrangement of the lines and curves of any number
+    # of polys (the operands) that is used for boolean operations on all the
+    # polys in one go (see Polytoxogon.AddMultiple and SubtractMultiple).
+    #
+    # Every line/curve is cut wherever it meets a line/curve of another
+    # operand and the pieces become the edges of a planar graph (points that
+    # are equal are merged into one vertex and pieces that lie on top of each
+    # other become one edge). Each edge is stored as two half-edges going in
+    # opposite directions - half-edge h goes from start to end of the piece,
+    # h^1 (its twin) goes back. The half-edges leaving each vertex are sorted
+    # by angle and following a half-edge by the next half-edge clockwise
+    # around its end vertex goes around a face (the face is on the left of
+    # its half-edges, bounded faces go CCW).
+    #
+    # Every face is labelled with the operands that it is inside (a bit mask
+    # - crossing an edge toggles the operands that the edge belongs to). The
+    # result of a boolean operation is the faces whose labels pass a test and
+    # its boundary is the half-edges that have a face that passes on their
+    # right and one that does not on their left.
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #COVERAGE_CLASS Arrangement
+    class Arrangement:
+
+        def __init__(self, polys):
+            self.polys = [poly for poly in polys if len(poly.lines) > 0]
+            self.GetEdges()
+            self.GetHalfEdges()
+            self.GetFaces()
+            self.GetLabels()
+
+        #********************************************************************
+        # Cut the lines of each poly by the lines of all the other polys and
+        # merge the points and the pieces that are the same
+        # For each edge:
+        #   edgeStarts, edgeEnds - the vertices at the start and end
+        #   edgeCenters, edgeCWs - the center and CW value of a curve
+        #                          (CW = 0 for a straight line)
+        #   edgeOwners           - the bit mask of the operands that the edge
+        #                          belongs to (an operand that goes along an
+        #                          edge twice does not own it)
+        #   edgeUsers            - the bit mask of the operands that have a
+        #                          piece on the edge
+        #********************************************************************
+        def GetEdges(self):
+            pieces = []
+            owners = []
+            for (k, poly) in enumerate(self.polys):
+                others = [line for (j, other) in enumerate(self.polys) if j != k for line in other.lines]
+                lines = poly.lines
+                if len(others) > 0:
+                    lines = poly.CutAllLines(lines, others)
+                lines = poly.RemoveZeroLengthLines(lines)
+                pieces += lines
+                owners += [k] * len(lines)
+
+            ends = numpy.array([[line[0][0], line[0][1], line[1][0], line[1][1]] for line in pieces], dtype=float).reshape(-1, 2)
+            (vertexOfEnd, self.vertices) = self.MergePoints(ends)
+            (starts, ends) = (vertexOfEnd[0::2].tolist(), vertexOfEnd[1::2].tolist())
+
+            # Pieces between the same two vertices are the same edge if they
+            # are both straight or they are curves with the same middle point
+            (self.edgeStarts, self.edgeEnds, self.edgeCenters, self.edgeCWs) = ([], [], [], [])
+            (self.edgeOwners, self.edgeUsers) = ([], [])
+            sameEnds = {}
+            FEQ = Blender4CNC.FloatsAreEqual
+            for (i, line) in enumerate(pieces):
+                (u, v) = (starts[i], ends[i])
+                if u == v:
+                    continue
+                if len(line[1]) == 2:
+                    (center, CW, middle) = ((0.0, 0.0), 0, None)
+                else:
+                    (center, CW) = (line[1][2:4], line[1][4])
+                    middle = self.GetMiddleOfCurve(self.vertices[u], self.vertices[v], center, CW)
+                edge = None
+                for j in sameEnds.get((min(u, v), max(u, v)), []):
+                    if (self.edgeCWs[j] == 0) and (CW == 0):
+                        edge = j
+                    elif (self.edgeCWs[j] != 0) and (CW != 0):
+                        other = self.GetMiddleOfCurve(self.vertices[self.edgeStarts[j]], self.vertices[self.edgeEnds[j]], self.edgeCenters[j], self.edgeCWs[j])
+                        if FEQ(middle[0], other[0]) and FEQ(middle[1], other[1]):
+                            edge = j
+                    if edge != None:
+                        break
+                if edge == None:
+                    edge = len(self.edgeStarts)
+                    sameEnds.setdefault((min(u, v), max(u, v)), []).append(edge)
+                    self.edgeStarts.append(u)
+                    self.edgeEnds.append(v)
+                    self.edgeCenters.append(center)
+                    self.edgeCWs.append(CW)
+                    self.edgeOwners.append(0)
+                    self.edgeUsers.append(0)
+                self.edgeOwners[edge] ^= (1 << owners[i])
+                self.edgeUsers[edge] |= (1 << owners[i])
+
+        #********************************************************************
+        # Merges the points that are equal (Blender4CNC.FloatsAreEqual)
+        # Returns (the vertex of each point, the array of vertices)
+        #********************************************************************
+        def MergePoints(self, points):
+            parents = list(range(0, len(points)))
+            def Find(i):
+                while parents[i] != i:
+                    parents[i] = parents[parents[i]]
+                    i = parents[i]
+                return i
+
+            if len(points) > 1:
+                tolerance = max(Blender4CNC.ABS_TOLERANCE, Blender4CNC.REL_TOLERANCE * numpy.abs(points).max())
+                pairs = scipy.spatial.cKDTree(points).query_pairs(tolerance * 1.5, output_type='ndarray')
+                same = Blender4CNC.SegmentArrays.FloatsAreEqual(points[pairs[:,0]], points[pairs[:,1]]).all(axis=1)
+                for (i, j) in pairs[same].tolist():
+                    (rootI, rootJ) = (Find(i), Find(j))
+                    parents[max(rootI, rootJ)] = min(rootI, rootJ)
+            roots = numpy.array([Find(i) for i in range(0, len(points))], dtype=int)
+            (uniqueRoots, vertexOfPoint) = numpy.unique(roots, return_inverse=True)
+            return (vertexOfPoint.reshape(-1), points[uniqueRoots])
+
+        #********************************************************************
+        # Returns the signed angle (CCW is positive) that a curve from a to b
+        # turns through around its center
+        #********************************************************************
+        def GetCurveSweep(self, a, b, center, CW):
+            a0 = math.atan2(a[1] - center[1], a[0] - center[0])
+            a1 = math.atan2(b[1] - center[1], b[0] - center[0])
+            if CW == 1:
+                return -((a0 - a1) % (2 * math.pi))
+            return (a1 - a0) % (2 * math.pi)
+
+        def GetMiddleOfCurve(self, a, b, center, CW):
+            angle = math.atan2(a[1] - center[1], a[0] - center[0]) + self.GetCurveSweep(a, b, center, CW) / 2
+            radius = math.hypot(a[0] - center[0], a[1] - center[1])
+            return (center[0] + radius * math.cos(angle), center[1] + radius * math.sin(angle))
+
+        #********************************************************************
+        # Set up the half-edges
+        #   origins, targets - the vertices at the start and end
+        #   nexts            - the next half-edge around the face on the left
+        #   areas            - the signed area (CCW is positive) that the
+        #                      half-edge adds to the area of a loop
+        #********************************************************************
+        def GetHalfEdges(self):
+            numEdges = len(self.edgeStarts)
+            starts = numpy.array(self.edgeStarts, dtype=int)
+            ends = numpy.array(self.edgeEnds, dtype=int)
+            self.origins = numpy.stack((starts, ends), axis=1).reshape(-1)
+            self.targets = numpy.stack((ends, starts), axis=1).reshape(-1)
+            CWs = numpy.array(self.edgeCWs, dtype=float)
+            CWs = numpy.stack((CWs, -CWs), axis=1).reshape(-1)
+            centers = numpy.repeat(numpy.array(self.edgeCenters, dtype=float).reshape(-1, 2), 2, axis=0)
+            a = self.vertices[self.origins]
+            b = self.vertices[self.targets]
+
+            # The direction that each half-edge leaves its origin and how much
+            # it curves to the left (to sort half-edges that leave in the same
+            # direction)
+            r = a - centers
+            radii = numpy.hypot(r[:,0], r[:,1])
+            curved = (CWs != 0)
+            dx = numpy.where(curved, CWs * r[:,1], b[:,0] - a[:,0])
+            dy = numpy.where(curved, -CWs * r[:,0], b[:,1] - a[:,1])
+            angles = numpy.round(numpy.arctan2(dy, dx), 9)
+            angles[angles >= numpy.round(math.pi, 9)] = -numpy.round(math.pi, 9)
+            curvatures = numpy.zeros(len(CWs))
+            curvatures[curved] = -CWs[curved] / radii[curved]
+
+            # Sort the half-edges CCW around each vertex
+            order = numpy.lexsort((curvatures, angles, self.origins))
+            counts = numpy.bincount(self.origins, minlength=len(self.vertices))
+            firsts = numpy.concatenate(([0], numpy.cumsum(counts)[:-1]))
+            positions = numpy.empty(len(order), dtype=int)
+            positions[order] = numpy.arange(len(order))
+            v = self.origins
+            clockwise = order[firsts[v] + (positions - firsts[v] - 1) % numpy.maximum(counts[v], 1)]
+            twins = numpy.arange(2 * numEdges) ^ 1
+            self.nexts = clockwise[twins]
+
+            # Area of the chord plus the part of the circle for a curve
+            self.areas = (a[:,0] * b[:,1] - b[:,0] * a[:,1]) / 2
+            for h in numpy.flatnonzero(curved).tolist():
+                sweep = self.GetCurveSweep(a[h], b[h], centers[h], CWs[h])
+                self.areas[h] += radii[h] ** 2 * (sweep - math.sin(sweep)) / 2
+
+        #********************************************************************
+        # Follow the half-edges around each face
+        #   faceOf       - the face of each half-edge
+        #   faceAreas    - the signed area of each face (negative for the
+        #                  outside of a connected set of edges)
+        #   faceHalfEdges - the list of half-edges around each face
+        #********************************************************************
+        def GetFaces(self):
+            self.faceOf = numpy.full(len(self.nexts), -1, dtype=int)
+            self.faceHalfEdges = []
+            nexts = self.nexts.tolist()
+            for first in range(0, len(nexts)):
+                if self.faceOf[first] >= 0:
+                    continue
+                face = len(self.faceHalfEdges)
+                halfEdges = []
+                h = first
+                while self.faceOf[h] < 0:
+                    self.faceOf[h] = face
+                    halfEdges.append(h)
+                    h = nexts[h]
+                self.faceHalfEdges.append(halfEdges)
+            self.faceAreas = numpy.array([self.areas[l].sum() for l in self.faceHalfEdges])
+
+        #********************************************************************
+        # Label every face with the bit mask of the operands that it is inside
+        # The outside face of each connected set of edges is inside only the
+        # operands that have no edges in the set and contain it, the other
+        # faces are found by crossing the edges from there.
+        #********************************************************************
+        def GetLabels(self):
+            parents = list(range(0, len(self.vertices)))
+            def Find(i):
+                while parents[i] != i:
+                    parents[i] = parents[parents[i]]
+                    i = parents[i]
+                return i
+            for (u, v) in zip(self.edgeStarts, self.edgeEnds):
+                (rootU, rootV) = (Find(u), Find(v))
+                parents[max(rootU, rootV)] = min(rootU, rootV)
+
+            # Group the faces by the connected set that they are in
+            groups = {}
+            for (face, halfEdges) in enumerate(self.faceHalfEdges):
+                groups.setdefault(Find(int(self.origins[halfEdges[0]])), []).append(face)
+            edgeUsers = {}
+            for (edge, u) in enumerate(self.edgeStarts):
+                root = Find(u)
+                edgeUsers[root] = edgeUsers.get(root, 0) | self.edgeUsers[edge]
+
+            self.faceLabels = [None] * len(self.faceHalfEdges)
+            for (root, faces) in groups.items():
+                outside = min(faces, key=lambda face: self.faceAreas[face])
+                label = 0
+                vertex = self.vertices[root]
+                for (k, poly) in enumerate(self.polys):
+                    if not (edgeUsers[root] & (1 << k)):
+                        if poly.IsPointInside(vertex):
+                            label |= (1 << k)
+                self.faceLabels[outside] = label
+                todo = [outside]
+                while len(todo) > 0:
+                    face = todo.pop()
+                    for h in self.faceHalfEdges[face]:
+                        other = self.faceOf[h ^ 1]
+                        if self.faceLabels[other] == None:
+                            self.faceLabels[other] = self.faceLabels[face] ^ self.edgeOwners[h >> 1]
+                            todo.append(other)
+
+        #********************************************************************
+        # Returns the area made of the faces whose labels pass Test as a list
+        # of [poly, tenons] (the same as Polytoxogon.Add, [[None, []]] if there
+        # is nothing)
+        # Where parts touch at a point, they are joined into one poly (as Add
+        # does).
+        #********************************************************************
+        def GetResult(self, Test):
+            inside = numpy.array([bool(Test(label)) for label in self.faceLabels], dtype=bool)
+            halfInside = inside[self.faceOf]
+            twins = numpy.arange(len(self.nexts)) ^ 1
+            # The result is on the right of each half-edge of its boundary
+            boundary = (~halfInside & halfInside[twins]).tolist()
+            nexts = self.nexts.tolist()
+
+            # Follow the boundary - at each vertex turn to the left-most
+            # half-edge of the boundary
+            loops = []
+            done = [False] * len(nexts)
+            for first in numpy.flatnonzero(boundary).tolist():
+                if done[first]:
+                    continue
+                loop = []
+                h = first
+                while not done[h]:
+                    done[h] = True
+                    loop.append(h)
+                    h = nexts[h]
+                    while not boundary[h]:
+                        h = nexts[h ^ 1]
+                loops.append(loop)
+
+            # Outside loops are CW, tenons are CCW
+            polys = []
+            tenons = []
+            for loop in loops:
+                area = self.areas[loop].sum()
+                points = []
+                for h in loop:
+                    (x, y) = self.vertices[self.targets[h]].tolist()
+                    CW = self.edgeCWs[h >> 1]
+                    if CW == 0:
+                        points.append((x, y))
+                    else:
+                        (cx, cy) = self.edgeCenters[h >> 1]
+                        points.append((x, y, cx, cy, CW if (h & 1) == 0 else -CW))
+                poly = Blender4CNC.Polytoxogon(points)
+                if area < 0:
+                    polys.append([poly, [], -area])
+                else:
+                    tenons.append(poly)
+
+            # Each tenon belongs to the smallest poly around it
+            for tenon in tenons:
+                outside = [item for item in polys if item[0].IsPointInside(tenon.points[0])]
+                if len(outside) == 0:
+                    raise Blender4CNC.PolyException("ERROR - Cannot find the poly around a tenon.", tenon.points[0][0:2])
+                min(outside, key=lambda item: item[2])[1].append(tenon)
+
+            if len(polys) == 0:
+                return [[None, []]]
+            return self.polys[0].AddSimplifyReturn([item[0:2] for item in polys])
+
     #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     # A class for handling Polytoxogons - verifying them, and adding and subtracting
@@ -6015,6 +7131,23 @@ class Blender4CNC:
     #COVERAGE_CLASS Polytoxogon
     class Polytoxogon:
 
+        # Polytoxogons are created by the thousands when shrinking, expanding
+        # and joining shapes, so they are kept compact with __slots__
+        __slots__ = ("_points", "lines", "lineBoxes", "segmentArrays",
+                     "boundingRectangle", "boundingRectangleNonExact")
+
+        # Class level registry of methods to debug, e.g.
+        # Blender4CNC.Polytoxogon.debug["Polytoxogon.Shrink"] = True
+        debug = {}
+
+        # The points approximating each curve (see GetPointsForApproxCurveByError)
+        approxCurveCache = {}
+
+        # When True, Add (and Subtract) use an Arrangement of the two polys 
+        # instead of cutting the lines and following the segments (set while
+        # a pocket is calculated when CoreSettings.useArrangement is True)
+        useArrangement = False
+
         #********************************************************************
         # Returns True if point is a line
         #********************************************************************
@@ -6039,18 +7172,42 @@ class Blender4CNC:
                 mid = self.BreakUpCircle()
                 self.points = [self.points[1], mid]
             self.lines = self.GetListOfLinesFromPoints(self.points)
-            
-            self.ambiguous = None
-            self.polys = None
-            self.overlapPolys = None
-            
-            # Set all debugging to False
-            self.debug = {}
-            method_list = [func for func in dir(self) if callable(getattr(self, func))]
-            for fn in method_list:
-                if fn[0] != '_':
-                    methodName = self.__class__.__name__ + "." + fn
-                    self.debug[methodName] = False
+            self.lineBoxes = None
+            self.segmentArrays = None
+
+        #********************************************************************
+        # Microbenchmark - returns the average time (in seconds) taken to
+        # construct a Polytoxogon from the points
+        #********************************************************************
+        def TimeConstruction(points, count=10000):
+            startTime = time.perf_counter()
+            for i in range(0, count):
+                Blender4CNC.Polytoxogon(points)
+            return (time.perf_counter() - startTime) / count
+
+        #********************************************************************
+        # The points are a property so that the cached bounding rectangles
+        # are thrown away whenever the points are changed
+        #********************************************************************
+        @property
+        def points(self):
+            return self._points
+
+        @points.setter
+        def points(self, points):
+            self._points = points
+            self.boundingRectangle = None
+            self.boundingRectangleNonExact = None
+
+        #********************************************************************
+        # Returns the (enlarged) bounding boxes of all the lines - see 
+        # SegmentGrid.GetLineBoxes (they are only calculated again if the
+        # lines change)
+        #********************************************************************
+        def GetLineBoxes(self):
+            if (self.lineBoxes == None) or (self.lineBoxes[0] is not self.lines) or (self.lineBoxes[1] != len(self.lines)):
+                self.lineBoxes = (self.lines, len(self.lines), Blender4CNC.SegmentGrid.GetLineBoxes(self.lines))
+            return self.lineBoxes[2]
 
         #********************************************************************
         # Make it hashable so they can be in sets etc.
@@ -6109,15 +7266,15 @@ class Blender4CNC:
         # Used at the top of each function for debugging purposes
         #********************************************************************
         def DEBUG_METHOD_HEADER(self, tf=False):
-            if not tf:
+            if not tf and not self.debug:
                 return (0,0,0)
             methodName = self.__class__.__name__ + "." + inspect.stack()[1][3]
-            indent = None
+            tf = tf or self.debug.get(methodName, False)
+            if not tf:
+                return (0,0,0)
             indent = " " * len(inspect.stack()) * 2
-            self.debug[methodName] = tf
-            if self.debug[methodName]:
-                print(indent, methodName, "*" * 30)
-            return (methodName, indent, self.debug[methodName])
+            print(indent, methodName, "*" * 30)
+            return (methodName, indent, tf)
         
         #********************************************************************
         # Print a dictionary nicely
@@ -6299,11 +7456,15 @@ class Blender4CNC:
             # To save on iterating multiple times (potentially) over the whole list of lines in the poly
             # just get a short list of those lines that have an overlap
             lines = set([])
+            candidates = Blender4CNC.SegmentSweep(self.lines, self.GetLineBoxes()).GetCandidates()
+            arrays = self.GetSegmentArrays()
+            results = Blender4CNC.SegmentArrays.GetIntersectionsOfCandidates(arrays, arrays, candidates)
             for i,lineA in enumerate(self.lines):
                 if lineA not in lines:
-                    for j,lineB in enumerate(self.lines):
-                        if i == j:
+                    for (j, ints) in zip(candidates[i], results[i]):
+                        if ints != None:
                             continue
+                        lineB = self.lines[j]
                         ints = self.GetAllIntersections(lineA, lineB)
                         if ints == inf:
                             # We have two overlapping line segments
@@ -6318,14 +7479,19 @@ class Blender4CNC:
         #********************************************************************
         def GetDictionaryOfCutLinesForOverlaps(self, lines):
             overlaps = {}
+            grid = Blender4CNC.SegmentGrid(lines)
+            candidates = [grid.OverlappingIndex(i) for i in range(0, len(lines))]
+            arrays = self.GetSegmentArraysForLines(lines)
+            results = Blender4CNC.SegmentArrays.GetIntersectionsOfCandidates(arrays, arrays, candidates)
             # Get a list of overlaps for each line (a line may overlap multiple lines)
             # and sort the list of intersections along the line
             # and cut the line at those points (if necessary)
             for i,lineA in enumerate(lines):
                 overlaps[lineA] = []
-                for j,lineB in enumerate(lines):
-                    if i == j:
+                for (j, ints) in zip(candidates[i], results[i]):
+                    if (i == j) or (ints != None):
                         continue
+                    lineB = lines[j]
                     if self.GetAllIntersections(lineA, lineB) == inf:
                         overlaps[lineA] += self.GetOverlap(lineA, lineB)
                 overlaps[lineA] = self.OrderIntersections(lineA, overlaps[lineA])
@@ -7109,42 +8275,27 @@ class Blender4CNC:
                     poly = poly.ReverseLineDirections()
                 finalTenonsList.append(poly)
 
-            i = 0
-            while i < len(finalTenonsList):
-                poly = finalTenonsList[i]
-                    
-                # Find if this poly overlaps with any other poly
-                j = i + 1
-                newPoly = None
-                while j < len(finalTenonsList):
-                    polyJ = finalTenonsList[j]
-
-                    if not poly.BoundingRectanglesOverlap(polyJ):
-                        j += 1
-                        continue
-                    
-                    if not poly.Overlap(polyJ):
-                        j += 1
-                        continue
-                    
-                    # They overlap, so join them
-                    # Because tenons are in CCW order, the join function will not return a main poly
-                    polyTenonList = poly.Add(polyJ)
-                    newPoly = polyTenonList[0][0]
-                    # Replace the poly with the new joined poly
-                    finalTenonsList[i] = newPoly
-                    finalTenonsList.pop(j)
-                    poly = newPoly
-                    # End j loop
-                i += 1
-            # End i loop
-            return finalTenonsList
+            # Join the polys that overlap
+            union = Blender4CNC.CascadedUnion(Blender4CNC.Polytoxogon.Overlap, Blender4CNC.Polytoxogon.AddOutline)
+            return union.JoinPolys(finalTenonsList)
+
+        #********************************************************************
+        # Add two clockwise polys that overlap and return just the outline
+        #********************************************************************
+        def AddOutline(self, poly2):
+            return self.Add(poly2)[0][0]
 
         #********************************************************************
         # 
         #********************************************************************
         def RemoveOverlapPolysFromTenons(self, tenons, overlapPolys):
             finalTenons = []
+            if Blender4CNC.Polytoxogon.useArrangement and (len(overlapPolys) > 0):
+                # Subtract all the overlap polys from each tenon in one go
+                for tenon in tenons:
+                    result = tenon.SubtractMultiple(overlapPolys)
+                    finalTenons += [x[0] for x in result if x[0] != None]
+                return finalTenons
             while len(tenons) > 0:
                 tenon = tenons.pop(0)
                 result = [tenon]
@@ -7273,40 +8424,51 @@ class Blender4CNC:
             # It is possible that some of the "normal" polys are touching
             # Valid polys are clockwise, so ignore counterclockwise polys
             # ONLY PASS CLOCKWISE POLYS INTO THIS FUNCTION!
-            changed = True
-            while changed:
-                changed = False
-                for i in range(0,len(listOfNormalPolys)):
-#                    if not listOfNormalPolys[i].PolyIsClockwise():
-#                        continue
-                    setA = set([p[0:2] for p in listOfNormalPolys[i].points])
-                    # Find if this poly touches another poly
-                    for j in range(i+1,len(listOfNormalPolys)):
-#                        if not listOfNormalPolys[j].PolyIsClockwise():
-#                            continue
-                        setB = set([p[0:2] for p in listOfNormalPolys[j].points])
-                        ints = setA.intersection(setB)
-                        if len(ints) > 0:
-                            # These two polys are to be connected
-                            polyA = listOfNormalPolys[i]
-                            polyB = listOfNormalPolys[j]
-                            common = list(ints)[0]
-                            pointsA2D = [p[0:2] for p in polyA.points]
-                            pointsB2D = [p[0:2] for p in polyB.points]
-                            ndxA = pointsA2D.index(common)
-                            ndxB = pointsB2D.index(common)
-                            points = polyA.points[:ndxA+1] + polyB.points[ndxB+1:] + polyB.points[:ndxB+1] + polyA.points[ndxA+1:]
-                            listOfNormalPolys.pop(j)
-                            listOfNormalPolys.pop(i)
-                            listOfNormalPolys.append(Blender4CNC.Polytoxogon(points))
-                            changed = True
-                            break
-                    if changed:
-                        break
+            union = Blender4CNC.CascadedUnion(self.PolysShareAPoint, self.JoinPolysAtCommonPoint)
+            listOfNormalPolys = union.JoinPolys(listOfNormalPolys)
                             
             listOfPolys = listOfOverlapPolys + listOfNormalPolys
             return listOfPolys
+
+        #********************************************************************
+        # Returns True if the two polys have a point in common
+        #********************************************************************
+        def PolysShareAPoint(self, polyA, polyB):
+            setA = set([p[0:2] for p in polyA.points])
+            return not setA.isdisjoint([p[0:2] for p in polyB.points])
+
+        #********************************************************************
+        # Join two polys that touch at a common point
+        #
+        # b--c        e--f      b--c  e--f
+        # |  |   AND  |  |  =>  |  |  |  |
+        # a--d        d--g      a--d--g
+        #********************************************************************
+        def JoinPolysAtCommonPoint(self, polyA, polyB):
+            setA = set([p[0:2] for p in polyA.points])
+            setB = set([p[0:2] for p in polyB.points])
+            common = list(setA.intersection(setB))[0]
+            pointsA2D = [p[0:2] for p in polyA.points]
+            pointsB2D = [p[0:2] for p in polyB.points]
+            ndxA = pointsA2D.index(common)
+            ndxB = pointsB2D.index(common)
+            points = polyA.points[:ndxA+1] + polyB.points[ndxB+1:] + polyB.points[:ndxB+1] + polyA.points[ndxA+1:]
+            return Blender4CNC.Polytoxogon(points)
         def Shrink(self, dist, infiniteLoopCount = -1):
+            return self.ShrinkMultiple([dist], infiniteLoopCount)[0]
+
+        #********************************************************************
+        # Returns a list with the result of shrinking this poly by each of the
+        # distances (each result is the list of polys that Shrink returns).
+        # Cleaning and splitting the poly (on infinite overlaps) is only done
+        # once and shared by all the distances. The offset itself (and finding
+        # and removing the overlaps it makes) is still done for each distance,
+        # so this costs about the same as calling Shrink for each distance.
+        # Each result starts closest to the start of the previous result so
+        # that concentric passes (e.g. cutter radius, then finish, then trim)
+        # line up as if the shrinks had been chained.
+        #********************************************************************
+        def ShrinkMultiple(self, distances, infiniteLoopCount = -1):
             
             s = ""
             pt = self.points[0] # All points might get removed and then an exception occurs
@@ -7317,7 +8479,7 @@ class Blender4CNC:
             self.CleanUpPoly_UI()
                 
             if not self.ImPolyIsClockwise():
-                str2 = "ERROR - Cannot shrink counter-clockwise poly by " + str(dist) + "."
+                str2 = "ERROR - Cannot shrink counter-clockwise poly by " + str(distances[0]) + "."
                 raise Blender4CNC.PolyException(str2, self.points[0])
 
             try:
@@ -7334,18 +8496,32 @@ class Blender4CNC:
                     normalPolys.append(True)
                 # Check if ALL polys have no area - the poly would get shrunk to nothing
                 if True not in normalPolys:
-                    str2 = "ERROR - Cannot shrink poly by " + str(dist) + ". Poly too thin?\n"
+                    str2 = "ERROR - Cannot shrink poly by " + str(distances[0]) + ". Poly too thin?\n"
                     raise Blender4CNC.PolyException(str2, self.points[0])
-                
-                # Identify all the overlapped polys vs "normal" polys
-                normalPolys = []
-                for poly in polys:
-                    if len(poly.lines) == 2:
-                        # Could be an overlap pair
-                        if self.GetAllIntersections(poly.lines[0], poly.lines[1]) == inf:
-                            normalPolys.append(False)
-                            continue
-                    normalPolys.append(True)
+            except Blender4CNC.PolyException as err:
+                s = err.args[0]
+
+            if len(s) > 0:
+                str2 = "ERROR - Cannot shrink poly by " + str(distances[0]) + ". Poly too thin?\n" + s
+                raise Blender4CNC.PolyException(str2, (self.points[0][0],self.points[0][1]))
+
+            results = []
+            startPoint = None
+            for dist in distances:
+                newPolys = self.ShrinkSplitPolys(polys, normalPolys, dist, pt, startPoint)
+                results.append(newPolys)
+                if len(newPolys) > 0:
+                    pt = newPolys[0].points[0]
+                    startPoint = pt
+            return results
+
+        #********************************************************************
+        # Shrink the polys that this poly was split into by dist
+        # (startPoint = None means order them from the start of this poly)
+        #********************************************************************
+        def ShrinkSplitPolys(self, polys, normalPolys, dist, pt, startPoint):
+            s = ""
+            try:
                 # We shrink all the polys separately
                 newPolys = [poly.ShrinkExpandAndSplit(dist, -1) for poly in polys]
                 # If nothing left...
@@ -7372,51 +8548,31 @@ class Blender4CNC:
                 # When shrinking - It may represent multiple polys and invalid loops
                 #                  (valid polys are clockwise)
                 #                   [ [poly1], [poly2,poly3], [poly4] ... ]
-                newPolys2 = []
-                for l in newPolys:
-                    validPolys = [poly for poly in l if poly.ImPolyIsClockwise()]
-                    newPolys2.append(l)
-                newPolys = newPolys2
 
                 # Get the shrunken normal polys
-                polys = []
+                shrunkPolys = []
                 overlapPolys = []
                 for i,tf in enumerate(normalPolys):
                     if tf:
-                         polys.append(newPolys[i])
+                         shrunkPolys.append(newPolys[i])
                     else:
                         overlapPolys.append(newPolys[i])
                 # All the "non-normal" polys need to be subtracted from any "normal" polys
 
                 # Arrange polys into a simple list of polys (not a list of lists)
-                polys = [item for l in polys for item in l]
+                shrunkPolys = [item for l in shrunkPolys for item in l]
                 overlapPolys = [item for l in overlapPolys for item in l]
                 for i,poly in enumerate(overlapPolys):
                     if not poly.ImPolyIsClockwise():
                         poly = poly.ReverseLineDirections()
                         overlapPolys[i] = poly
-#                    if len(polys) > 0:
-#                        print(polys[0].PolyIsClockwise())
-#                    if len(overlapPolys) > 0:
-#                        print(overlapPolys[0].PolyIsClockwise())
-                ret = self.RemoveOverlapPolysFromTenons(polys, overlapPolys)
-                newPolys = ret
-#                if len(ret) != 1:
-#                    str2 = "ERROR - Cannot shrink/expand poly by " + str(dist) + ".\nDetected split areas.\nCutter too large?"
-#                    raise Blender4CNC.PolyException(str2, (0,0))
-#                else:
-#                    poly = ret[0]
+                newPolys = self.RemoveOverlapPolysFromTenons(shrunkPolys, overlapPolys)
             except Blender4CNC.PolyException as err:
                 s = err.args[0]
 
             if len(s) > 0:
                 str2 = "ERROR - Cannot shrink poly by " + str(dist) + ". Poly too thin?\n" + s
                 raise Blender4CNC.PolyException(str2, (self.points[0][0],self.points[0][1]))
-                # Do not think the following code is necessary anymore
-                #if len(self.points) > 0:
-                #    raise Blender4CNC.PolyException(str2, (self.points[0][0],self.points[0][1]))
-                #else:
-                #    raise Blender4CNC.PolyException(str2, (pt[0], pt[1]))
 
             # Clean up all the polys
             for poly in newPolys:
@@ -7426,7 +8582,9 @@ class Blender4CNC:
             for poly in newPolys:
                 poly.MakePolyStartClosestToPoint(pt)
             # Order the polys as closest to the original start point
-            a = self.points[0]
+            a = startPoint
+            if a == None:
+                a = self.points[0]
             distances = []
             for poly in newPolys:
                 b = poly.points[0]
@@ -7510,12 +8668,24 @@ class Blender4CNC:
         # Returns a Polytoxogon that has been expanded by dist.
         #********************************************************************
         def Expand(self, p2g, dist, infiniteLoopCount=1000):
+            return self.ExpandMultiple(p2g, [dist], infiniteLoopCount)[0]
+
+        #********************************************************************
+        # Returns a list with the result of expanding this poly by each of the
+        # distances (each result is the [poly, tenons] that Expand returns).
+        # Cleaning, splitting (on infinite overlaps) and reversing the poly is
+        # only done once and shared by all the distances (the offset itself is
+        # still done for each distance, as in ShrinkMultiple).
+        # Each result starts closest to the start of the previous result (see
+        # ShrinkMultiple)
+        #********************************************************************
+        def ExpandMultiple(self, p2g, distances, infiniteLoopCount=1000):
 
             # Clean the Poly 
             self.CleanUpPoly_UI()
 
             if not self.ImPolyIsClockwise():
-                str2 = "ERROR - Cannot expand counter-clockwise poly by " + str(dist) + "."
+                str2 = "ERROR - Cannot expand counter-clockwise poly by " + str(distances[0]) + "."
                 raise Blender4CNC.PolyException(str2, self.points[0])
 
 #            # Any curve that is larger than 180 degrees must be split in half
@@ -7526,12 +8696,36 @@ class Blender4CNC:
 
             # In case of overlapping lines, we must split the poly
             polys = self.SplitPolyOnInfiniteOverlaps()
+            # Make them CCW so we get an expand
+            reversedPolys = [poly.ReverseLineDirections() for poly in polys]
+
+            # Identify all the overlapped polys vs "normal" polys
+            normalPolys = []
+            for poly in polys:
+                if len(poly.lines) == 2:
+                    # Could be an overlap pair
+                    if self.GetAllIntersections(poly.lines[0], poly.lines[1]) == inf:
+                        normalPolys.append(False)
+                        continue
+                normalPolys.append(True)
+
+            results = []
+            startPoint = None
+            for dist in distances:
+                result = self.ExpandSplitPolys(reversedPolys, normalPolys, dist, startPoint, infiniteLoopCount)
+                results.append(result)
+                startPoint = result[0].points[0]
+            return results
+
+        #********************************************************************
+        # Expand the (reversed) polys that this poly was split into by dist
+        # (startPoint = None means start closest to the start of this poly)
+        #********************************************************************
+        def ExpandSplitPolys(self, polys, normalPolys, dist, startPoint, infiniteLoopCount):
 
             # We expand all the polys separately
             newPolys = []
             for poly in polys:
-                # Make it CCW so we get an expand
-                poly = poly.ReverseLineDirections()
                 polyTenons = poly.ShrinkExpandAndSplit(dist, -1)
                     
                 # ShrinkExpand may return multiple polys, when expanding, the "main" poly will be the
@@ -7557,15 +8751,6 @@ class Blender4CNC:
                 newPolyTenons = [mainPoly, validTenons]
                 newPolys.append(newPolyTenons)
 
-            # Identify all the overlapped polys vs "normal" polys
-            normalPolys = []
-            for poly in polys:
-                if len(poly.lines) == 2:
-                    # Could be an overlap pair
-                    if self.GetAllIntersections(poly.lines[0], poly.lines[1]) == inf:
-                        normalPolys.append(False)
-                        continue
-                normalPolys.append(True)
             # All the "normal" polys and "non-normal" polys need to be added together while the 
             # "non-normal" polys need to be subtracted from any tenons
             # Tenons may be produced when adding the polys together!
@@ -7624,7 +8809,9 @@ class Blender4CNC:
             # We want to find the point that is closest to the original starting point
             # Re-arrange that poly so that that particular point
             # is the starting point of the poly
-            finalPoly.MakePolyStartClosestToPoint(self.points[0])
+            if startPoint == None:
+                startPoint = self.points[0]
+            finalPoly.MakePolyStartClosestToPoint(startPoint)
             
             return [finalPoly, finalTenons]
 
@@ -7692,18 +8879,64 @@ class Blender4CNC:
             points.append((seg[1][0], seg[1][1])) #Just 2d coords
             return points
 
+        #********************************************************************
+        # Given a curved segment will return a set of points that represent
+        # straight line segments that are no further than maxError from the 
+        # curve (the sagitta of each line) - small curves get few points and
+        # large curves get enough points to stay accurate.
+        # The points for each curve are cached.
+        #********************************************************************
+        def GetPointsForApproxCurveByError(self, seg, maxError):
+            cache = Blender4CNC.Polytoxogon.approxCurveCache
+            key = (seg[0][0:2], seg[1], maxError)
+            points = cache.get(key)
+            if points == None:
+                points = tuple(self.IntGetPointsForApproxCurveByError(seg, maxError))
+                if len(cache) >= Blender4CNC.APPROX_CURVE_CACHE_SIZE:
+                    cache.clear()
+                cache[key] = points
+            return list(points)
+
+        def IntGetPointsForApproxCurveByError(self, seg, maxError):
+            startAngle = self.GetCurveAngleAtPoint(seg, seg[0])
+
+            (cX, cY) = seg[1][2:4]
+            startV = (seg[0][0] - cX, seg[0][1] - cY) # seg[0] - center
+            endV = (seg[1][0] - cX, seg[1][1] - cY) # seg[1] - center
+            CW = self.GetCurveClockwiseness(seg)
+
+            diff = self.GetClockwiseAngleBetweenVectors(startV, endV)
+            if not (CW == 1): # not CW
+                diff = 2 * pi - diff
+
+            # Sagitta = radius * (1 - cos(step/2)) must be <= maxError
+            radius = self.GetArcRadius(seg)
+            if radius > maxError:
+                stepRadians = 2 * acos(1 - maxError / radius)
+                numSteps = max(1, ceil(diff / stepRadians))
+            else:
+                numSteps = 1
+
+            points = [(seg[0][0], seg[0][1])] # The start point Just 2d coords
+            for count in range(1, numSteps):
+                nextAngle = startAngle - CW * diff * count / numSteps
+                points.append((cX + cos(nextAngle) * radius, cY + sin(nextAngle) * radius))
+            points.append((seg[1][0], seg[1][1])) #Just 2d coords
+            return points
+
         #********************************************************************
         # Returns a Polytoxogon that has all curves approximated with 
-        # straight lines every 10 degrees
+        # straight lines that are no further than maxError from the curves
+        # (in the units of the poly, see CoreSettings.approxCurveMaxError)
         #********************************************************************
-        def ApproximateCurves(self):
+        def ApproximateCurves(self, maxError):
             
             pts = []
             for seg in self.lines:
                 if len(seg[1]) == 2: # Segment is straight
                     pts.append((seg[0][0], seg[0][1]))
                 else:
-                    points = self.GetPointsForApproxCurve(seg, 10, False)
+                    points = self.GetPointsForApproxCurveByError(seg, maxError)
                     pts += points[:-1]
             
             return Blender4CNC.Polytoxogon(pts)
@@ -7731,16 +8964,21 @@ class Blender4CNC:
         # Get all intersections between all lines
         # Create a dictionary (keyed on line number) where each entry
         # contains a list of intersections with other lines
+        # (only pairs of lines found by the sweep line are tested)
         #********************************************************************
         def GetIntersectionsBetweenAllLines(self, newLines):
             linesAndInts = {}
+            boxes = None
+            if newLines is self.lines:
+                boxes = self.GetLineBoxes()
+            candidates = Blender4CNC.SegmentSweep(newLines, boxes).GetCandidates()
+            arrays = self.GetSegmentArraysForLines(newLines)
+            results = Blender4CNC.SegmentArrays.GetIntersectionsOfCandidates(arrays, arrays, candidates)
             for i,newLineI in enumerate(newLines):
                 allInts = []
-                for j,newLineJ in enumerate(newLines):
-                    # Don't test a line against itself!
-                    if i == j:
-                        continue
-                    ints = self.GetAllIntersections(newLineI, newLineJ)
+                for (j, ints) in zip(candidates[i], results[i]):
+                    if ints == None:
+                        ints = self.GetAllIntersections(newLineI, newLines[j])
                     if ints == inf:
                         # We have two overlapping line segments
                         # Find the start and end of the overlap
@@ -8671,74 +9909,54 @@ class Blender4CNC:
         #********************************************************************
         # return poly - poly2 (subtract poly2 from poly)
         #********************************************************************
-        def IsSegmentFullyOutsidePoly(self, seg):                        
+        #********************************************************************
+        # Segments have been cut by this poly so they are either inside, 
+        # outside or along the boundary. Returns the point on the segment
+        # that decides if it is inside or outside (or None if the segment is
+        # along the boundary).
+        #********************************************************************
+        def GetSegmentTestPoint(self, seg):
             (p1, p2) = seg
-            startsOnBoundary = self.IsPointOnBoundary(p1)
-            endsOnBoundary = self.IsPointOnBoundary(p2)
-            if startsOnBoundary:
-                if endsOnBoundary:
-#                    midPt = self.GetMidOfSegment((seg[0], seg[1]))
+            if self.IsPointOnBoundary(p1):
+                if self.IsPointOnBoundary(p2):
                     midPt = self.GetMidOfSegment(seg)
-                    midOnBoundary = self.IsPointOnBoundary(midPt)
-                    return (not midOnBoundary and not self.IsPointInside(midPt))
+                    if self.IsPointOnBoundary(midPt):
+                        return None
+                    return midPt
+                return p2
+            return p1
+
+        #********************************************************************
+        # Returns a list of True/False for each segment (see GetSegmentTestPoint)
+        # inside = True means return True for segments fully inside the poly
+        # inside = False means return True for segments fully outside the poly
+        # All the test points are checked in one go
+        #********************************************************************
+        def AreSegmentsFullyInsideOrOutside(self, segs, inside):
+            testPoints = [self.GetSegmentTestPoint(seg) for seg in segs]
+            pointsInside = iter(self.ArePointsInside([pt for pt in testPoints if pt != None]).tolist())
+            results = []
+            for pt in testPoints:
+                if pt == None:
+                    results.append(False)
                 else:
-                    endsInside = self.IsPointInside(p2)
-                    return not endsInside
-            startsInside = self.IsPointInside(p1)
-            
-            if endsOnBoundary:
-                return not startsInside
-            elif not startsInside:
-                return True
-            # This can never happen
-            #elif endsInside:
-            #    return True
-            else:
-                return False
-
-        def IsSegmentFullyInsidePoly(self, seg):                        
+                    results.append(next(pointsInside) == inside)
+            return results
 
-            (p1, p2) = seg
-            startsOnBoundary = self.IsPointOnBoundary(p1)
-            endsOnBoundary = self.IsPointOnBoundary(p2)
+        def IsSegmentFullyOutsidePoly(self, seg):                        
+            return self.AreSegmentsFullyInsideOrOutside([seg], False)[0]
 
-            if startsOnBoundary:
-                if endsOnBoundary:
-#                    midPt = self.GetMidOfSegment((seg[0], seg[1]))
-                    midPt = self.GetMidOfSegment(seg)
-                    midOnBoundary = self.IsPointOnBoundary(midPt)
-                    return (not midOnBoundary and self.IsPointInside(midPt))
-                else:
-                    endsInside = self.IsPointInside(p2)
-                    return endsInside
+        def IsSegmentFullyInsidePoly(self, seg):                        
+            return self.AreSegmentsFullyInsideOrOutside([seg], True)[0]
 
-            startsInside = self.IsPointInside(p1)
-                
-            if endsOnBoundary:
-                return startsInside
-            elif startsInside:
-                return True
-            # This can never happen
-            #elif endsInside:
-            #    return True
-            else:
-                return False
         def RemoveSegmentsOnOutside(self, lines2):
             # Remove any lines on poly2 that are outside poly1
-            num = 0
-            while num < len(lines2):
-                if self.IsSegmentFullyOutsidePoly(lines2[num]):
-                    lines2.pop(num)
-                else:
-                    num += 1
+            outside = self.AreSegmentsFullyInsideOrOutside(lines2, False)
+            lines2[:] = [line for (line, out) in zip(lines2, outside) if not out]
                     
         def RemoveSegmentsOnInside(self, lines1):
-            num = 0
-            while num < len(lines1):
-                if self.IsSegmentFullyInsidePoly(lines1[num]):
-                    lines1.pop(num)
-                else:
-                    num += 1
+            inside = self.AreSegmentsFullyInsideOrOutside(lines1, True)
+            lines1[:] = [line for (line, ins) in zip(lines1, inside) if not ins]
         def RemoveSegmentsOnBoundary(self, lines1):
             num = 0
             while num < len(lines1):
@@ -8789,6 +10007,20 @@ class Blender4CNC:
         def Subtract(self, poly2, infiniteLoopCounter = -1):
             poly3 = poly2.ReverseLineDirections()
             return self.Add(poly3)
+
+        #********************************************************************
+        # Boolean operations of this poly and a list of polys in one go (see
+        # Arrangement) - each returns a list of [poly, tenons] like Add
+        # AddMultiple       - the area inside any of the polys
+        # SubtractMultiple  - the area inside this poly but not inside any of
+        #                     the polys
+        # (The polys can go either way around)
+        #********************************************************************
+        def AddMultiple(self, polys):
+            return Blender4CNC.Arrangement([self] + polys).GetResult(lambda label: label != 0)
+
+        def SubtractMultiple(self, polys):
+            return Blender4CNC.Arrangement([self] + polys).GetResult(lambda label: label == 1)
                 
         
         def FollowPathOfSegments(self, allLines, LR):
@@ -8907,7 +10139,34 @@ class Blender4CNC:
             return newP2
 
         #********************************************************************
-        # 
+        # Finds if poly2 is inside this poly (or this poly is inside poly2) 
+        # without cutting any lines when the polys do not touch or cross - the
+        # usual case for the tenons in a pocket
+        # Returns None if the polys touch or cross, else 
+        # (poly2IsInside, poly1IsInside)
+        #********************************************************************
+        def GetInsideWithoutCutting(self, poly2):
+            if (len(self.lines) == 0) or (len(poly2.lines) == 0):
+                return None
+            # If the bounding rectangles are apart, the polys are too
+            # (allowing for tolerances as in SegmentGrid.LineBoxesTouch)
+            (aMinX, aMinY, aMaxX, aMaxY) = self.GetBoundingRectangle()
+            (bMinX, bMinY, bMaxX, bMaxY) = poly2.GetBoundingRectangle()
+            m = max(-aMinX, -aMinY, aMaxX, aMaxY, -bMinX, -bMinY, bMaxX, bMaxY)
+            eps = 2 * (Blender4CNC.REL_TOLERANCE + 1e-4 * abs(m))
+            if (aMinX > bMaxX + eps) or (bMinX > aMaxX + eps) or (aMinY > bMaxY + eps) or (bMinY > aMaxY + eps):
+                return (False, False)
+            if self.Overlap(poly2):
+                return None
+            # Nothing touches so one point decides if a poly is inside the other
+            # (IsPointInside checks the bounding rectangle first)
+            poly2IsInside = self.IsPointInside(poly2.points[0])
+            poly1IsInside = (not poly2IsInside) and poly2.IsPointInside(self.points[0])
+            return (poly2IsInside, poly1IsInside)
+
+        #********************************************************************
+        # Returns (poly2IsSame, poly2IsInside, poly2Touches, poly2IsOutside)
+        # ls1, ls2 are the lines of the polys already cut by each other
         #********************************************************************
         def SameInsideOutside(self, poly2, ls1 = None, ls2 = None):
             # Create list of lines
@@ -8915,6 +10174,12 @@ class Blender4CNC:
             xlines2 = poly2.lines
             
             if ls1 == None:
+                # If the polys do not touch or cross, there is no need to cut
+                # and classify every line
+                inside = self.GetInsideWithoutCutting(poly2)
+                if inside != None:
+                    poly2IsInside = inside[0]
+                    return (False, poly2IsInside, False, not poly2IsInside)
                 # Cut all the poly lines at intersections
                 lines1 = self.CutAllLines(xlines1, xlines2)
                 lines2 = self.CutAllLines(xlines2, xlines1)
@@ -9036,16 +10301,28 @@ class Blender4CNC:
             if DEBUG_RARE_FAILURE:
                 print(indent, "1st Poly is CW")
 
-            # Create list of lines
-            xlines1 = self.lines #.copy()
-            xlines2 = poly2.lines#.copy()
-            
-            # Cut all the poly lines at intersections
-            lines1 = self.CutAllLines(xlines1, xlines2)
-            lines2 = self.CutAllLines(xlines2, xlines1)
+            if Blender4CNC.Polytoxogon.useArrangement:
+                if poly2IsCW:
+                    return self.AddMultiple([poly2])
+                return self.SubtractMultiple([poly2])
+
+            # If the polys do not touch or cross, one of the early returns below
+            # is always taken so the lines do not need to be cut
+            inside = self.GetInsideWithoutCutting(poly2)
+            if inside != None:
+                (poly2IsInside, poly1IsInside) = inside
+                (poly2IsSame, poly2Touches, poly2IsOutside) = (False, False, not poly2IsInside)
+            else:
+                # Create list of lines
+                xlines1 = self.lines #.copy()
+                xlines2 = poly2.lines#.copy()
+                
+                # Cut all the poly lines at intersections
+                lines1 = self.CutAllLines(xlines1, xlines2)
+                lines2 = self.CutAllLines(xlines2, xlines1)
 
-            (poly2IsSame, poly2IsInside, poly2Touches, poly2IsOutside) = self.SameInsideOutside(poly2, lines1, lines2)
-            (poly1IsSame, poly1IsInside, poly1Touches, poly1IsOutside) = poly2.SameInsideOutside(self, lines2, lines1)
+                (poly2IsSame, poly2IsInside, poly2Touches, poly2IsOutside) = self.SameInsideOutside(poly2, lines1, lines2)
+                (poly1IsSame, poly1IsInside, poly1Touches, poly1IsOutside) = poly2.SameInsideOutside(self, lines2, lines1)
 
             if poly2IsCW:
                 if DEBUG_RARE_FAILURE:
@@ -9298,10 +10575,14 @@ class Blender4CNC:
         def Overlap(self, tenon2):
             # We have to loop through each segment of tenon1 and see if it crosses
             # or touches any segment of tenon2
-
+            # (only lines with overlapping bounding boxes are tested)
+            grid = Blender4CNC.SegmentGrid(tenon2.lines, tenon2.GetLineBoxes())
+            candidates = [grid.OverlappingLine(line) for line in self.lines]
+            results = Blender4CNC.SegmentArrays.GetIntersectionsOfCandidates(self.GetSegmentArrays(), tenon2.GetSegmentArrays(), candidates)
             for i in range(0, len(self.lines)):
-                for j in range(0, len(tenon2.lines)):
-                    ints = self.GetAllIntersections(self.lines[i], tenon2.lines[j])
+                for (j, ints) in zip(candidates[i], results[i]):
+                    if ints == None:
+                        ints = self.GetAllIntersections(self.lines[i], tenon2.lines[j])
                     if (ints == inf) or (len(ints) > 0):
                         return True
             return False
@@ -9375,54 +10656,83 @@ class Blender4CNC:
 
         #********************************************************************
         # Check if a point is inside the poly
-        #********************************************************************
-        def IsPointInside(self, ptIn, minMaxStep=1, infLoopCount=100):
-            pt = ptIn[0:2]
-            
-            # Get the bounds of a rectangle that contains this poly
-            (minX, minY, maxX, maxY) = self.GetBoundingRectangle()
-            
-            # Check if we are outside the bounding rectangle first
-            if (pt[0] < minX) or (pt[0] > maxX) or (pt[1] < minY) or (pt[1] > maxY):
-                return False
+        # (Points on the boundary should be checked with IsPointOnBoundary 
+        # first)
+        #********************************************************************
+        def IsPointInside(self, ptIn):
+            return bool(self.ArePointsInside([ptIn])[0])
+
+        #********************************************************************
+        # Returns a numpy array of bools, True for each point that is inside
+        # the poly
+        # Uses the winding number of the boundary around each point (the sum 
+        # of the angles that each segment turns through as seen from the point).
+        # A curve turns through the same angle as its chord unless the point is
+        # between the chord and the curve, in which case it is one more turn. 
+        # For a point on the chord (e.g. the center of a half circle) the 
+        # chord's angle could be +/-pi, the curve turns through half a turn.
+        # The winding number is odd for a point inside (the same as an odd 
+        # number of crossings of a ray).
+        #********************************************************************
+        def ArePointsInside(self, points):
+            pts = numpy.array([p[0:2] for p in points], dtype=float).reshape(-1, 2)
+            inside = numpy.zeros(len(pts), dtype=bool)
+            if (len(pts) == 0) or (len(self.lines) == 0):
+                return inside
 
-            dimX = maxX-minX
-            stepX = dimX * 0.1
-            dimY = maxY-minY
-            stepY = dimY * 0.1
-
-            loopCounter = 0
-            while True:
-                loopCounter += 1
-                if loopCounter > infLoopCount:
-                    raise Blender4CNC.PolyException("Infinite loop in IsPointInside", pt)
-                origin = (random.uniform(minX-stepX, maxX+stepX), minY-stepY)
-                ray = (origin, pt)
-                ints = self.IsPointInside_Intersections(ray)
-                if type(ints) == list:
-                    break
-            # ints should contain a set of intersections between the ray and the lines of the poly
-            # It could be empty, does it contain an odd number of points?
-            odd = len(ints) % 2
-            return odd == 1
-        #********************************************************************
-        # Get all the intersections between a line "ray" and the lines of the
-        # poly. If we perfectly overlap a line (inf) or hit end points then
-        # we return -1 to signal that this is a problematic ray.
-        #********************************************************************
-        def IsPointInside_Intersections(self, ray):
-            FEQ = Blender4CNC.FloatsAreEqual
-            totalInts = []
-            for line in self.lines:
-                ints = self.GetAllIntersections(ray, line)
-                if ints == inf:
-                    return -1
-                for (a,b) in ints:
-                    for p in line:
-                        if FEQ(a, p[0]) and FEQ(b, p[1]):
-                            return -1
-                totalInts += ints
-            return totalInts
+            # Check if we are outside the bounding rectangle first
+            (minX, minY, maxX, maxY) = self.GetBoundingRectangle()
+            inRect = (pts[:,0] >= minX) & (pts[:,0] <= maxX) & (pts[:,1] >= minY) & (pts[:,1] <= maxY)
+            if not inRect.any():
+                return inside
+            px = pts[inRect,0][:,None]
+            py = pts[inRect,1][:,None]
+
+            # Each row is a point, each column is a segment
+            arrays = self.GetSegmentArrays()
+            (starts, ends, centers, turns) = (arrays.starts, arrays.ends, arrays.centers, arrays.turns)
+            ax = starts[:,0] - px
+            ay = starts[:,1] - py
+            bx = ends[:,0] - px
+            by = ends[:,1] - py
+            cross = ax * by - ay * bx
+            dot = ax * bx + ay * by
+            angles = numpy.arctan2(cross, dot)
+
+            curved = (turns != 0)
+            if curved.any():
+                onChord = curved & (numpy.abs(cross) <= Blender4CNC.ABS_TOLERANCE * (ax * ax + ay * ay + bx * bx + by * by)) & (dot < 0)
+                angles = numpy.where(onChord, math.pi * turns, angles)
+                cx = px - centers[:,0]
+                cy = py - centers[:,1]
+                rSqr = (starts[:,0] - centers[:,0])**2 + (starts[:,1] - centers[:,1])**2
+                inCircle = (cx * cx + cy * cy) < rSqr
+                # CCW curves lie to the right of their chord, CW curves to the left
+                side = (ends[:,0] - starts[:,0]) * (-ay) - (ends[:,1] - starts[:,1]) * (-ax)
+                between = curved & inCircle & ~onChord & ((side * turns) < 0)
+                angles += numpy.where(between, 2 * math.pi * turns, 0)
+
+            winding = numpy.rint(angles.sum(axis=1) / (2 * math.pi)).astype(int)
+            inside[inRect] = (winding % 2) == 1
+            return inside
+
+        #********************************************************************
+        # Returns the lines as a SegmentArrays
+        # They are only calculated again if the lines change
+        #********************************************************************
+        def GetSegmentArrays(self):
+            if (self.segmentArrays == None) or (self.segmentArrays[0] is not self.lines) or (self.segmentArrays[1] != len(self.lines)):
+                self.segmentArrays = (self.lines, len(self.lines), Blender4CNC.SegmentArrays(self.lines))
+            return self.segmentArrays[2]
+
+        #********************************************************************
+        # Returns the lines as a SegmentArrays (cached if they are this 
+        # poly's lines)
+        #********************************************************************
+        def GetSegmentArraysForLines(self, lines):
+            if lines is self.lines:
+                return self.GetSegmentArrays()
+            return Blender4CNC.SegmentArrays(lines)
         #********************************************************************
         # Check if a point lands exactly on one of the segments of the poly
         # boundary
@@ -9637,18 +10947,23 @@ class Blender4CNC:
         #********************************************************************
         # All the lines in lines1 get cut by any intersections with lines
         # in the lines2 list - returns the new list of lines
+        # (only lines with overlapping bounding boxes are tested)
         #********************************************************************
         def CutAllLines(self, lines1, lines2):
             outLines = []
+            grid = Blender4CNC.SegmentGrid(lines2)
+            candidates = [grid.OverlappingLine(line) for line in lines1]
+            results = Blender4CNC.SegmentArrays.GetIntersectionsOfCandidates(self.GetSegmentArraysForLines(lines1), Blender4CNC.SegmentArrays(lines2), candidates)
             
             # Cut all lines in poly1
             for i in range(0, len(lines1)):
                 # Get all intersections of this line with any and all lines in other poly
                 totalInts = []
                 totalInfInts = []
-                for j in range(0, len(lines2)):
-#                    ints = self.GetAllIntersections((lines1[i][0], lines1[i][1]), (lines2[j][0], lines2[j][1]))
-                    ints = self.GetAllIntersections(lines1[i], lines2[j])
+                for (j, ints) in zip(candidates[i], results[i]):
+                    if ints == None:
+#                        ints = self.GetAllIntersections((lines1[i][0], lines1[i][1]), (lines2[j][0], lines2[j][1]))
+                        ints = self.GetAllIntersections(lines1[i], lines2[j])
                     
                     if ints == inf:
                         # Are any of the start/end points of one line inside the other?
@@ -9908,6 +11223,14 @@ class Blender4CNC:
         def ExpandPolys(self,l,d):
             return [p.Expand(self, d) for p in l]
 
+        #********************************************************************
+        # Take a list of polys and expand them all by each distance, returns
+        # a list (for each distance) of new lists (see ExpandMultiple)
+        #********************************************************************
+        def ExpandPolysMultiple(self,l,distances):
+            results = [p.ExpandMultiple(self, distances) for p in l]
+            return [[result[k] for result in results] for k in range(0, len(distances))]
+
         #********************************************************************
         # Check that any curves have equidistant source/destination points
         # from center
@@ -10182,6 +11505,9 @@ class Blender4CNC:
             # These lines should be ignored
             (A0, A1) = A
             (B0, B1) = B
+            # Quick test - the segments are too far apart to touch
+            if not Blender4CNC.SegmentGrid.LineBoxesTouch(A, B):
+                return []
             if (len(A0) > 2) and (len(A1) == 2):
                 if FEQ(A0[0], A1[0]) and FEQ(A0[1], A1[1]):
                     return []
@@ -10807,6 +12133,12 @@ class Blender4CNC:
             (minX, minY, maxX, maxY) = self.GetBoundingRectangle()
             (minX2, minY2, maxX2, maxY2) = poly2.GetBoundingRectangle()
 
+            # Quick test - the rectangles are too far apart to touch
+            m = max(abs(minX), abs(minY), abs(maxX), abs(maxY), abs(minX2), abs(minY2), abs(maxX2), abs(maxY2))
+            eps = 2 * (Blender4CNC.REL_TOLERANCE + 1e-4 * m)
+            if (minX > maxX2 + eps) or (minX2 > maxX + eps) or (minY > maxY2 + eps) or (minY2 > maxY + eps):
+                return False
+
             p = [(minX, minY), (minX, maxY), (maxX, maxY), (maxX, minY)]
             p2 = [(minX2, minY2), (minX2, maxY2), (maxX2, maxY2), (maxX2, minY2)]
 
@@ -10879,8 +12211,14 @@ class Blender4CNC:
 
         #********************************************************************
         # Returns the rectangle that encloses the polytoxogon
+        # (it is only calculated again if the points change)
         #********************************************************************
         def GetBoundingRectangle(self):  
+            if self.boundingRectangle == None:
+                self.boundingRectangle = self.IntGetBoundingRectangle()
+            return self.boundingRectangle
+
+        def IntGetBoundingRectangle(self):  
             pointsX = []
             pointsY = []
             for i in range(0,len(self.points)):
@@ -10906,7 +12244,11 @@ class Blender4CNC:
         # Treats arcs as circles
         #********************************************************************
         def GetBoundingRectangleNonExact(self):  
+            if self.boundingRectangleNonExact == None:
+                self.boundingRectangleNonExact = self.IntGetBoundingRectangleNonExact()
+            return self.boundingRectangleNonExact
 
+        def IntGetBoundingRectangleNonExact(self):  
             pointsX = []
             pointsY = []
             for i in range(0,len(self.points)):
@@ -13193,7 +14535,7 @@ class Blender4CNC:
                         points[i] = (x,y,z,w,CW)
 
                 poly2 = Blender4CNC.Polytoxogon(points)
-                poly2 = poly2.ApproximateCurves()
+                poly2 = poly2.ApproximateCurves(Blender4CNC.CoreSettings.FromBlender().approxCurveMaxError)
                 points2 = poly2.points
 
                 # Create a mesh
@@ -13593,7 +14935,8 @@ class Blender4CNC:
 
                 ob.select_set(state=False)
 
-                poly2 = poly.ApproximateCurves()
+                maxError = Blender4CNC.CoreSettings.FromBlender().approxCurveMaxError
+                poly2 = poly.ApproximateCurves(maxError)
                 points2 = poly2.points
 
                 if (bpy.context.scene.unit_settings.system != "METRIC"):
@@ -13626,7 +14969,7 @@ class Blender4CNC:
                     for tenon in tenons:
                         #print("tenon.points=", tenon.points)
                         points = tenon.points
-                        poly2 = tenon.ApproximateCurves()
+                        poly2 = tenon.ApproximateCurves(maxError)
                         points2 = poly2.points
 
                         if (bpy.context.scene.unit_settings.system != "METRIC"):
@@ -14328,13 +15671,14 @@ class Blender4CNC:
         #*************************************************************************
         def CalcApproxCurves(self):
             # Convert curves to line segments
-            self.approxPoly = self.poly.ApproximateCurves()
+            maxError = Blender4CNC.CoreSettings.FromBlender().approxCurveMaxError
+            self.approxPoly = self.poly.ApproximateCurves(maxError)
             if len(self.tenons) > 0:
                 tenons2 = []
                 for tenon in self.tenons:
                     if type(tenon) == list:
                         tenon = tenon[0]
-                    tenons2.append(tenon.ApproximateCurves())
+                    tenons2.append(tenon.ApproximateCurves(maxError))
                 self.approxTenons = tenons2
             return (self.approxPoly, self.approxTenons)
 
@@ -14848,6 +16192,185 @@ class Blender4CNC:
             # final expanded tenons will have to be shrunk back
             self.tenons = mainPoly.ShrinkPolys(tenons, dist)
 
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to write a GCode program out as it is generated
+    # The lines of each operation are streamed out to a temporary file so only
+    # one operation is ever held in memory. The header (which is only known when
+    # the program is finished) is written in front of them by WriteToFile.
+    # Lines are separated by newlines (the same as '\n'.join(lines)).
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #COVERAGE_CLASS GCodeWriter
+    class GCodeWriter:
+
+        def __init__(self):
+            self.body = tempfile.TemporaryFile(mode="w+")
+            self.numLines = 0
+
+        # The number of lines written so far
+        def __len__(self):
+            return self.numLines
+
+        #********************************************************************
+        # Append a list of lines to the program
+        #********************************************************************
+        def Write(self, lines):
+            if len(lines) == 0:
+                return
+            if self.numLines > 0:
+                self.body.write("\n")
+            self.body.write("\n".join(lines))
+            self.numLines += len(lines)
+
+        #********************************************************************
+        # Write the header followed by all the lines to the file and close
+        # the temporary file
+        #********************************************************************
+        def WriteToFile(self, fName, header):
+            try:
+                self.body.seek(0)
+                with io.open(fName, "w") as f:
+                    f.write("\n".join(header))
+                    if (len(header) > 0) and (self.numLines > 0):
+                        f.write("\n")
+                    shutil.copyfileobj(self.body, f)
+            finally:
+                self.Close()
+
+        #********************************************************************
+        # Close (and so delete) the temporary file, e.g. if generating the 
+        # program failed
+        #********************************************************************
+        def Close(self):
+            self.body.close()
+
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to cache the GCode generated for operations on disk
+    # Each entry is keyed by a hash of everything that the GCode depends on (the 
+    # coordinates, tenons, parameters, unit system and the source code) so an entry 
+    # never needs to be invalidated - changing anything just gives a new key.
+    # The least recently used entries are removed when the cache is too big.
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #COVERAGE_CLASS ToolpathCache
+    class ToolpathCache:
+
+        EXTENSION = ".toolpath"
+
+        # The Pockets attributes that the GCode of an operation depends on
+        # (as well as the arguments of the method and the unit system)
+        POCKETS_ATTRIBUTES = ["finishingSpeed", "finishingAmount", "finishingPass", "finishingBottom", 
+            "finishingNumPasses", "cutterDiameter", "zStep", "stepPercent", "numSpringCuts", "RapidHeight", 
+            "currentSpeed", "rasterMemoryBudget"]
+
+        # A hash of this source file (so entries made by other versions of the 
+        # code are never used)
+        codeVersion = None
+
+        # Entries are stored as JSON lists of lines (never as pickles, the 
+        # directory may come from someone else along with the .blend file).
+        # The directory is only listed once, when the cache is created, after
+        # that the size and last use of each entry is tracked here.
+        def __init__(self, directory, maxBytes):
+            self.directory = directory
+            self.maxBytes = maxBytes
+            os.makedirs(self.directory, exist_ok=True)
+            self.entries = {}
+            self.total = 0
+            for name in os.listdir(self.directory):
+                if name.endswith(Blender4CNC.ToolpathCache.EXTENSION):
+                    try:
+                        st = os.stat(os.path.join(self.directory, name))
+                    except OSError:
+                        continue
+                    self.entries[name] = (st.st_mtime, st.st_size)
+                    self.total += st.st_size
+
+        #********************************************************************
+        # Return the hash of this source file
+        #********************************************************************
+        def GetCodeVersion():
+            if Blender4CNC.ToolpathCache.codeVersion == None:
+                with open(__file__, "rb") as f:
+                    Blender4CNC.ToolpathCache.codeVersion = hashlib.sha256(f.read()).hexdigest()
+            return Blender4CNC.ToolpathCache.codeVersion
+
+        #********************************************************************
+        # Return the key for an operation job (see ProcessCollections.GetOperationJob)
+        #********************************************************************
+        def GetKey(self, job):
+            (p2g2, methodName, args) = job
+            settings = p2g2.settings
+            gridResolution = 0
+            if settings.grid != None:
+                gridResolution = settings.grid.resolution
+            attributes = [getattr(p2g2, name) for name in Blender4CNC.ToolpathCache.POCKETS_ATTRIBUTES]
+            data = [Blender4CNC.ToolpathCache.GetCodeVersion(), settings.unitSystem, gridResolution, 
+                    settings.useArrangement, attributes, methodName, args]
+            return hashlib.sha256(json.dumps(data).encode("utf-8")).hexdigest()
+
+        def GetFileName(self, name):
+            return os.path.join(self.directory, name)
+
+        #********************************************************************
+        # Return the lines of GCode for a key (or None if they are not cached)
+        #********************************************************************
+        def Get(self, key):
+            name = key + Blender4CNC.ToolpathCache.EXTENSION
+            if name not in self.entries:
+                return None
+            fName = self.GetFileName(name)
+            try:
+                with open(fName, "r") as f:
+                    lines = json.load(f)
+                # Mark it as recently used
+                os.utime(fName)
+            except (OSError, ValueError):
+                return None
+            if (type(lines) != list) or not all([type(line) == str for line in lines]):
+                return None
+            self.entries[name] = (time.time(), self.entries[name][1])
+            return lines
+
+        #********************************************************************
+        # Store the lines of GCode for a key and remove old entries if the
+        # cache is too big
+        #********************************************************************
+        def Put(self, key, lines):
+            name = key + Blender4CNC.ToolpathCache.EXTENSION
+            # Write to a temporary file first so that a half written entry is never read
+            try:
+                (fd, tmpName) = tempfile.mkstemp(dir=self.directory)
+                with os.fdopen(fd, "w") as f:
+                    json.dump(lines, f)
+                size = os.path.getsize(tmpName)
+                os.replace(tmpName, self.GetFileName(name))
+            except OSError:
+                # A full disk etc. only means that the operation is not cached
+                return
+            if name in self.entries:
+                self.total -= self.entries[name][1]
+            self.entries[name] = (time.time(), size)
+            self.total += size
+            if self.total > self.maxBytes:
+                self.Evict()
+
+        #********************************************************************
+        # Remove the least recently used entries until the cache fits
+        #********************************************************************
+        def Evict(self):
+            entries = sorted([(mtime, name) for (name, (mtime, size)) in self.entries.items()])
+            for (mtime, name) in entries:
+                if self.total <= self.maxBytes:
+                    break
+                try:
+                    os.remove(self.GetFileName(name))
+                except OSError:
+                    pass
+                self.total -= self.entries.pop(name)[1]
+
     #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     # A class to process the collections of operations and paths
@@ -14933,8 +16456,6 @@ class Blender4CNC:
                         self.parent.Errors.ShowErrorOnOperation(ob, "Cannot have %s in Collection Out" % ob.name)
 
 
-            self.ss = self.GetProgramHeader(gcodePreAmble)
-
             self.progNumber = 1
 
             self.listPrograms = []
@@ -15526,6 +17047,37 @@ class Blender4CNC:
             print("GetGCode4DepthImage finished Go_Image2GCode")
             return (imNames, i2g)
         def GetGCode4Operation(self, sss, currentFilename):
+            (vPoly, job) = self.GetOperationJob(sss)
+            if job != None:
+                key = None
+                if self.toolpathCache != None:
+                    key = self.toolpathCache.GetKey(job)
+                    lines = self.toolpathCache.Get(key)
+                    if lines != None:
+                        self.WriteProgramLines(lines)
+                        return vPoly
+                if self.pool == None:
+                    self.WriteProgramLines(Blender4CNC.ProcessCollections.RunOperationJob(job), key)
+                else:
+                    self.WriteProgramLines(self.pool.submit(Blender4CNC.ProcessCollections.RunOperationJob, job), key, sss)
+            return vPoly
+
+        #*************************************************************************
+        # Generate the GCode for an operation from a job (see GetOperationJob)
+        # This does not touch any Blender data so it can be run in another process
+        #*************************************************************************
+        def RunOperationJob(job):
+            (p2g2, methodName, args) = job
+            return getattr(p2g2, methodName)(*args)
+
+        #*************************************************************************
+        # Read everything needed for an operation from Blender (coordinates, 
+        # tenons and parameters) and return (vPoly, job) where the job is 
+        # (Pockets object, name of Pockets method, arguments) and can be passed 
+        # to RunOperationJob (job is None if there is nothing to do)
+        #*************************************************************************
+        def GetOperationJob(self, sss):
+            job = None
             # Look for parameters for this pocket
             self.parent.Parameters.SetLocalParameters(sss)
             endDepth = self.parent.Parameters.LocalOrGlobal("EndDepth")
@@ -15577,17 +17129,34 @@ class Blender4CNC:
                 pSafeZ = self.parent.Parameters.LocalOrGlobal("SafeZ")
                 pSpd = self.parent.Parameters.LocalOrGlobal("Speed")
 
+                # Pockets may be calculated on a fixed point grid of this size
+                try:
+                    gridResolution = self.parent.Parameters.LocalOrGlobal("GridResolution")
+                except KeyError:
+                    gridResolution = 0
+                # The booleans in pockets may be done on a planar arrangement
+                try:
+                    useArrangement = float(self.parent.Parameters.LocalOrGlobal("ArrangementBooleans")) != 0
+                except KeyError:
+                    useArrangement = False
+
                 if (bpy.context.scene.unit_settings.system == "METRIC"):
                     finAmt /= 1000
                     pDia /= 1000
                     pZStep /= 1000
                     pSafeZ /= 1000
+                    gridResolution /= 1000
 
-                p2g2 = Blender4CNC.Pockets(finSpd, finAmt, fin, finBot, 1, pDia, pZStep, pStepover, 0, pSafeZ, pSpd)
+                settings = Blender4CNC.CoreSettings.FromBlender(gridResolution, useArrangement)
+                p2g2 = Blender4CNC.Pockets(finSpd, finAmt, fin, finBot, 1, pDia, pZStep, pStepover, 0, pSafeZ, pSpd, settings)
+                # The memory budget for roughing images may be overridden (in Mb)
+                try:
+                    p2g2.rasterMemoryBudget = float(self.parent.Parameters.LocalOrGlobal("PocketMemoryMb")) * 1024 * 1024
+                except KeyError:
+                    pass
 
                 if vPoly.IsNamed2("Pocket") and vPoly.IsCircle() and (len(vPoly.tenons)==0):
-                    l2 = p2g2.CutCircularPocket(vPoly.cx, vPoly.cy, vPoly.r, startDepth, endDepth, self.parent.Parameters.LocalOrGlobal("Finishing"))
-                    self.ss += l2
+                    job = (p2g2, "CutCircularPocket", (vPoly.cx, vPoly.cy, vPoly.r, startDepth, endDepth, self.parent.Parameters.LocalOrGlobal("Finishing")))
                 elif vPoly.IsNamed2("Pocket"):
                     listOfTenons = ""
                     if len(tenons) > 0:
@@ -15596,13 +17165,13 @@ class Blender4CNC:
                             vPoly2 = self.parent.VisualPoly(tenons[i], dia)
                             vPoly2.SetCoords()
                             listOfTenons += [vPoly2.coords2]
-                        self.ss += p2g2.CutPocket(vPoly.coords2, startDepth, endDepth, 0, listOfTenons)
+                        job = (p2g2, "CutPocket", (vPoly.coords2, startDepth, endDepth, 0, listOfTenons))
                     else:
-                        self.ss += p2g2.CutPocket(vPoly.coords2, startDepth, endDepth, 0, [])
+                        job = (p2g2, "CutPocket", (vPoly.coords2, startDepth, endDepth, 0, []))
                 elif vPoly.IsNamed2("Path") and vPoly.IsCircle():
-                    self.ss += p2g2.CutCircle(vPoly.coords[1][3], vPoly.coords[1][4], vPoly.r, startDepth, endDepth)
+                    job = (p2g2, "CutCircle", (vPoly.coords[1][3], vPoly.coords[1][4], vPoly.r, startDepth, endDepth))
                 elif vPoly.IsNamed2("Path") or vPoly.IsNamed2("Hole"):
-                    self.ss += p2g2.CutShapeLine(vPoly.coords2, startDepth, endDepth)
+                    job = (p2g2, "CutShapeLine", (vPoly.coords2, startDepth, endDepth))
                 elif vPoly.IsNamed2("DrillPath"):
                     try:
                         fastPeck = self.parent.Parameters.LocalOrGlobal("FastPeck")
@@ -15621,15 +17190,115 @@ class Blender4CNC:
                         else:
                             peckDepth = 0
                     print("slowPeck, fastPeck, peckDepth=", slowPeck, fastPeck, peckDepth)
-                    self.ss += p2g2.DrillCycle(vPoly.coords2, slowPeck, fastPeck, peckDepth, endDepth)
-            return vPoly
+                    job = (p2g2, "DrillCycle", (vPoly.coords2, slowPeck, fastPeck, peckDepth, endDepth))
+            return (vPoly, job)
+
+        #*************************************************************************
+        # Operations can be generated in parallel by a pool of processes if the
+        # project parameter "ParallelOperations" is the number of processes to 
+        # use (more than 1). Returns the pool or None to generate them one 
+        # after another (the default, when there is no such parameter).
+        # The processes are forked (so they already have all the code and data
+        # loaded), which copies the whole Blender process. The workers only run
+        # Pockets methods that do not use bpy, but forking a process with other
+        # threads running is only safe enough on Linux (e.g. on macOS system 
+        # libraries can deadlock in the child), so it is not done elsewhere.
+        #*************************************************************************
+        def GetOperationsPool(self):
+            try:
+                numProcesses = int(self.parent.Parameters.ProjectParameter("ParallelOperations"))
+            except (KeyError, TypeError, ValueError):
+                numProcesses = 0
+            if (numProcesses <= 1) or (not sys.platform.startswith("linux")):
+                return None
+            return concurrent.futures.ProcessPoolExecutor(numProcesses, mp_context=multiprocessing.get_context("fork"))
+
+        #*************************************************************************
+        # Returns the toolpath cache for this .blend file or None if the cache
+        # is turned off (project parameter "ToolpathCacheMb" is 0) or the file 
+        # has never been saved
+        #*************************************************************************
+        def GetToolpathCache(self):
+            maxBytes = Blender4CNC.TOOLPATH_CACHE_BUDGET
+            try:
+                maxBytes = float(self.parent.Parameters.ProjectParameter("ToolpathCacheMb")) * 1024 * 1024
+            except KeyError:
+                pass
+            if (maxBytes <= 0) or (bpy.context.blend_data.filepath == ""):
+                return None
+            ThisPath = bpy.path.abspath("//")
+            ThisFile = bpy.path.basename(bpy.context.blend_data.filepath)
+            ThisFile = ThisFile[0:-6] # Remove the '.blend'
+            try:
+                return Blender4CNC.ToolpathCache(ThisPath + ThisFile + "_ToolpathCache", maxBytes)
+            except OSError:
+                # e.g. the directory is read only, just run without a cache
+                return None
+
+        #*************************************************************************
+        # Add lines of GCode (or a Future that returns the lines) to the current 
+        # program. Lines are written out in order as soon as they are ready.
+        # If a cache key is given, the lines are stored in the toolpath cache.
+        # The name of the operation is used to report an error from a Future.
+        #*************************************************************************
+        def WriteProgramLines(self, lines, key=None, name=""):
+            self.pendingLines.append((lines, key, name))
+            self.FlushProgramLines(False)
+
+        #*************************************************************************
+        # Write out any lines that are ready (waiting for all of them if wait 
+        # is True)
+        #*************************************************************************
+        def FlushProgramLines(self, wait):
+            while len(self.pendingLines) > 0:
+                (lines, key, name) = self.pendingLines[0]
+                if isinstance(lines, concurrent.futures.Future):
+                    if not (wait or lines.done()):
+                        break
+                    try:
+                        lines = lines.result()
+                    except Exception as err:
+                        # This may be raised while a later operation is being 
+                        # processed so say which operation failed (keep the type
+                        # of the error e.g. PolyException, as if run serially)
+                        ea = list(err.args)
+                        if len(ea) == 0:
+                            ea = [repr(err)]
+                        ea[0] = "%s: %s" % (name, ea[0])
+                        try:
+                            err2 = type(err)(*ea)
+                        except TypeError:
+                            err2 = Exception(*ea)
+                        raise err2 from err
+                if key != None:
+                    self.toolpathCache.Put(key, lines)
+                self.gcode.Write(lines)
+                self.pendingLines.pop(0)
         def GetGCode4Collections(self, gcodePreAmble, gcodePostAmble):
+            # The operations may be generated by a pool of processes
+            self.pool = self.GetOperationsPool()
+            # Operations that have not changed are read from the toolpath cache
+            self.toolpathCache = self.GetToolpathCache()
+            self.gcode = None
+            try:
+                return self.IntGetGCode4Collections(gcodePreAmble, gcodePostAmble)
+            finally:
+                # Remove the temporary file of a program that was not finished
+                if self.gcode != None:
+                    self.gcode.Close()
+                if self.pool != None:
+                    self.pool.shutdown(cancel_futures=True)
+                    self.pool = None
+
+        def IntGetGCode4Collections(self, gcodePreAmble, gcodePostAmble):
             curCutter = -1
             listOfLists = []
             listVisualPaths = []
             listPrograms = []
             listProgramsCutter = []
-            self.ss = []
+            # The GCode of each program is streamed out to disk as it is generated
+            self.gcode = Blender4CNC.GCodeWriter()
+            self.pendingLines = []
             
             collsAndOps = self.GetFileOrder()
 
@@ -15650,8 +17319,7 @@ class Blender4CNC:
                 startDepth = self.parent.Parameters.LocalOrGlobal("StartDepth")
                     
                 # Call the pocket function
-                self.ss += [" "]
-                self.ss += ["(" + sss + ")"]
+                self.WriteProgramLines([" ", "(" + sss + ")"])
                 # Check if any local parameters override speed, finishing etc.
 
                 vPoly = None
@@ -15694,11 +17362,10 @@ class Blender4CNC:
                     if currentFilename != nextFilename:
                         if not self.parent.IsObjectNamed(sss, "DepthImage"):
                             print("Writing GCode", currentFilename, nextFilename)
-                            self.ss = self.GetProgramHeader(gcodePreAmble) + self.ss
-                            self.FinishAndWriteProgram(currentFilename)
+                            self.FinishAndWriteProgram(currentFilename, self.GetProgramHeader(gcodePreAmble))
                             self.listPrograms += [currentFilename + ".ngc"]
                             self.listProgramsCutter += [curCutter]
-                            self.ss = []
+                            self.gcode = Blender4CNC.GCodeWriter()
 
                         if len(listVisualPaths) > 0:
                             listOfLists.append(listVisualPaths)
@@ -15756,9 +17423,10 @@ class Blender4CNC:
                         bpy.data.objects.remove(k, do_unlink=True)
 
         #********************************************************************
-        # Finishes the current program and writes it out to disk
+        # Finishes the current program and writes it out to disk (with the 
+        # header in front of it)
         #********************************************************************
-        def FinishAndWriteProgram(self, fName):
+        def FinishAndWriteProgram(self, fName, header):
             ThisPath = bpy.path.abspath("//")
             ThisFile = bpy.path.basename(bpy.context.blend_data.filepath)
             ThisFile = ThisFile[0:-6] # Remove the '.blend'
@@ -15766,16 +17434,19 @@ class Blender4CNC:
             fName = ThisPath + fName
             
 
+            # Wait for all the operations to be generated
+            self.FlushProgramLines(True)
+
             gcodePostAmble = self.parent.GetTextObject("GCodePostAmble")
             l2 = [""]
             l2 += gcodePostAmble
-            l2.append("( Total Lines = %d )" % (len(self.ss)+1))
-            self.ss += l2
-            print("Finished %d Lines of GCode" % (len(self.ss)+1))
+            numLines = len(header) + len(self.gcode)
+            l2.append("( Total Lines = %d )" % (numLines+1))
+            self.gcode.Write(l2)
+            print("Finished %d Lines of GCode" % (numLines+len(l2)+1))
 
     #        self.WritePyCode(fName + ".ngc")
-            with io.open(fName + ".ngc", "w") as f:
-                f.write('\n'.join(self.ss))
+            self.gcode.WriteToFile(fName + ".ngc", header)
     #        self.listPrograms += [fName + ".ngc"]
 
         #********************************************************************
@@ -16573,745 +18244,748 @@ class Blender4CNC:
 
 #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# Mogrify 
-# A class for when the user clicks "Create Path Left"
-# A class for when the user clicks "Create Path Right"
-# A class for when the user clicks "Expand Shape"
-# A class for when the user clicks "Shrink Shape"
+# A class for calling out to ImageMagick (MagickStr is only used during testing)
 #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class CreateLeftPath(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_left_path", "", {"REGISTER", "UNDO"}, "Create Path to Left"
-    def execute(self, context) :
-        Blender4CNC().MogrifyOps.CreatePathLeft(context, context.scene.model2pyObject.distance, False) 
-        return {"FINISHED"}
-
-class CreateRightPath(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_right_path", "", {"REGISTER", "UNDO"}, "Create Path to Right"
-    def execute(self, context) :
-        Blender4CNC().MogrifyOps.CreatePathLeft(context, context.scene.model2pyObject.distance, True)        
-        return {"FINISHED"}
+class ImageMagick:
 
-class ExpandShape(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.expand_shape", "", {"REGISTER", "UNDO"}, "Expand Shape"
-    def execute(self, context) :
-        Blender4CNC().MogrifyOps.ExpandShape(context, context.scene.model2pyObject.distance, True)        
-        return {"FINISHED"}
+    #**************************************************************************
+    # Convert a command line string into a list suitable for subprocess
+    #**************************************************************************
+    def MagickStr(self, s):
+        subprocess.call(["magick"] + shlex.split(s))
 
-class ShrinkShape(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.shrink_shape", "", {"REGISTER", "UNDO"}, "Shrink Shape"
-    def execute(self, context) :
-        Blender4CNC().MogrifyOps.ExpandShape(context, context.scene.model2pyObject.distance, False)        
-        return {"FINISHED"}
+#*******************************************************************
+# The add-on (operators, panels and properties) only exists in Blender
+#*******************************************************************
+if bpy != None:
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # Mogrify 
+    # A class for when the user clicks "Create Path Left"
+    # A class for when the user clicks "Create Path Right"
+    # A class for when the user clicks "Expand Shape"
+    # A class for when the user clicks "Shrink Shape"
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class CreateLeftPath(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_left_path", "", {"REGISTER", "UNDO"}, "Create Path to Left"
+        def execute(self, context) :
+            Blender4CNC().MogrifyOps.CreatePathLeft(context, context.scene.model2pyObject.distance, False) 
+            return {"FINISHED"}
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class for when the user clicks "Create CW Pocket"
-# A class for when the user clicks "Create Tenon"
-# A class for when the user clicks "Create CCW Pocket"
-# A class for when the user clicks "Create Closed Path"
-# A class for when the user clicks "Create Open Path"
-# A class for when the user clicks "Create Hole"
-# A class for when the user clicks "Create Drill Path"
-# A class for when the user clicks "Create Arc Path"
-# A class for when the user clicks "Create Circle Path"
-# A class for when the user clicks "Create Circle Pocket"
-# A class for when the user clicks "Create DepthImage"
-# A class for when the user clicks "Create Parameter"
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class CreatePocket(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_pocket", "", {"REGISTER", "UNDO"}, "Create CW Pocket"
-    def execute(self, context):
-        Blender4CNC().CreateOps.CreateCWPocket()
-        return {"FINISHED"}
+    class CreateRightPath(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_right_path", "", {"REGISTER", "UNDO"}, "Create Path to Right"
+        def execute(self, context) :
+            Blender4CNC().MogrifyOps.CreatePathLeft(context, context.scene.model2pyObject.distance, True)        
+            return {"FINISHED"}
 
-class CreateTenon(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_tenon", "", {"REGISTER", "UNDO"}, "Create Tenon"
-    def execute(self, context):
-        Blender4CNC().CreateOps.CreateTenon()
-        return {"FINISHED"}
+    class ExpandShape(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.expand_shape", "", {"REGISTER", "UNDO"}, "Expand Shape"
+        def execute(self, context) :
+            Blender4CNC().MogrifyOps.ExpandShape(context, context.scene.model2pyObject.distance, True)        
+            return {"FINISHED"}
 
-class CreateCCWPocket(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_ccw_pocket", "", {"REGISTER", "UNDO"}, "Create CCW Pocket"
-    def execute(self, context) :
-        Blender4CNC().CreateOps.CreateCCWPocket()
-        return {"FINISHED"}
+    class ShrinkShape(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.shrink_shape", "", {"REGISTER", "UNDO"}, "Shrink Shape"
+        def execute(self, context) :
+            Blender4CNC().MogrifyOps.ExpandShape(context, context.scene.model2pyObject.distance, False)        
+            return {"FINISHED"}
 
-class CreateClosedPath(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_closed_path", "", {"REGISTER", "UNDO"}, "Create Closed Path"
-    def execute(self, context) :
-        Blender4CNC().CreateOps.CreateClosedPath()
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class for when the user clicks "Create CW Pocket"
+    # A class for when the user clicks "Create Tenon"
+    # A class for when the user clicks "Create CCW Pocket"
+    # A class for when the user clicks "Create Closed Path"
+    # A class for when the user clicks "Create Open Path"
+    # A class for when the user clicks "Create Hole"
+    # A class for when the user clicks "Create Drill Path"
+    # A class for when the user clicks "Create Arc Path"
+    # A class for when the user clicks "Create Circle Path"
+    # A class for when the user clicks "Create Circle Pocket"
+    # A class for when the user clicks "Create DepthImage"
+    # A class for when the user clicks "Create Parameter"
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class CreatePocket(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_pocket", "", {"REGISTER", "UNDO"}, "Create CW Pocket"
+        def execute(self, context):
+            Blender4CNC().CreateOps.CreateCWPocket()
+            return {"FINISHED"}
 
-class CreateOpenPath(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_open_path", "", {"REGISTER", "UNDO"}, "Create Open Path"
-    def execute(self, context) :
-        Blender4CNC().CreateOps.CreateOpenPath()
-        return {"FINISHED"}
+    class CreateTenon(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_tenon", "", {"REGISTER", "UNDO"}, "Create Tenon"
+        def execute(self, context):
+            Blender4CNC().CreateOps.CreateTenon()
+            return {"FINISHED"}
 
-class CreateHole(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_hole", "", {"REGISTER", "UNDO"}, "Create Hole"
-    def execute(self, context) :
-        Blender4CNC().CreateOps.CreateHole()
-        return {"FINISHED"}
+    class CreateCCWPocket(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_ccw_pocket", "", {"REGISTER", "UNDO"}, "Create CCW Pocket"
+        def execute(self, context) :
+            Blender4CNC().CreateOps.CreateCCWPocket()
+            return {"FINISHED"}
 
-class CreateDrillPath(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_drill_path", "", {"REGISTER", "UNDO"}, "Create DrillPath"
-    def execute(self, context) :
-        Blender4CNC().CreateOps.CreateDrillPath()
-        return {"FINISHED"}
+    class CreateClosedPath(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_closed_path", "", {"REGISTER", "UNDO"}, "Create Closed Path"
+        def execute(self, context) :
+            Blender4CNC().CreateOps.CreateClosedPath()
+            return {"FINISHED"}
 
-class CreateArcPath(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_arc_path", "", {"REGISTER", "UNDO"}, "Create Arc Path"
-    def execute(self, context) :
-        Blender4CNC().CreateOps.CreateArcPath()
-        return {"FINISHED"}
+    class CreateOpenPath(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_open_path", "", {"REGISTER", "UNDO"}, "Create Open Path"
+        def execute(self, context) :
+            Blender4CNC().CreateOps.CreateOpenPath()
+            return {"FINISHED"}
 
-class CreateCirclePath(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_circle_path", "", {"REGISTER", "UNDO"}, "Create Circle Path"
-    def execute(self, context) :
-        Blender4CNC().CreateOps.CreateCirclePath()
-        return {"FINISHED"}
+    class CreateHole(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_hole", "", {"REGISTER", "UNDO"}, "Create Hole"
+        def execute(self, context) :
+            Blender4CNC().CreateOps.CreateHole()
+            return {"FINISHED"}
 
-class CreateCirclePocket(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_circle_pocket", "", {"REGISTER", "UNDO"}, "Create Circle Pocket"
-    def execute(self, context) :
-        Blender4CNC().CreateOps.CreateCirclePocket()
-        return {"FINISHED"}
+    class CreateDrillPath(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_drill_path", "", {"REGISTER", "UNDO"}, "Create DrillPath"
+        def execute(self, context) :
+            Blender4CNC().CreateOps.CreateDrillPath()
+            return {"FINISHED"}
 
-class CreateDepthImage(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_depthimage", "", {"REGISTER", "UNDO"}, "Create DepthImage"
-    def execute(self, context):
-        Blender4CNC().CreateOps.CreateDepthImage()
-        return {"FINISHED"}
+    class CreateArcPath(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_arc_path", "", {"REGISTER", "UNDO"}, "Create Arc Path"
+        def execute(self, context) :
+            Blender4CNC().CreateOps.CreateArcPath()
+            return {"FINISHED"}
 
-class CreateParameter(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_parameter", "", {"REGISTER", "UNDO"}, "Create Parameter"
-    def execute(self, context) :
-        Blender4CNC().CreateOps.CreateParameter()
-        return {"FINISHED"}
+    class CreateCirclePath(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_circle_path", "", {"REGISTER", "UNDO"}, "Create Circle Path"
+        def execute(self, context) :
+            Blender4CNC().CreateOps.CreateCirclePath()
+            return {"FINISHED"}
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class for when the user clicks "Clean Meshes"
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class CleanMesh(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.clean_mesh", "", {"REGISTER", "UNDO"}, "Clean Meshes"
+    class CreateCirclePocket(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_circle_pocket", "", {"REGISTER", "UNDO"}, "Create Circle Pocket"
+        def execute(self, context) :
+            Blender4CNC().CreateOps.CreateCirclePocket()
+            return {"FINISHED"}
 
-    def execute(self, context) :
-        Blender4CNC().MeshCleanup.CleanMeshes(context)        
-        return {"FINISHED"}
+    class CreateDepthImage(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_depthimage", "", {"REGISTER", "UNDO"}, "Create DepthImage"
+        def execute(self, context):
+            Blender4CNC().CreateOps.CreateDepthImage()
+            return {"FINISHED"}
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class for when the user clicks "CheckMeshes"
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class CheckMesh(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.check_mesh", "", {"REGISTER", "UNDO"}, "Check Meshes"
+    class CreateParameter(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_parameter", "", {"REGISTER", "UNDO"}, "Create Parameter"
+        def execute(self, context) :
+            Blender4CNC().CreateOps.CreateParameter()
+            return {"FINISHED"}
 
-    def execute(self, context) :
-        Blender4CNC().MeshCleanup.CheckMeshes(context)        
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class for when the user clicks "Clean Meshes"
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class CleanMesh(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.clean_mesh", "", {"REGISTER", "UNDO"}, "Clean Meshes"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class for when the user clicks "Process Paths"
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class ProcessPaths(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.process_paths", "Process Paths", {"REGISTER", "UNDO"}, "Process Paths"
+        def execute(self, context) :
+            Blender4CNC().MeshCleanup.CleanMeshes(context)        
+            return {"FINISHED"}
 
-    def execute(self, context) :
-#        cProfile.runctx('Blender4CNC().ProcessPaths(context)', globals(), locals())
-        Blender4CNC().ProcessPaths(context)        
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class for when the user clicks "CheckMeshes"
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class CheckMesh(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.check_mesh", "", {"REGISTER", "UNDO"}, "Check Meshes"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class for when the user clicks "Just Produce GCode"
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class JustProduceGCode(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.just_produce_gcode", "Just Produce GCode", {"REGISTER", "UNDO"}, "Just Produce GCode"
+        def execute(self, context) :
+            Blender4CNC().MeshCleanup.CheckMeshes(context)        
+            return {"FINISHED"}
 
-    def execute(self, context) :
-#        cProfile.runctx('Blender4CNC().ProcessPaths(context)', globals(), locals())
-        Blender4CNC().JustProduceGCode(context)        
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class for when the user clicks "Process Paths"
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class ProcessPaths(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.process_paths", "Process Paths", {"REGISTER", "UNDO"}, "Process Paths"
 
+        def execute(self, context) :
+    #        cProfile.runctx('Blender4CNC().ProcessPaths(context)', globals(), locals())
+            Blender4CNC().ProcessPaths(context)        
+            return {"FINISHED"}
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to display the GUI panel for Object mode - Process Paths, Clean Meshes, Create Paths and Pockets 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class Model2Py2GCode_PT_Panel(bpy.types.Panel) :
-    bl_idname = 'MODEL2PY2GCODE_PT_Panel'
-    bl_label = 'GCode'
-    bl_space_type = 'VIEW_3D'
-    bl_region_type = 'UI'
-    bl_category = 'GCODE'
-
-    bl_context = "objectmode"
-    bl_label = "Blender4CNC"
-
-    def draw(self, context) :
-        m2pO = context.scene.model2pyObject
-        TheCol = self.layout.column(align = True)
-        TheCol.operator("mesh.process_paths", text = "Process Paths", icon="PLAY")
-        TheCol.operator("mesh.just_produce_gcode", text = "Just Produce GCode", icon="PLAY")
-        self.layout.label(text=" ")
-        TheCol = self.layout.column(align = True)
-        TheRow = self.layout.row(align = False)
-        TheRow.operator("mesh.clean_mesh", text = " ", icon="TOOL_SETTINGS") # text = "Clean Meshes"
-        TheRow.operator("mesh.check_mesh", text = " ", icon="ERROR") # text = "Check Meshes"
-        TheRow.label(text=" ")
-        TheRow.label(text=" ")
-        TheRow.label(text=" ")
-        TheRow.label(text=" ")
-        self.layout.label(text="")
-        TheCol = self.layout.column(align = True)
-        TheCol.prop(m2pO, "distance")
-        TheRow = self.layout.row(align = False)
-        TheRow.operator("mesh.create_right_path", text=" ", icon="TRACKING_FORWARDS_SINGLE") # text = "Create Path Right"
-        TheRow.operator("mesh.create_left_path", text=" ", icon="TRACKING_BACKWARDS_SINGLE") # text = "Create Path Left"
-        TheRow.operator("mesh.expand_shape", text=" ", icon="MOD_SKIN") # text = "Expand Shape"
-        TheRow.operator("mesh.shrink_shape", text=" ", icon="MOD_MESHDEFORM") # text = "Shrink Shape"
-#        TheRow.operator("mesh.expand_shape", text=" ", icon="MOD_SKIN") # text = "Expand Shape"
-#        TheRow.operator("mesh.shrink_shape", text=" ", icon="MOD_MESHDEFORM") # text = "Shrink Shape"
-#        TheRow.operator("mesh.expand_shape", text=" ", icon="FULLSCREEN_ENTER") # text = "Expand Shape"
-#        TheRow.operator("mesh.shrink_shape", text=" ", icon="FULLSCREEN_EXIT") # text = "Shrink Shape"
-        TheRow.label(text=" ")
-        TheRow.label(text=" ")
-        self.layout.label(text=" ")
-        TheCol = self.layout.column(align = True)
-        TheRow = self.layout.row(align = False)
-        TheRow.operator("mesh.create_pocket", text=" ", icon="SNAP_FACE")             # text = "CW Pocket"
-        TheRow.operator("mesh.create_ccw_pocket", text=" ", icon="IMAGE_ALPHA")       # text = "CCW Pocket"
-        TheRow.operator("mesh.create_closed_path", text=" ", icon="MESH_PLANE")       # text = "Closed Path"
-        TheRow.operator("mesh.create_open_path", text=" ", icon="IPO_CONSTANT")          # text = "Open Path"
-        TheRow.operator("mesh.create_hole", text=" ", icon="CLIPUV_DEHLT")            # text = "Hole"
-        TheRow.operator("mesh.create_drill_path", text=" ", icon="LIGHTPROBE_GRID")   # text = "Drill Path"
-        TheRow = self.layout.row(align = False)
-        TheRow.operator("mesh.create_arc_path", text=" ", icon="SPHERECURVE")         # text = "Arc Path"
-        TheRow.operator("mesh.create_circle_path", text=" ", icon="MESH_CIRCLE")         # text = "Circle Path"
-        TheRow.operator("mesh.create_circle_pocket", text=" ", icon="SHADING_SOLID")         # text = "Circle Pocket"
-        TheRow.operator("mesh.create_depthimage", text=" ", icon="IMAGE_DATA")         # text = "DepthImage"
-        TheRow.operator("mesh.create_tenon", text=" ", text_ctxt="test", icon="IMAGE_ZDEPTH")       # text = ""
-        TheRow.operator("mesh.create_parameter", text=" ", icon="OUTLINER_OB_FONT")         # text = ""
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class for when the user clicks "Just Produce GCode"
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class JustProduceGCode(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.just_produce_gcode", "Just Produce GCode", {"REGISTER", "UNDO"}, "Just Produce GCode"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to make a radius edge in edit mode
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class MakeRadius(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.make_radius", "", {"UNDO"}, "Make Radius Segment"
+        def execute(self, context) :
+    #        cProfile.runctx('Blender4CNC().ProcessPaths(context)', globals(), locals())
+            Blender4CNC().JustProduceGCode(context)        
+            return {"FINISHED"}
 
-    def execute(self, context) :
-        Blender4CNC().EditOps.MakeRadius()
-        return {"FINISHED"}
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to unmake a radius edge in edit mode
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class UnMakeRadius(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.unmake_radius", "", {"UNDO"}, "Unmake Radius Segment"
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to display the GUI panel for Object mode - Process Paths, Clean Meshes, Create Paths and Pockets 
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class Model2Py2GCode_PT_Panel(bpy.types.Panel) :
+        bl_idname = 'MODEL2PY2GCODE_PT_Panel'
+        bl_label = 'GCode'
+        bl_space_type = 'VIEW_3D'
+        bl_region_type = 'UI'
+        bl_category = 'GCODE'
+
+        bl_context = "objectmode"
+        bl_label = "Blender4CNC"
+
+        def draw(self, context) :
+            m2pO = context.scene.model2pyObject
+            TheCol = self.layout.column(align = True)
+            TheCol.operator("mesh.process_paths", text = "Process Paths", icon="PLAY")
+            TheCol.operator("mesh.just_produce_gcode", text = "Just Produce GCode", icon="PLAY")
+            self.layout.label(text=" ")
+            TheCol = self.layout.column(align = True)
+            TheRow = self.layout.row(align = False)
+            TheRow.operator("mesh.clean_mesh", text = " ", icon="TOOL_SETTINGS") # text = "Clean Meshes"
+            TheRow.operator("mesh.check_mesh", text = " ", icon="ERROR") # text = "Check Meshes"
+            TheRow.label(text=" ")
+            TheRow.label(text=" ")
+            TheRow.label(text=" ")
+            TheRow.label(text=" ")
+            self.layout.label(text="")
+            TheCol = self.layout.column(align = True)
+            TheCol.prop(m2pO, "distance")
+            TheRow = self.layout.row(align = False)
+            TheRow.operator("mesh.create_right_path", text=" ", icon="TRACKING_FORWARDS_SINGLE") # text = "Create Path Right"
+            TheRow.operator("mesh.create_left_path", text=" ", icon="TRACKING_BACKWARDS_SINGLE") # text = "Create Path Left"
+            TheRow.operator("mesh.expand_shape", text=" ", icon="MOD_SKIN") # text = "Expand Shape"
+            TheRow.operator("mesh.shrink_shape", text=" ", icon="MOD_MESHDEFORM") # text = "Shrink Shape"
+    #        TheRow.operator("mesh.expand_shape", text=" ", icon="MOD_SKIN") # text = "Expand Shape"
+    #        TheRow.operator("mesh.shrink_shape", text=" ", icon="MOD_MESHDEFORM") # text = "Shrink Shape"
+    #        TheRow.operator("mesh.expand_shape", text=" ", icon="FULLSCREEN_ENTER") # text = "Expand Shape"
+    #        TheRow.operator("mesh.shrink_shape", text=" ", icon="FULLSCREEN_EXIT") # text = "Shrink Shape"
+            TheRow.label(text=" ")
+            TheRow.label(text=" ")
+            self.layout.label(text=" ")
+            TheCol = self.layout.column(align = True)
+            TheRow = self.layout.row(align = False)
+            TheRow.operator("mesh.create_pocket", text=" ", icon="SNAP_FACE")             # text = "CW Pocket"
+            TheRow.operator("mesh.create_ccw_pocket", text=" ", icon="IMAGE_ALPHA")       # text = "CCW Pocket"
+            TheRow.operator("mesh.create_closed_path", text=" ", icon="MESH_PLANE")       # text = "Closed Path"
+            TheRow.operator("mesh.create_open_path", text=" ", icon="IPO_CONSTANT")          # text = "Open Path"
+            TheRow.operator("mesh.create_hole", text=" ", icon="CLIPUV_DEHLT")            # text = "Hole"
+            TheRow.operator("mesh.create_drill_path", text=" ", icon="LIGHTPROBE_GRID")   # text = "Drill Path"
+            TheRow = self.layout.row(align = False)
+            TheRow.operator("mesh.create_arc_path", text=" ", icon="SPHERECURVE")         # text = "Arc Path"
+            TheRow.operator("mesh.create_circle_path", text=" ", icon="MESH_CIRCLE")         # text = "Circle Path"
+            TheRow.operator("mesh.create_circle_pocket", text=" ", icon="SHADING_SOLID")         # text = "Circle Pocket"
+            TheRow.operator("mesh.create_depthimage", text=" ", icon="IMAGE_DATA")         # text = "DepthImage"
+            TheRow.operator("mesh.create_tenon", text=" ", text_ctxt="test", icon="IMAGE_ZDEPTH")       # text = ""
+            TheRow.operator("mesh.create_parameter", text=" ", icon="OUTLINER_OB_FONT")         # text = ""
 
-    def execute(self, context) :
-        Blender4CNC().EditOps.UnmakeRadius()
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to make a radius edge in edit mode
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class MakeRadius(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.make_radius", "", {"UNDO"}, "Make Radius Segment"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to set the origin to the current selected vertex
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class SetOriginToVertex(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.set_origin_to_vertex", "", {"UNDO"}, "Set Origin to Selected Vertex"
+        def execute(self, context) :
+            Blender4CNC().EditOps.MakeRadius()
+            return {"FINISHED"}
 
-    def execute(self, context):
-        Blender4CNC().EditOps.SetOriginToVertex()
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to unmake a radius edge in edit mode
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class UnMakeRadius(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.unmake_radius", "", {"UNDO"}, "Unmake Radius Segment"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A Class to mark the Start of a Curve
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class SetStartCurve(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.set_start_curve", "", {"UNDO"}, "Set Vertex as Start of Arc"
+        def execute(self, context) :
+            Blender4CNC().EditOps.UnmakeRadius()
+            return {"FINISHED"}
 
-    def execute(self, context):
-        Blender4CNC().EditOps.SetStartCurve(context)
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to set the origin to the current selected vertex
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class SetOriginToVertex(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.set_origin_to_vertex", "", {"UNDO"}, "Set Origin to Selected Vertex"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A Class to mark the End of a Curve
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class SetEndCurve(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.set_end_curve", "", {"UNDO"}, "Set Vertex as End of Arc"
+        def execute(self, context):
+            Blender4CNC().EditOps.SetOriginToVertex()
+            return {"FINISHED"}
 
-    def execute(self, context):
-        Blender4CNC().EditOps.SetEndCurve(context)
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A Class to mark the Start of a Curve
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class SetStartCurve(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.set_start_curve", "", {"UNDO"}, "Set Vertex as Start of Arc"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to mark the center of a curve
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class SetCenterCurve(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.set_center_curve", "", {"UNDO"}, "Set Vertex as Center of Arc"
+        def execute(self, context):
+            Blender4CNC().EditOps.SetStartCurve(context)
+            return {"FINISHED"}
 
-    def execute(self, context):
-        Blender4CNC().EditOps.SetCenterCurve(context)
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A Class to mark the End of a Curve
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class SetEndCurve(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.set_end_curve", "", {"UNDO"}, "Set Vertex as End of Arc"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to create a CW curve (edit mode)
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class CreateShortCurve3Points(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_short_curve", "", {"UNDO"}, "Create CW Curve"
+        def execute(self, context):
+            Blender4CNC().EditOps.SetEndCurve(context)
+            return {"FINISHED"}
 
-    def execute(self, context):
-        Blender4CNC().EditOps.CreateShortCurve3Points(context)
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to mark the center of a curve
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class SetCenterCurve(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.set_center_curve", "", {"UNDO"}, "Set Vertex as Center of Arc"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to create a CCW curve (edit mode)
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class CreateCCWCurve3Points(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.create_ccw_curve", "", {"UNDO"}, "Create CCW Curve"
+        def execute(self, context):
+            Blender4CNC().EditOps.SetCenterCurve(context)
+            return {"FINISHED"}
 
-    def execute(self, context):
-        Blender4CNC().EditOps.CreateCCWCurve3Points(context)        
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to create a CW curve (edit mode)
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class CreateShortCurve3Points(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_short_curve", "", {"UNDO"}, "Create CW Curve"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to create a curve edge (edit mode - start or end of curve)
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class MakeCurve(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.make_curve", "", {"UNDO"}, "Make Curve Segment"
+        def execute(self, context):
+            Blender4CNC().EditOps.CreateShortCurve3Points(context)
+            return {"FINISHED"}
 
-    def execute(self, context) :
-        Blender4CNC().EditOps.MakeCurve()
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to create a CCW curve (edit mode)
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class CreateCCWCurve3Points(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.create_ccw_curve", "", {"UNDO"}, "Create CCW Curve"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to unmake a curve edge (edit mode - start or end of curve)
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class UnMakeCurve(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.unmake_curve", "", {"UNDO"}, "Unmake Curve Segment"
+        def execute(self, context):
+            Blender4CNC().EditOps.CreateCCWCurve3Points(context)        
+            return {"FINISHED"}
 
-    def execute(self, context) :
-        Blender4CNC().EditOps.UnmakeCurve()
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to create a curve edge (edit mode - start or end of curve)
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class MakeCurve(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.make_curve", "", {"UNDO"}, "Make Curve Segment"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to remove curves (merge them down to just their start point)
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class RemoveCurves(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.remove_curves", "", {"UNDO"}, "Reduce Curves to a single point."
+        def execute(self, context) :
+            Blender4CNC().EditOps.MakeCurve()
+            return {"FINISHED"}
 
-    def execute(self, context) :
-        Blender4CNC().EditOps.RemoveCurves(context)
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to unmake a curve edge (edit mode - start or end of curve)
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class UnMakeCurve(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.unmake_curve", "", {"UNDO"}, "Unmake Curve Segment"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to add a point at a distance and angle in edit mode
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class AddAPoint(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.add_a_point", "", {"UNDO"}, "Add a Point"
+        def execute(self, context) :
+            Blender4CNC().EditOps.UnmakeCurve()
+            return {"FINISHED"}
 
-    def execute(self, context):
-        Blender4CNC().EditOps.AddAPoint(context)
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to remove curves (merge them down to just their start point)
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class RemoveCurves(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.remove_curves", "", {"UNDO"}, "Reduce Curves to a single point."
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to make a start point in edit mode
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class MakeStartPoint(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.make_start_point", "", {"UNDO"}, "Make a Start Point"
+        def execute(self, context) :
+            Blender4CNC().EditOps.RemoveCurves(context)
+            return {"FINISHED"}
 
-    def execute(self, context):
-        Blender4CNC().EditOps.MakeStartPoint(1)
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to add a point at a distance and angle in edit mode
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class AddAPoint(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.add_a_point", "", {"UNDO"}, "Add a Point"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to make an up point in edit mode
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class MakeUpPoint(bpy.types.Operator) :
-    bl_idname, bl_label, bl_options, bl_description = "mesh.make_up_point", "", {"UNDO"}, "Make an Up Point"
+        def execute(self, context):
+            Blender4CNC().EditOps.AddAPoint(context)
+            return {"FINISHED"}
 
-    def execute(self, context):
-        Blender4CNC().EditOps.MakeStartPoint(0.9)
-        return {"FINISHED"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to make a start point in edit mode
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class MakeStartPoint(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.make_start_point", "", {"UNDO"}, "Make a Start Point"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class to display the GUI panel for Edit Mode - Add a point at angle, distance, Make Start Point, 
-# Make/Undo Curve, Make/Undo Radius
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class Model2Py2GCodeEdit_PT_Panel(bpy.types.Panel) :
-    bl_idname = 'MODEL2PY2GCODEEDIT_PT_Panel'
-    bl_label = 'GCode'
-    bl_space_type = 'VIEW_3D'
-    bl_region_type = 'UI'
-    bl_category = 'GCODE'
-
-    bl_context = "mesh_edit"
-    bl_label = "Model2Py2GCodeEdit"
-
-    def draw(self, context) :
-        m2p = context.scene.model2py
-        m2p3Point = context.scene.model2py3Point
-        TheCol = self.layout.column(align = True)
-        TheRow = self.layout.row(align = True)
-        TheRow.label(text="", icon = "DRIVER_ROTATIONAL_DIFFERENCE")
-        TheRow.prop(m2p, "angle")
-        TheRow = self.layout.row(align = True)
-        TheRow.label(text="", icon = "DRIVER_DISTANCE")
-        TheRow.prop(m2p, "distance")
-        TheCol = self.layout.column(align = True)
-        TheCol.operator("mesh.add_a_point", icon = "ADD") # text = "Add Point"
-        self.layout.label(text=" ")
-        TheRow = self.layout.row(align = False)
-        TheRow.operator("mesh.make_start_point", text = " ", icon = "TRACKING_REFINE_FORWARDS") # text = "Make Start Point"
-        TheRow.operator("mesh.make_radius", text = " ", icon = "GIZMO") # text = "Make Radius"
-        TheRow.operator("mesh.unmake_radius", text = " ", icon = "PANEL_CLOSE") # text = "UnMake Radius"
-        TheRow.operator("mesh.make_curve", text = " ", icon = "IPO_CIRC") # text = "Make Curve"
-        TheRow.operator("mesh.unmake_curve", text = " ", icon = "IPO_LINEAR") # text = "UnMake Curve"
-        TheRow.operator("mesh.set_origin_to_vertex", text = " ", icon = "EMPTY_AXIS") # text = "Set Origin To Vertex"
-        TheRow = self.layout.row(align = False)
-        TheRow.label(text=" ")
-        TheRow.label(text=" ")
-        TheRow.label(text=" ")
-        TheRow.label(text=" ")
-        TheRow.operator("mesh.remove_curves", text = " ", icon = "HANDLE_AUTO") # text = "Reduce curves to a single point"
-        TheRow.operator("mesh.make_up_point", text = " ", icon = "EMPTY_SINGLE_ARROW") # text = "Make Up Point"
-        self.layout.label(text=" ")
-        TheRow = self.layout.row(align = True)
-        TheRow.operator("mesh.set_start_curve", text = " ", icon = "FRAME_NEXT") # 
-        TheRow.prop(m2p3Point, "startX", text = "")
-        TheRow.prop(m2p3Point, "startY", text = "")
-        TheRow = self.layout.row(align = True)
-        TheRow.operator("mesh.set_end_curve", text = " ", icon = "FF") # 
-        TheRow.prop(m2p3Point, "endX", text = "")
-        TheRow.prop(m2p3Point, "endY", text = "")
-        TheRow = self.layout.row(align = True)
-        TheRow.operator("mesh.set_center_curve", text = " ", icon = "SNAP_MIDPOINT") # 
-        TheRow.prop(m2p3Point, "centerX", text = "")
-        TheRow.prop(m2p3Point, "centerY", text = "")
-        TheRow = self.layout.row(align = False)
-        TheRow.operator("mesh.create_short_curve", text = " ", icon = "TIME") # text = ""
-        TheRow.operator("mesh.create_ccw_curve", text = " ", icon = "RECOVER_LAST") # text = ""
-        TheRow.label(text=" ")
-        TheRow.label(text=" ")
-        TheRow.label(text=" ")
-        TheRow.label(text=" ")
-        TheRow.label(text=" ")
+        def execute(self, context):
+            Blender4CNC().EditOps.MakeStartPoint(1)
+            return {"FINISHED"}
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# Class containing properties to be displayed as GUI when in Edit mode for adding a point at angle and dist.
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class Model2PySettings(PropertyGroup):
-    angle: FloatProperty(name="Angle", description = "", default=0, min=0, max=360, step=1, precision=3)
-    distance: FloatProperty(name="Distance", description = "", default=0, min=0, max=1000, step=1, precision=3)
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to make an up point in edit mode
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class MakeUpPoint(bpy.types.Operator) :
+        bl_idname, bl_label, bl_options, bl_description = "mesh.make_up_point", "", {"UNDO"}, "Make an Up Point"
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# Class containing properties to be displayed as GUI when in Edit mode for creating a curve from 3 points
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class Model2PySettings3Point(PropertyGroup):
-    startX: FloatProperty(name="StartX", description = "", default=0, step=1, precision=3)
-    startY: FloatProperty(name="StartY", description = "", default=0, step=1, precision=3)
-    endX: FloatProperty(name="EndX", description = "", default=0, step=1, precision=3)
-    endY: FloatProperty(name="EndY", description = "", default=0, step=1, precision=3)
-    centerX: FloatProperty(name="CenterX", description = "", default=0, step=1, precision=3)
-    centerY: FloatProperty(name="CenterY", description = "", default=0, step=1, precision=3)
+        def execute(self, context):
+            Blender4CNC().EditOps.MakeStartPoint(0.9)
+            return {"FINISHED"}
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# Class containing properties to be displayed as GUI when in object mode for the Functions: 
-# "Create Path Right", "Create Path Left", "Expand Shape", and "Shrink Shape"
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class Model2PySettingsObjectMode(PropertyGroup):
-    distance: FloatProperty(name="Path Distance:", description = "Path Distance", default=0.25, min=0, max=1000, step=0.05, precision=3)
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class to display the GUI panel for Edit Mode - Add a point at angle, distance, Make Start Point, 
+    # Make/Undo Curve, Make/Undo Radius
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class Model2Py2GCodeEdit_PT_Panel(bpy.types.Panel) :
+        bl_idname = 'MODEL2PY2GCODEEDIT_PT_Panel'
+        bl_label = 'GCode'
+        bl_space_type = 'VIEW_3D'
+        bl_region_type = 'UI'
+        bl_category = 'GCODE'
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class for calling out to ImageMagick (MagickStr is only used during testing)
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class ImageMagick:
+        bl_context = "mesh_edit"
+        bl_label = "Model2Py2GCodeEdit"
 
-    #**************************************************************************
-    # Convert a command line string into a list suitable for subprocess
-    #**************************************************************************
-    def MagickStr(self, s):
-        subprocess.call(["magick"] + shlex.split(s))
+        def draw(self, context) :
+            m2p = context.scene.model2py
+            m2p3Point = context.scene.model2py3Point
+            TheCol = self.layout.column(align = True)
+            TheRow = self.layout.row(align = True)
+            TheRow.label(text="", icon = "DRIVER_ROTATIONAL_DIFFERENCE")
+            TheRow.prop(m2p, "angle")
+            TheRow = self.layout.row(align = True)
+            TheRow.label(text="", icon = "DRIVER_DISTANCE")
+            TheRow.prop(m2p, "distance")
+            TheCol = self.layout.column(align = True)
+            TheCol.operator("mesh.add_a_point", icon = "ADD") # text = "Add Point"
+            self.layout.label(text=" ")
+            TheRow = self.layout.row(align = False)
+            TheRow.operator("mesh.make_start_point", text = " ", icon = "TRACKING_REFINE_FORWARDS") # text = "Make Start Point"
+            TheRow.operator("mesh.make_radius", text = " ", icon = "GIZMO") # text = "Make Radius"
+            TheRow.operator("mesh.unmake_radius", text = " ", icon = "PANEL_CLOSE") # text = "UnMake Radius"
+            TheRow.operator("mesh.make_curve", text = " ", icon = "IPO_CIRC") # text = "Make Curve"
+            TheRow.operator("mesh.unmake_curve", text = " ", icon = "IPO_LINEAR") # text = "UnMake Curve"
+            TheRow.operator("mesh.set_origin_to_vertex", text = " ", icon = "EMPTY_AXIS") # text = "Set Origin To Vertex"
+            TheRow = self.layout.row(align = False)
+            TheRow.label(text=" ")
+            TheRow.label(text=" ")
+            TheRow.label(text=" ")
+            TheRow.label(text=" ")
+            TheRow.operator("mesh.remove_curves", text = " ", icon = "HANDLE_AUTO") # text = "Reduce curves to a single point"
+            TheRow.operator("mesh.make_up_point", text = " ", icon = "EMPTY_SINGLE_ARROW") # text = "Make Up Point"
+            self.layout.label(text=" ")
+            TheRow = self.layout.row(align = True)
+            TheRow.operator("mesh.set_start_curve", text = " ", icon = "FRAME_NEXT") # 
+            TheRow.prop(m2p3Point, "startX", text = "")
+            TheRow.prop(m2p3Point, "startY", text = "")
+            TheRow = self.layout.row(align = True)
+            TheRow.operator("mesh.set_end_curve", text = " ", icon = "FF") # 
+            TheRow.prop(m2p3Point, "endX", text = "")
+            TheRow.prop(m2p3Point, "endY", text = "")
+            TheRow = self.layout.row(align = True)
+            TheRow.operator("mesh.set_center_curve", text = " ", icon = "SNAP_MIDPOINT") # 
+            TheRow.prop(m2p3Point, "centerX", text = "")
+            TheRow.prop(m2p3Point, "centerY", text = "")
+            TheRow = self.layout.row(align = False)
+            TheRow.operator("mesh.create_short_curve", text = " ", icon = "TIME") # text = ""
+            TheRow.operator("mesh.create_ccw_curve", text = " ", icon = "RECOVER_LAST") # text = ""
+            TheRow.label(text=" ")
+            TheRow.label(text=" ")
+            TheRow.label(text=" ")
+            TheRow.label(text=" ")
+            TheRow.label(text=" ")
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class for creating the GUI panel for a depth panel (not used)
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class Im2GCodeOp(bpy.types.Operator) :
-    bl_idname = "mesh.process_image"
-    bl_label = "Process Image"
-    bl_options = {"REGISTER", "UNDO"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # Class containing properties to be displayed as GUI when in Edit mode for adding a point at angle and dist.
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class Model2PySettings(PropertyGroup):
+        angle: FloatProperty(name="Angle", description = "", default=0, min=0, max=360, step=1, precision=3)
+        distance: FloatProperty(name="Distance", description = "", default=0, min=0, max=1000, step=1, precision=3)
 
-    def __init__(self):
-        pass
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # Class containing properties to be displayed as GUI when in Edit mode for creating a curve from 3 points
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class Model2PySettings3Point(PropertyGroup):
+        startX: FloatProperty(name="StartX", description = "", default=0, step=1, precision=3)
+        startY: FloatProperty(name="StartY", description = "", default=0, step=1, precision=3)
+        endX: FloatProperty(name="EndX", description = "", default=0, step=1, precision=3)
+        endY: FloatProperty(name="EndY", description = "", default=0, step=1, precision=3)
+        centerX: FloatProperty(name="CenterX", description = "", default=0, step=1, precision=3)
+        centerY: FloatProperty(name="CenterY", description = "", default=0, step=1, precision=3)
 
-    #*************************************************************************
-    # This function gets called when the user clicks the "Process Image" 
-    # button.
-    #*************************************************************************
-    def execute(self, context) :
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # Class containing properties to be displayed as GUI when in object mode for the Functions: 
+    # "Create Path Right", "Create Path Left", "Expand Shape", and "Shrink Shape"
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class Model2PySettingsObjectMode(PropertyGroup):
+        distance: FloatProperty(name="Path Distance:", description = "Path Distance", default=0.25, min=0, max=1000, step=0.05, precision=3)
+
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class for creating the GUI panel for a depth panel (not used)
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class Im2GCodeOp(bpy.types.Operator) :
+        bl_idname = "mesh.process_image"
+        bl_label = "Process Image"
+        bl_options = {"REGISTER", "UNDO"}
 
-        # Get the GUI parameters
-        i2g = context.scene.im2gcode
-        self.i2g = context.scene.im2gcode
+        def __init__(self):
+            pass
+
+        #*************************************************************************
+        # This function gets called when the user clicks the "Process Image" 
+        # button.
+        #*************************************************************************
+        def execute(self, context) :
+
+            # Get the GUI parameters
+            i2g = context.scene.im2gcode
+            self.i2g = context.scene.im2gcode
         
-        # Check the parameters make sense
-        print("Checking Parameters")
-        if not os.path.isfile(i2g.file_name):
-            self.report({'ERROR'}, "Cannot find image file: %s." % i2g.file_name)
-            return {"CANCELLED"}
-        if (i2g.final_dia >= i2g.rough_dia):
-            self.report({'ERROR'}, "Final bit diameter must be <= rough bit diameter.")
-            return {"CANCELLED"}
-        if (i2g.carve_dia >= i2g.final_dia):
-            self.report({'ERROR'}, "Carve bit diameter must be <= final bit diameter.")
-            return {"CANCELLED"}
-        if (i2g.zstep <= i2g.max_depth):
-            self.report({'ERROR'}, "ZStep must be smaller than Max Depth.")
-            return {"CANCELLED"}
-
-        # The y step must be an integer fraction of the final diameter
-        mult = i2g.final_dia / i2g.ystep;
-        mult = mult % 1
-        if (mult > 0.0001):
-            self.report({'ERROR'}, "YStep must be integer fraction of final bit diameter (sorry).")
-            return {"CANCELLED"}
-
-        # If doing a lamination, the total layers must exceed the max depth
-        # and the max depth must fall within the last layer
-        if i2g.number_layers > 1:
-            total = i2g.laminate_thickness * i2g.number_layers
-            if total < (-i2g.max_depth):
-                self.report({'ERROR'}, "Max Depth exceeds total laminate thickness.")
+            # Check the parameters make sense
+            print("Checking Parameters")
+            if not os.path.isfile(i2g.file_name):
+                self.report({'ERROR'}, "Cannot find image file: %s." % i2g.file_name)
                 return {"CANCELLED"}
-            total = -i2g.laminate_thickness * (i2g.number_layers-1)
-            if total < (i2g.max_depth):
-                self.report({'ERROR'}, "Max Depth does not cut all laminate layers.")
+            if (i2g.final_dia >= i2g.rough_dia):
+                self.report({'ERROR'}, "Final bit diameter must be <= rough bit diameter.")
                 return {"CANCELLED"}
+            if (i2g.carve_dia >= i2g.final_dia):
+                self.report({'ERROR'}, "Carve bit diameter must be <= final bit diameter.")
+                return {"CANCELLED"}
+            if (i2g.zstep <= i2g.max_depth):
+                self.report({'ERROR'}, "ZStep must be smaller than Max Depth.")
+                return {"CANCELLED"}
+
+            # The y step must be an integer fraction of the final diameter
+            mult = i2g.final_dia / i2g.ystep;
+            mult = mult % 1
+            if (mult > 0.0001):
+                self.report({'ERROR'}, "YStep must be integer fraction of final bit diameter (sorry).")
+                return {"CANCELLED"}
+
+            # If doing a lamination, the total layers must exceed the max depth
+            # and the max depth must fall within the last layer
+            if i2g.number_layers > 1:
+                total = i2g.laminate_thickness * i2g.number_layers
+                if total < (-i2g.max_depth):
+                    self.report({'ERROR'}, "Max Depth exceeds total laminate thickness.")
+                    return {"CANCELLED"}
+                total = -i2g.laminate_thickness * (i2g.number_layers-1)
+                if total < (i2g.max_depth):
+                    self.report({'ERROR'}, "Max Depth does not cut all laminate layers.")
+                    return {"CANCELLED"}
         
-        image2GCode = Im2GCode()
-        image2GCode.Go_Image2GCode()
-        return {"FINISHED"}
+            image2GCode = Im2GCode()
+            image2GCode.Go_Image2GCode()
+            return {"FINISHED"}
  
-##++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-##++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-## Structure class to hold current position and entrance direction when tracing blobs in images
-##++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-##++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#class Blender4CNC.MyPix:
-
-#    def __init__(self, x2, y2, dx2, dy2):
-#        self.x = int(x2)
-#        self.y = int(y2)
-#        self.dx = int(dx2)
-#        self.dy = int(dy2)
-
-#    def __repr__(self):
-#        return "(" + str(self.x) + ", " + str(self.y) + ", " + str(self.dx) + ", " + str(self.dy) + ")"
-
-#    def IsLocationEqual(self, p):
-#        return ((self.x == p.x) and (self.y == p.y))
-
-#    def IsDirectionEqual(self, p):
-#        return ((self.dx == p.dx) and (self.dy == p.dy))
-
-#    def ToString(self):
-#     return "%d,%d,%d,%d" % (self.x,self.y,self.dx,self.dy)
-
-#    def InsideArea(self, xMin, xMax, yMin, yMax):
-#        return ((self.x >= xMin) and (self.x <= xMax) and (self.y >= yMin) and (self.y <= yMax))
-
-#    def MoveInDirection(self):
-#        self.x += int(self.dx)
-#        self.y += int(self.dy)
-
-#    def Rotate180(self):
-#        self.dy = int(-self.dy)
-#        self.dx = int(-self.dx)
-
-#    # Rotating cw by 90 Matrix
-#    #  0, 1
-#    # -1, 0
-#    # New x = old y, New y = -old x
-#    def Rotate90CW(self):
-#        t = int(self.dy)
-#        self.dy = int(-self.dx)
-#        self.dx = int(t)
+    ##++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    ##++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    ## Structure class to hold current position and entrance direction when tracing blobs in images
+    ##++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    ##++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #class Blender4CNC.MyPix:
+
+    #    def __init__(self, x2, y2, dx2, dy2):
+    #        self.x = int(x2)
+    #        self.y = int(y2)
+    #        self.dx = int(dx2)
+    #        self.dy = int(dy2)
+
+    #    def __repr__(self):
+    #        return "(" + str(self.x) + ", " + str(self.y) + ", " + str(self.dx) + ", " + str(self.dy) + ")"
+
+    #    def IsLocationEqual(self, p):
+    #        return ((self.x == p.x) and (self.y == p.y))
+
+    #    def IsDirectionEqual(self, p):
+    #        return ((self.dx == p.dx) and (self.dy == p.dy))
+
+    #    def ToString(self):
+    #     return "%d,%d,%d,%d" % (self.x,self.y,self.dx,self.dy)
+
+    #    def InsideArea(self, xMin, xMax, yMin, yMax):
+    #        return ((self.x >= xMin) and (self.x <= xMax) and (self.y >= yMin) and (self.y <= yMax))
+
+    #    def MoveInDirection(self):
+    #        self.x += int(self.dx)
+    #        self.y += int(self.dy)
+
+    #    def Rotate180(self):
+    #        self.dy = int(-self.dy)
+    #        self.dx = int(-self.dx)
+
+    #    # Rotating cw by 90 Matrix
+    #    #  0, 1
+    #    # -1, 0
+    #    # New x = old y, New y = -old x
+    #    def Rotate90CW(self):
+    #        t = int(self.dy)
+    #        self.dy = int(-self.dx)
+    #        self.dx = int(t)
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# A class that can parse a GCode file and create a curve object representing the tool path
-# Called when the user presses the "Load G Code" button on the UI interface.
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class LoadGCodeOp(bpy.types.Operator) :
-    bl_idname = "mesh.load_gcode"
-    bl_label = "Load GCode"
-    bl_options = {"REGISTER", "UNDO"}
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # A class that can parse a GCode file and create a curve object representing the tool path
+    # Called when the user presses the "Load G Code" button on the UI interface.
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class LoadGCodeOp(bpy.types.Operator) :
+        bl_idname = "mesh.load_gcode"
+        bl_label = "Load GCode"
+        bl_options = {"REGISTER", "UNDO"}
 
-    def __init__(self):
-        pass
+        def __init__(self):
+            pass
 
-    #*************************************************************************
-    # This function gets called when the user clicks the "Load GCode" 
-    # button.
-    #*************************************************************************
-    def execute(self, context) :
-        lg = context.scene.loadgcode
-        Blender4CNC().LoadGCodeFile(lg.file_name)        
-        return {"FINISHED"}
+        #*************************************************************************
+        # This function gets called when the user clicks the "Load GCode" 
+        # button.
+        #*************************************************************************
+        def execute(self, context) :
+            lg = context.scene.loadgcode
+            Blender4CNC().LoadGCodeFile(lg.file_name)        
+            return {"FINISHED"}
  
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# Class to display the Load GCode UI Panel
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class LoadGCode_PT_Panel(bpy.types.Panel):
-    bl_idname = 'LOADGCODE_PT_Panel'
-    bl_label = 'GCode'
-    bl_space_type = 'VIEW_3D'
-    bl_region_type = 'UI'
-    bl_category = 'GCODE'
-    bl_context = "objectmode"
-    bl_label = "LoadGCode"
-
-    def draw(self, context):
-        lg = context.scene.loadgcode
-        TheCol = self.layout.column(align = True)
-        row = TheCol.row(align=True)
-        row.prop(lg, 'file_name', text="")
-        TheCol.operator("mesh.load_gcode", text = "Load GCode")
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # Class to display the Load GCode UI Panel
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class LoadGCode_PT_Panel(bpy.types.Panel):
+        bl_idname = 'LOADGCODE_PT_Panel'
+        bl_label = 'GCode'
+        bl_space_type = 'VIEW_3D'
+        bl_region_type = 'UI'
+        bl_category = 'GCODE'
+        bl_context = "objectmode"
+        bl_label = "LoadGCode"
+
+        def draw(self, context):
+            lg = context.scene.loadgcode
+            TheCol = self.layout.column(align = True)
+            row = TheCol.row(align=True)
+            row.prop(lg, 'file_name', text="")
+            TheCol.operator("mesh.load_gcode", text = "Load GCode")
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# Class containing properties to be displayed as GUI to user for "Load G Code"
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class LoadGCodeSettings(PropertyGroup):
-    file_name: StringProperty(name = "File Name", description = "GCode file", subtype="FILE_PATH")
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # Class containing properties to be displayed as GUI to user for "Load G Code"
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class LoadGCodeSettings(PropertyGroup):
+        file_name: StringProperty(name = "File Name", description = "GCode file", subtype="FILE_PATH")
 
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# Preferences for the Blender4CNC Addon (Not Used)
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-class LoadGCodePreferences(bpy.types.AddonPreferences):
-    bl_idname = __name__
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # Preferences for the Blender4CNC Addon (Not Used)
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    class LoadGCodePreferences(bpy.types.AddonPreferences):
+        bl_idname = __name__
  
-    rs274Path: StringProperty(name = "RS274 Path", description = "Path to rs274 executable", subtype="FILE_PATH")
+        rs274Path: StringProperty(name = "RS274 Path", description = "Path to rs274 executable", subtype="FILE_PATH")
  
-    def draw(self, context):
-        layout = self.layout
-        row = layout.row()
-        row.prop(self, 'rs274Path', expand=True)
+        def draw(self, context):
+            layout = self.layout
+            row = layout.row()
+            row.prop(self, 'rs274Path', expand=True)
  
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# Registering the Blender4CNC Addon
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-#++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-classes = (
-    # Panels - 2 for object mode, 1 for edit mode
-    LoadGCode_PT_Panel,
-    Model2Py2GCode_PT_Panel,
-    Model2Py2GCodeEdit_PT_Panel,
-
-    # Preferences for the Addon (not used)
-    LoadGCodePreferences,
-
-    # The property that holds the GCode file string to load
-    LoadGCodeSettings,
-    # The class that can load a GCode file
-    LoadGCodeOp,
-
-    # Properties for the Blender4CNC functions
-    Model2PySettings,
-    Model2PySettings3Point,
-    Model2PySettingsObjectMode,
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # Registering the Blender4CNC Addon
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    classes = (
+        # Panels - 2 for object mode, 1 for edit mode
+        LoadGCode_PT_Panel,
+        Model2Py2GCode_PT_Panel,
+        Model2Py2GCodeEdit_PT_Panel,
+
+        # Preferences for the Addon (not used)
+        LoadGCodePreferences,
+
+        # The property that holds the GCode file string to load
+        LoadGCodeSettings,
+        # The class that can load a GCode file
+        LoadGCodeOp,
+
+        # Properties for the Blender4CNC functions
+        Model2PySettings,
+        Model2PySettings3Point,
+        Model2PySettingsObjectMode,
     
-    # Object mode buttons
-    CleanMesh, CheckMesh,
-    CreateRightPath, CreateLeftPath, ExpandShape, ShrinkShape,
-    CreatePocket, CreateCCWPocket, CreateClosedPath, CreateOpenPath, CreateHole, CreateDrillPath, 
-    CreateArcPath, CreateCirclePath, CreateCirclePocket, CreateDepthImage, CreateTenon, CreateParameter,
-    ProcessPaths,
-    JustProduceGCode,
-
-    # Edit mode buttons
-    AddAPoint, MakeStartPoint, MakeRadius, UnMakeRadius, MakeCurve, UnMakeCurve, SetOriginToVertex, 
-    RemoveCurves, MakeUpPoint,
-    CreateShortCurve3Points, SetStartCurve, SetEndCurve, SetCenterCurve, CreateCCWCurve3Points, 
-
-    Im2GCodeOp,
-)
-
-def register():
-    from bpy.utils import register_class
-    for cls in classes:
-        register_class(cls)
-    bpy.types.Scene.loadgcode = PointerProperty(type=LoadGCodeSettings)
-    bpy.types.Scene.model2py = PointerProperty(type=Model2PySettings)
-    bpy.types.Scene.model2py3Point = PointerProperty(type=Model2PySettings3Point)
-    bpy.types.Scene.model2pyObject = PointerProperty(type=Model2PySettingsObjectMode)
-
-def unregister():
-    from bpy.utils import unregister_class
-    for cls in reversed(classes):
-        unregister_class(cls)
-    del bpy.types.Scene.loadgcode
-    del bpy.types.Scene.model2py
-    del bpy.types.Scene.model2py3Point
-    del bpy.types.Scene.model2pyObject
-    del bpy.types.Scene.im2gcode
-
-if __name__ == '__main__':
-    register()
-
+        # Object mode buttons
+        CleanMesh, CheckMesh,
+        CreateRightPath, CreateLeftPath, ExpandShape, ShrinkShape,
+        CreatePocket, CreateCCWPocket, CreateClosedPath, CreateOpenPath, CreateHole, CreateDrillPath, 
+        CreateArcPath, CreateCirclePath, CreateCirclePocket, CreateDepthImage, CreateTenon, CreateParameter,
+        ProcessPaths,
+        JustProduceGCode,
+
+        # Edit mode buttons
+        AddAPoint, MakeStartPoint, MakeRadius, UnMakeRadius, MakeCurve, UnMakeCurve, SetOriginToVertex, 
+        RemoveCurves, MakeUpPoint,
+        CreateShortCurve3Points, SetStartCurve, SetEndCurve, SetCenterCurve, CreateCCWCurve3Points, 
+
+        Im2GCodeOp,
+    )
+
+    def register():
+        from bpy.utils import register_class
+        for cls in classes:
+            register_class(cls)
+        bpy.types.Scene.loadgcode = PointerProperty(type=LoadGCodeSettings)
+        bpy.types.Scene.model2py = PointerProperty(type=Model2PySettings)
+        bpy.types.Scene.model2py3Point = PointerProperty(type=Model2PySettings3Point)
+        bpy.types.Scene.model2pyObject = PointerProperty(type=Model2PySettingsObjectMode)
+
+    def unregister():
+        from bpy.utils import unregister_class
+        for cls in reversed(classes):
+            unregister_class(cls)
+        del bpy.types.Scene.loadgcode
+        del bpy.types.Scene.model2py
+        del bpy.types.Scene.model2py3Point
+        del bpy.types.Scene.model2pyObject
+        del bpy.types.Scene.im2gcode
+
+    if __name__ == '__main__':
+        register()
@@ -0,0 +1,262 @@
+# Blender4CNC - Design 3-axis CNC projects in Blender and produce G-Code.
+# Copyright (C) 2023  David Dommett
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#*******************************************************************
+# Microbenchmarks for the geometry core (Polytoxogon)
+#
+# Runs in plain Python (numpy, scipy and scikit-image are needed but
+# Blender is not). Synthetic shapes are generated at a range of sizes
+# (number of segments) and each operation is timed, and its peak memory
+# measured, at each size. The results are written as JSON so that runs
+# can be compared to catch regressions, e.g.
+#
+# python3 Blender4CNC_Benchmark.py --output bench.json
+# python3 Blender4CNC_Benchmark.py --sizes 10,100,1000 --ops Shrink,Add --shapes star
+#
+# Shapes:
+#   star     - a star with random spikes
+#   arcs     - a "scalloped" circle made only of arcs
+#   sawtooth - a rectangle with a sawtooth top edge
+#   islands  - a square with a checkerboard of square islands inside that
+#              touch at their corners
+#*******************************************************************
+
+import argparse
+import importlib
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+#*******************************************************************
+# Import Blender4CNC from the same directory (outside Blender only the
+# Blender4CNC class is defined, which has the geometry core)
+#*******************************************************************
+def ImportBlender4CNC():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    return importlib.import_module("Blender4CNC").Blender4CNC
+
+#*******************************************************************
+# Shapes
+# Each returns a list of clockwise loops of points with about n segments
+# in total (the first loop is the main shape)
+#*******************************************************************
+RADIUS = 0.05
+
+def Star(n, rnd):
+    n = max(n, 3)
+    pts = []
+    for i in range(0, n):
+        a = -2 * math.pi * i / n
+        r = RADIUS * rnd.uniform(0.5, 1)
+        pts.append((r * math.cos(a), r * math.sin(a)))
+    return [pts]
+
+def Arcs(n, rnd):
+    n = max(n, 3)
+    corners = [(RADIUS * math.cos(-2 * math.pi * i / n), RADIUS * math.sin(-2 * math.pi * i / n)) for i in range(0, n)]
+    pts = []
+    for i in range(0, n):
+        (x0, y0) = corners[i-1]
+        (x1, y1) = corners[i]
+        # The center is half way between the origin and the middle of the
+        # chord so each arc bulges out
+        (cx, cy) = ((x0 + x1) / 4, (y0 + y1) / 4)
+        pts.append((x1, y1, cx, cy, 1))
+    return [pts]
+
+def Sawtooth(n, rnd):
+    (width, height, toothHeight) = (2 * RADIUS, RADIUS, RADIUS / 10)
+    teeth = max((n - 3) // 2, 1)
+    toothWidth = width / teeth
+    pts = [(0, 0), (0, height)]
+    for i in range(0, teeth):
+        pts.append(((i + 0.5) * toothWidth, height + toothHeight))
+        pts.append(((i + 1) * toothWidth, height))
+    pts.append((width, 0))
+    return [pts]
+
+def Islands(n, rnd):
+    numIslands = max((n - 4) // 4, 1)
+    cells = math.ceil(math.sqrt(2 * numIslands))
+    size = RADIUS / (cells + 2)
+    loops = [[(0, 0), (0, RADIUS), (RADIUS, RADIUS), (RADIUS, 0)]]
+    for i in range(0, cells):
+        for j in range(0, cells):
+            if ((i + j) % 2 == 0) and (len(loops) <= numIslands):
+                (x, y) = ((i + 1) * size, (j + 1) * size)
+                loops.append([(x, y), (x, y + size), (x + size, y + size), (x + size, y)])
+    return loops
+
+SHAPES = {"star" : Star, "arcs" : Arcs, "sawtooth" : Sawtooth, "islands" : Islands}
+
+#*******************************************************************
+# Operations
+# Each is given the Polytoxogon class and the loops of a shape and does
+# any setup, then returns a function that does the work to be timed
+#*******************************************************************
+DISTANCE = RADIUS / 50
+
+def MovePoint(p, dx, dy):
+    if len(p) == 2:
+        return (p[0] + dx, p[1] + dy)
+    return (p[0] + dx, p[1] + dy, p[2] + dx, p[3] + dy, p[4])
+
+def MovePoints(points, dx, dy):
+    return [MovePoint(p, dx, dy) for p in points]
+
+# The main poly and the polys to combine with it (the islands, or else a
+# moved copy of the main poly)
+def GetPairs(Poly, loops):
+    main = Poly(loops[0])
+    if len(loops) > 1:
+        others = [Poly(loop) for loop in loops[1:]]
+    else:
+        others = [Poly(MovePoints(loops[0], RADIUS * 0.3, RADIUS * 0.2))]
+    return [(main, other) for other in others]
+
+def OpShrink(Poly, loops):
+    polys = [Poly(loop) for loop in loops]
+    return lambda: [poly.Shrink(DISTANCE) for poly in polys]
+
+def OpExpand(Poly, loops):
+    polys = [Poly(loop) for loop in loops]
+    return lambda: [poly.Expand(None, DISTANCE) for poly in polys]
+
+def OpAdd(Poly, loops):
+    pairs = GetPairs(Poly, loops)
+    return lambda: [poly1.Add(poly2) for (poly1, poly2) in pairs]
+
+def OpSubtract(Poly, loops):
+    pairs = GetPairs(Poly, loops)
+    return lambda: [poly1.Subtract(poly2) for (poly1, poly2) in pairs]
+
+def OpSameInsideOutside(Poly, loops):
+    pairs = GetPairs(Poly, loops)
+    return lambda: [poly1.SameInsideOutside(poly2) for (poly1, poly2) in pairs]
+
+def OpIsPointInside(Poly, loops, numPoints=100):
+    polys = [Poly(loop) for loop in loops]
+    rnd = random.Random(1)
+    points = [(rnd.uniform(-RADIUS, RADIUS), rnd.uniform(-RADIUS, RADIUS)) for i in range(0, numPoints)]
+    return lambda: [[poly.IsPointInside(p) for p in points] for poly in polys]
+
+# The islands touch each other at their corners, any other shape is
+# joined to a copy of itself moved so the two share a single point
+def OpJoinMultipleTouchingPolys(Poly, loops):
+    if len(loops) > 1:
+        polys = [Poly(loop) for loop in loops[1:]]
+    else:
+        pts = loops[0]
+        sums = [p[0] + p[1] for p in pts]
+        high = pts[sums.index(max(sums))]
+        low = pts[sums.index(min(sums))]
+        polys = [Poly(pts), Poly(MovePoints(pts, high[0] - low[0], high[1] - low[1]))]
+    return lambda: polys[0].JoinMultipleTouchingPolys(polys)
+
+OPS = {"Shrink" : OpShrink, "Expand" : OpExpand, "Add" : OpAdd, "Subtract" : OpSubtract,
+       "SameInsideOutside" : OpSameInsideOutside, "IsPointInside" : OpIsPointInside,
+       "JoinMultipleTouchingPolys" : OpJoinMultipleTouchingPolys}
+
+#*******************************************************************
+# Time an operation (the best of a number of runs, each with a fresh
+# setup) and measure its peak memory in a separate run (tracing memory
+# slows the code down)
+#*******************************************************************
+def RunOne(Poly, op, loops, repeat):
+    times = []
+    for i in range(0, repeat):
+        f = op(Poly, loops)
+        startTime = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - startTime)
+    f = op(Poly, loops)
+    tracemalloc.start()
+    try:
+        f()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return (min(times), peak)
+
+#*******************************************************************
+# Run every operation on every shape at every size
+# Once an operation on a shape takes longer than budget seconds, the
+# larger sizes are skipped
+#*******************************************************************
+def RunBenchmarks(Poly, sizes, opNames, shapeNames, repeat=3, budget=60, log=None):
+    results = []
+    for shapeName in shapeNames:
+        for opName in opNames:
+            skip = False
+            for size in sizes:
+                loops = SHAPES[shapeName](size, random.Random(size))
+                segments = sum([len(Poly(loop).lines) for loop in loops])
+                result = {"shape" : shapeName, "op" : opName, "size" : size, "segments" : segments}
+                if skip:
+                    result["skipped"] = True
+                else:
+                    try:
+                        (seconds, peak) = RunOne(Poly, OPS[opName], loops, repeat)
+                        result["seconds"] = seconds
+                        result["peakBytes"] = peak
+                        skip = seconds > budget
+                    except Exception as err:
+                        result["error"] = repr(err)
+                if log != None:
+                    log.write(json.dumps(result) + "\n")
+                    log.flush()
+                results.append(result)
+    return results
+
+def Main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the Blender4CNC geometry core")
+    parser.add_argument("--sizes", default="10,30,100,300,1000,3000,10000", help="comma separated numbers of segments")
+    parser.add_argument("--ops", default=",".join(OPS.keys()), help="comma separated operations")
+    parser.add_argument("--shapes", default=",".join(SHAPES.keys()), help="comma separated shapes")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs (the best is reported)")
+    parser.add_argument("--budget", type=float, default=60, help="skip larger sizes after a run takes this many seconds")
+    parser.add_argument("--output", default=None, help="JSON file to write (default is stdout)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(x) for x in args.sizes.split(",")]
+    opNames = args.ops.split(",")
+    shapeNames = args.shapes.split(",")
+    for name in opNames:
+        if name not in OPS:
+            parser.error("unknown operation " + name)
+    for name in shapeNames:
+        if name not in SHAPES:
+            parser.error("unknown shape " + name)
+
+    Blender4CNC = ImportBlender4CNC()
+    import numpy
+    results = RunBenchmarks(Blender4CNC.Polytoxogon, sizes, opNames, shapeNames, args.repeat, args.budget, sys.stderr)
+    report = {"python" : platform.python_version(), "numpy" : numpy.__version__, "platform" : platform.platform(),
+              "repeat" : args.repeat, "results" : results}
+    if args.output == None:
+        json.dump(report, sys.stdout, indent=1)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+
+if __name__ == "__main__":
+    Main(sys.argv[1:])
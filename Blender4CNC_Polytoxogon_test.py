@@ -0,0 +1,315 @@
+# Blender4CNC - Design 3-axis CNC projects in Blender and produce G-Code.
+# Copyright (C) 2023  David Dommett
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#*******************************************************************
+# Regression tests of the geometry core (Polytoxogon) and the pocket
+# code that uses it
+#
+# Runs in plain Python (numpy, scipy and scikit-image are needed but
+# Blender is not), e.g.
+#
+# python3 Blender4CNC_Polytoxogon_test.py
+# python3 -m pytest Blender4CNC_Polytoxogon_test.py
+#*******************************************************************
+
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Blender4CNC import Blender4CNC
+
+Poly = Blender4CNC.Polytoxogon
+
+#*******************************************************************
+# The exact signed area of a list of points (CCW is positive)
+#*******************************************************************
+def SignedArea(points):
+    area = 0
+    for i in range(0, len(points)):
+        (p0, p1) = (points[i-1], points[i])
+        area += (p0[0] * p1[1] - p1[0] * p0[1]) / 2
+        if len(p1) > 2:
+            (cx, cy, cw) = (p1[2], p1[3], p1[4])
+            a0 = math.atan2(p0[1] - cy, p0[0] - cx)
+            a1 = math.atan2(p1[1] - cy, p1[0] - cx)
+            if cw == 1:
+                theta = -((a0 - a1) % (2 * math.pi))
+            else:
+                theta = (a1 - a0) % (2 * math.pi)
+            r = math.hypot(p0[0] - cx, p0[1] - cy)
+            area += r * r * (theta - math.sin(theta)) / 2
+    return area
+
+#*******************************************************************
+# The area of the result of Add/Subtract ([[poly, tenons], ...])
+#*******************************************************************
+def ResultArea(result):
+    area = 0
+    for (poly, tenons) in result:
+        if poly == None:
+            continue
+        area += abs(SignedArea(poly.points))
+        for tenon in tenons:
+            area -= abs(SignedArea(tenon.points))
+    return area
+
+def Circle(r=10):
+    return Poly([(r,0,0,0,1), (-r,0,0,0,1)])
+
+# A rectangle with a half circle on the left end
+def Slot():
+    return Poly([(0,0), (0,10,0,5,1), (20,10), (20,0)])
+
+# Rotate points (and curve centers) counter-clockwise about the origin
+def Rotate(points, angle):
+    (c, s) = (math.cos(angle), math.sin(angle))
+    rotated = []
+    for p in points:
+        q = (p[0] * c - p[1] * s, p[0] * s + p[1] * c)
+        if len(p) > 2:
+            q += (p[2] * c - p[3] * s, p[2] * s + p[3] * c, p[4])
+        rotated.append(q)
+    return rotated
+
+class TestPolytoxogon(unittest.TestCase):
+
+    #****************************************************************
+    # Points on the chord of a curve (e.g. the center of a circle)
+    #****************************************************************
+    def test_CircleCenterAndDiameter(self):
+        circles = [Circle(), Poly([(0,10,0,0,1), (0,-10,0,0,1)]), Poly([(10,0,0,0,-1), (-10,0,0,0,-1)])]
+        points = [(0,0), (5,0), (-3,0), (9.99,0), (-9.99,0), (0,5), (0,-9.99), (3,4), (0,1e-9), (1e-9,0)]
+        for circle in circles:
+            for p in points:
+                with self.subTest(circle=circle.points, p=p):
+                    self.assertTrue(circle.IsPointInside(p))
+            for p in [(10.01,0), (-10.01,0), (0,10.01), (8,8)]:
+                with self.subTest(circle=circle.points, p=p):
+                    self.assertFalse(circle.IsPointInside(p))
+            inside = circle.ArePointsInside(points)
+            self.assertTrue(inside.all())
+
+    def test_SlotChord(self):
+        slot = Slot()
+        for p in [(0,5), (0,0.01), (0,9.99), (-4.99,5), (10,5)]:
+            with self.subTest(p=p):
+                self.assertTrue(slot.IsPointInside(p))
+        for p in [(-5.01,5), (-4,1), (0,10.01), (20.01,5)]:
+            with self.subTest(p=p):
+                self.assertFalse(slot.IsPointInside(p))
+
+    #****************************************************************
+    # Booleans whose answer depends on points on a chord
+    #****************************************************************
+    def CheckBooleans(self):
+        rect = Poly([(0,-20), (0,20), (20,20), (20,-20)])
+        halfCircle = math.pi * 100 / 2
+
+        result = Circle().Subtract(rect)
+        self.assertEqual(len(result), 1)
+        self.assertAlmostEqual(ResultArea(result), halfCircle, 6)
+
+        result = Circle().Add(rect)
+        self.assertEqual(len(result), 1)
+        self.assertAlmostEqual(ResultArea(result), halfCircle + 800, 6)
+        points = [(round(p[0], 9), round(p[1], 9)) for p in result[0][0].points]
+        self.assertIn((0,10), points)
+        self.assertIn((0,-10), points)
+
+        # An island with a corner at the center of the circle
+        island = Poly([(0,0), (0,3), (3,3), (3,0)])
+        self.assertEqual(Circle().SameInsideOutside(island), (False, True, False, False))
+        result = Circle().Subtract(island)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(len(result[0][1]), 1)
+        self.assertAlmostEqual(ResultArea(result), math.pi * 100 - 9, 6)
+
+    def test_Booleans(self):
+        self.CheckBooleans()
+
+    def test_BooleansWithArrangement(self):
+        Poly.useArrangement = True
+        try:
+            self.CheckBooleans()
+        finally:
+            Poly.useArrangement = False
+
+    #****************************************************************
+    # In fixed point mode the input points are snapped to the grid and
+    # the ends of a curve stay the same distance from its center
+    #****************************************************************
+    def test_FixedPointGrid(self):
+        grid = Blender4CNC.FixedPointGrid(1e-3)
+        self.assertEqual(grid.SnapPoints([(0.5004,0.4996), (1.23456,2)]), [(0.5,0.5), (1.235,2)])
+        points = grid.SnapPoints(Rotate(Slot().points, 0.3))
+        for i in range(0, len(points)):
+            if len(points[i]) > 2:
+                (cx, cy) = points[i][2:4]
+                r0 = math.hypot(points[i-1][0] - cx, points[i-1][1] - cy)
+                r1 = math.hypot(points[i][0] - cx, points[i][1] - cy)
+                self.assertAlmostEqual(r0, r1, 12)
+        for p in points:
+            self.assertEqual(p[0:2], grid.SnapPoint(p[0:2]))
+
+    #****************************************************************
+    # Offsets and pockets of shapes that are not lined up with the axes
+    # (so the corner curves of an offset are not on the grid)
+    #****************************************************************
+    def test_FixedPointGridOffsets(self):
+        rnd = random.Random(3)
+        # Convex (the corners are on a circle) and clockwise
+        quads = []
+        while len(quads) < 50:
+            angles = sorted([rnd.uniform(0, 2 * math.pi) for i in range(0, 4)])
+            r = rnd.uniform(1, 3)
+            points = [(r * math.cos(a), r * math.sin(a)) for a in reversed(angles)]
+            if abs(SignedArea(points)) > 2:
+                quads.append(points)
+        for resolution in [1e-6, 1e-3]:
+            grid = Blender4CNC.FixedPointGrid(resolution)
+            for points in quads:
+                with self.subTest(resolution=resolution, points=points):
+                    poly = Poly(grid.SnapPoints(points))
+                    expanded = poly.Expand(None, 0.125)[0]
+                    shrunk = poly.Shrink(0.125)
+                    self.assertEqual(len(shrunk), 1)
+                    area = abs(SignedArea(poly.points))
+                    perimeter = sum([math.dist(a[0:2], b[0:2]) for (a, b) in poly.lines])
+                    self.assertAlmostEqual(abs(SignedArea(expanded.points)), area + perimeter * 0.125 + math.pi * 0.125 ** 2, 6)
+
+        rect = Rotate([(0,0), (0,3), (4,3), (4,0)], 0.3)
+        tenon = Rotate([(1.5,1), (1.7,2), (2.6,1.9), (2.4,0.9)], 0.3)
+        for resolution in [0, 1e-6, 1e-3]:
+            with self.subTest(resolution=resolution):
+                settings = Blender4CNC.CoreSettings("IMPERIAL", False, resolution)
+                pockets = Blender4CNC.Pockets(10, 0.02, True, False, 1, 0.25, -0.1, 0.5, 0, 0.2, 20, settings=settings)
+                self.assertGreater(len(pockets.CutPocket(rect, 0, -0.2, 0.01, [tenon])), 0)
+
+    #****************************************************************
+    # Tenons that overlap in a ring enclose an area that cannot be cut
+    #****************************************************************
+    def CheckJoinOverlappingTenons(self):
+        pockets = Blender4CNC.Pockets(10, 0.001, True, False, 1, 0.003, -0.001, 0.5, 0, 0.005, 20, settings=Blender4CNC.CoreSettings())
+        def Square(x, y):
+            return Poly([(x,y), (x,y+4.5), (x+4.5,y+4.5), (x+4.5,y)])
+        corners = [(0,0), (4,0), (8,0), (8,4), (8,8), (4,8), (0,8), (0,4)]
+        with self.assertRaises(Blender4CNC.PolyException):
+            pockets.JoinOverlappingTenons([Square(x, y) for (x, y) in corners])
+        # Without the last square the tenons join into one "C" shape
+        joined = pockets.JoinOverlappingTenons([Square(x, y) for (x, y) in corners[:-1]])
+        self.assertEqual(len(joined), 1)
+        self.assertAlmostEqual(abs(SignedArea(joined[0].points)), 12.5 * 12.5 - 3.5 * 3.5 - 3.5 * 4.5, 6)
+
+    def test_JoinOverlappingTenons(self):
+        self.CheckJoinOverlappingTenons()
+
+    def test_JoinOverlappingTenonsWithArrangement(self):
+        Poly.useArrangement = True
+        try:
+            self.CheckJoinOverlappingTenons()
+        finally:
+            Poly.useArrangement = False
+
+    #****************************************************************
+    # A pocket gives the same G-Code when its booleans are done on the
+    # arrangement
+    #****************************************************************
+    def test_CutPocketWithArrangement(self):
+        def Square(x, y):
+            return [(x,y), (x,y+0.3), (x+0.3,y+0.3), (x+0.3,y)]
+        rect = [(0,0), (0,3), (4,3), (4,0)]
+        for tenons in [[Square(1,1), Square(2.5,1.5), Square(1,2.2)], [Square(1,1), Square(1.4,1), Square(1.8,1)]]:
+            results = []
+            for useArrangement in [False, True]:
+                settings = Blender4CNC.CoreSettings("IMPERIAL", False, 0, useArrangement)
+                pockets = Blender4CNC.Pockets(10, 0.02, True, False, 1, 0.25, -0.1, 0.5, 0, 0.2, 20, settings=settings)
+                try:
+                    results.append(pockets.CutPocket(rect, 0, -0.2, 0.01, [list(t) for t in tenons]))
+                except Blender4CNC.PolyException as err:
+                    results.append(err.args)
+            with self.subTest(tenons=tenons):
+                self.assertEqual(results[0], results[1])
+        self.assertFalse(Poly.useArrangement)
+
+    #****************************************************************
+    # Overlap polys that cut across a tenon split it into pieces
+    #****************************************************************
+    def test_RemoveOverlapPolysFromTenons(self):
+        def Rect(x, y, w, h):
+            return Poly([(x,y), (x,y+h), (x+w,y+h), (x+w,y)])
+        for useArrangement in [False, True]:
+            Poly.useArrangement = useArrangement
+            try:
+                pieces = Rect(0,0,1,1).RemoveOverlapPolysFromTenons([Rect(0,0,10,2)], [Rect(3,-1,1,4), Rect(6,-1,1,4)])
+            finally:
+                Poly.useArrangement = False
+            with self.subTest(useArrangement=useArrangement):
+                self.assertEqual(len(pieces), 3)
+                self.assertAlmostEqual(sum([abs(SignedArea(p.points)) for p in pieces]), 16, 9)
+
+    #****************************************************************
+    # Shrinking by many distances in one go gives the same polys as
+    # shrinking by each distance
+    #****************************************************************
+    def test_ShrinkMultiple(self):
+        distances = [0.5, 1, 1.5, 2.5, 4]
+        polys = {
+            "square" : (Poly([(0,0), (0,10), (10,10), (10,0)]), lambda d: (10 - 2 * d) ** 2),
+            "circle" : (Circle(), lambda d: math.pi * (10 - d) ** 2),
+            "slot" : (Slot(), lambda d: math.pi * (5 - d) ** 2 / 2 + (20 - d) * (10 - 2 * d)),
+        }
+        for (name, (poly, area)) in polys.items():
+            results = poly.ShrinkMultiple(distances)
+            self.assertEqual(len(results), len(distances))
+            for (d, result) in zip(distances, results):
+                with self.subTest(name=name, d=d):
+                    self.assertEqual(len(result), 1)
+                    single = poly.Shrink(d)
+                    self.assertEqual(len(single), 1)
+                    self.assertAlmostEqual(abs(SignedArea(result[0].points)), area(d), 6)
+                    self.assertAlmostEqual(abs(SignedArea(single[0].points)), area(d), 6)
+                    self.assertEqual(sorted(result[0].points), sorted(single[0].points))
+
+        # A shape that splits in two when shrunk far enough
+        dumbbell = Poly([(0,0), (0,10), (10,10), (10,6), (14,6), (14,10), (24,10), (24,0), (14,0), (14,4), (10,4), (10,0)])
+        results = dumbbell.ShrinkMultiple([1, 3])
+        self.assertEqual(len(results[0]), 1)
+        self.assertEqual(len(results[1]), 2)
+        for (d, result) in zip([1, 3], results):
+            single = dumbbell.Shrink(d)
+            self.assertEqual(sorted([sorted(p.points) for p in result]), sorted([sorted(p.points) for p in single]))
+
+    #****************************************************************
+    # Curves shown as meshes get about as many lines as the old 10
+    # degree steps for typical radii, in either unit system
+    #****************************************************************
+    def test_ApproximateCurves(self):
+        for (unitSystem, inch) in [("IMPERIAL", 1), ("METRIC", 0.0254)]:
+            maxError = Blender4CNC.CoreSettings(unitSystem).approxCurveMaxError
+            with self.subTest(unitSystem):
+                self.assertEqual(len(Circle(inch / 2).ApproximateCurves(maxError).points), 36)
+                small = Circle(inch / 50).ApproximateCurves(maxError).points
+                large = Circle(inch * 4).ApproximateCurves(maxError).points
+                self.assertLess(len(small), 36)
+                self.assertGreater(len(large), 36)
+                for p in small + large:
+                    self.assertEqual(len(p), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+# Blender4CNC - Design 3-axis CNC projects in Blender and produce G-Code.
+# Copyright (C) 2023  David Dommett
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#*******************************************************************
+# Tests of the sweep line (SegmentSweep) against checking all pairs
+#
+# Runs in plain Python (numpy, scipy and scikit-image are needed but
+# Blender is not), e.g.
+#
+# python3 Blender4CNC_SegmentSweep_test.py
+# python3 -m pytest Blender4CNC_SegmentSweep_test.py
+#
+# For each set of segments, every pair whose boxes overlap (and so
+# every pair that touches) must be a candidate and nothing else may be.
+#*******************************************************************
+
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Blender4CNC import Blender4CNC
+
+#*******************************************************************
+# Degenerate cases
+#*******************************************************************
+CASES = {
+    "touching end points" : [((0,0),(1,0)), ((1,0),(1,1)), ((1,1),(0,1)), ((0,1),(0,0)), ((1,1),(2,2))],
+    "collinear overlaps" : [((0,0),(1,0)), ((0.5,0),(2,0)), ((2,0),(3,0)), ((-1,0),(4,0)), ((5,0),(6,0))],
+    "vertical lines" : [((0,0),(0,1)), ((0,0.5),(0,2)), ((0,2),(0,3)), ((1,0),(1,3)), ((0,3.5),(0,4))],
+    "horizontal lines" : [((0,0),(1,0)), ((0,1),(1,1)), ((0,2),(1,2)), ((0.5,-1),(0.5,3))],
+    "arc touching a line" : [((0,0),(2,0,1,0,1)), ((0,1),(2,1)), ((1,-1),(3,-1)), ((2,0),(2,-2))],
+    "tangent circles" : [((0,0),(2,0,1,0,1)), ((2,0),(0,0,1,0,1)), ((2,0),(4,0,3,0,-1)), ((4,0),(2,0,3,0,-1)),
+                         ((1,1),(1,1+1e-7))],
+    "zero length segments" : [((1,1),(1,1)), ((0,0),(2,2)), ((2,2),(2,2)), ((5,5),(5,5)), ((0,1),(1,1))],
+    "one segment" : [((0,0),(1,1))],
+    "no segments" : [],
+}
+
+#*******************************************************************
+# Random segments (some with coordinates rounded so that they share
+# x values, end points and lines)
+#*******************************************************************
+def RandomCase(rnd):
+    pts = []
+    for i in range(0, rnd.randint(2, 40)):
+        digits = rnd.choice([0, 1, 2, 6])
+        pts.append((round(rnd.uniform(-3, 3), digits), round(rnd.uniform(-3, 3), digits)))
+    lines = []
+    for i in range(0, len(pts)-1):
+        (a, b) = (pts[i], pts[i+1])
+        if (a != b) and (rnd.random() < 0.3):
+            (cx, cy) = ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2)
+            lines.append((a, (b[0], b[1], cx, cy, rnd.choice([1, -1]))))
+        else:
+            lines.append((a, b))
+    return lines
+
+#*******************************************************************
+# The candidates found by checking all pairs of boxes
+#*******************************************************************
+def AllPairs(boxes):
+    candidates = [[] for box in boxes]
+    for i in range(0, len(boxes)):
+        for j in range(i+1, len(boxes)):
+            if (boxes[i][0] <= boxes[j][2]) and (boxes[j][0] <= boxes[i][2]) and \
+               (boxes[i][1] <= boxes[j][3]) and (boxes[j][1] <= boxes[i][3]):
+                candidates[i].append(j)
+                candidates[j].append(i)
+    return candidates
+
+class TestSegmentSweep(unittest.TestCase):
+
+    def CheckCase(self, lines):
+        boxes = Blender4CNC.SegmentGrid.GetLineBoxes(lines)
+        candidates = Blender4CNC.SegmentSweep(lines, boxes).GetCandidates()
+        self.assertEqual(candidates, AllPairs(boxes.tolist()))
+
+        # Every pair of segments that touch must be a candidate
+        poly = Blender4CNC.Polytoxogon([(0,0),(0,1),(1,1),(1,0)])
+        for i in range(0, len(lines)):
+            for j in range(i+1, len(lines)):
+                if (lines[i][0] == lines[i][1]) or (lines[j][0] == lines[j][1]):
+                    # Zero length, only the boxes can be checked
+                    continue
+                ints = poly.GetAllIntersections(lines[i], lines[j])
+                if (ints == math.inf) or (len(ints) > 0):
+                    self.assertIn(j, candidates[i])
+
+    def test_DegenerateCases(self):
+        for (name, lines) in CASES.items():
+            with self.subTest(name):
+                self.CheckCase(lines)
+
+    def test_RandomCases(self):
+        rnd = random.Random(1)
+        for n in range(0, 200):
+            with self.subTest(n):
+                self.CheckCase(RandomCase(rnd))
+
+    # The same intersections must be found as by intersecting all pairs
+    def test_IntersectionsBetweenAllLines(self):
+        poly = Blender4CNC.Polytoxogon([(0,0),(0,1),(1,1),(1,0)])
+        rnd = random.Random(2)
+        cases = [lines for (name, lines) in CASES.items() if "zero" not in name]
+        cases += [RandomCase(rnd) for n in range(0, 50)]
+        for lines in cases:
+            expected = {}
+            for (i, a) in enumerate(lines):
+                allInts = []
+                for (j, b) in enumerate(lines):
+                    if i == j:
+                        continue
+                    ints = poly.GetAllIntersections(a, b)
+                    if ints == math.inf:
+                        ints = [(math.inf, poly.GetOverlap(a, b))]
+                    allInts += [(j, x) for x in ints]
+                expected[i] = allInts
+            self.assertEqual(poly.GetIntersectionsBetweenAllLines(lines), expected)
+
+if __name__ == "__main__":
+    unittest.main()